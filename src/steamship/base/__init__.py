@@ -1,3 +1,4 @@
+from .cache import CacheStats, ObjectCache, SearchCache
 from .configuration import Configuration
 from .environments import RuntimeEnvironments, check_environment
 from .error import SteamshipError
@@ -5,6 +6,9 @@ from .mime_types import MimeTypes
 from .tasks import Task, TaskState
 
 __all__ = [
+    "CacheStats",
+    "ObjectCache",
+    "SearchCache",
     "Configuration",
     "SteamshipError",
     "Task",
@@ -0,0 +1,305 @@
+"""An optional client-side cache of Files and Blocks keyed by id.
+
+Pass an `ObjectCache` to the client (`Steamship(object_cache=ObjectCache())`) to have `File.get` and `Block.get` serve
+repeated reads locally. Objects are stored as their serialized JSON, so every read returns a fresh copy that callers can
+mutate freely, and the memory budget is measured in bytes actually held.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Type, TypeVar, Union
+
+from pydantic import BaseModel
+
+from steamship.base.model import CamelModel
+
+if TYPE_CHECKING:
+    from steamship.base.client import Client
+
+T = TypeVar("T", bound=BaseModel)
+
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+DEFAULT_DISK_CACHE_BYTES = 1024 * 1024 * 1024
+DEFAULT_OBJECT_CACHE_AGE_S = 60
+DEFAULT_SEARCH_CACHE_AGE_S = 300
+
+
+class CacheStats(CamelModel):
+    hits: int = 0  # Reads served from memory
+    disk_hits: int = 0  # Reads served from the disk tier
+    misses: int = 0  # Reads that had to go to the Engine
+    evictions: int = 0  # Entries pushed out of memory to stay within the byte budget
+    entries: int = 0  # Entries currently held in memory
+    memory_bytes: int = 0  # Bytes currently held in memory
+    disk_bytes: int = 0  # Bytes currently held on disk
+
+    @property
+    def hit_rate(self) -> float:
+        reads = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / reads if reads else 0.0
+
+
+class ObjectCache:
+    """A thread-safe LRU cache of serialized Engine objects with a byte budget and an optional disk tier.
+
+    Parameters
+    ----------
+    max_bytes : int
+        Budget for the in-memory tier. The least recently used entries are evicted beyond it. Default: 64MB.
+    disk_path : Optional[Union[str, Path]]
+        Directory for a second tier. Every entry is written through to it, so entries evicted from memory are
+        read back from it, and caches in other processes sharing the directory read each other's entries.
+        Default: no disk tier.
+    max_disk_bytes : int
+        Budget for the disk tier; the oldest files are removed beyond it. Default: 1GB.
+    max_age_s : Optional[float]
+        Entries older than this are treated as stale and fetched again from the Engine; stale files are removed
+        from the disk tier. Changes made by other clients or by plugins running in the Engine are picked up once
+        entries expire. Default: 60s. Pass None to never expire entries, which is only safe when the objects are
+        changed through this client alone.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_CACHE_BYTES,
+        disk_path: Optional[Union[str, Path]] = None,
+        max_disk_bytes: int = DEFAULT_DISK_CACHE_BYTES,
+        max_age_s: Optional[float] = DEFAULT_OBJECT_CACHE_AGE_S,
+    ):
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.max_age_s = max_age_s
+        self.disk_path = Path(disk_path) if disk_path is not None else None
+        self._entries: OrderedDict[str, Tuple[bytes, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+        self._pruned_at = 0.0
+        if self.disk_path is not None:
+            self.disk_path.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                self._prune_disk()
+
+    @staticmethod
+    def _key(kind: str, _id: str) -> str:
+        return f"{kind}:{_id}"
+
+    def _stale(self, stored_at: float) -> bool:
+        return self.max_age_s is not None and time.time() - stored_at > self.max_age_s
+
+    def get(self, kind: str, _id: str) -> Optional[bytes]:
+        """Return the serialized object stored under (`kind`, `_id`), or None on a miss."""
+        key = self._key(kind, _id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._stale(entry[1]):
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                return entry[0]
+            if entry is not None:
+                self._remove(key)
+            entry = self._read_disk(key)
+            if entry is not None:
+                self._stats.disk_hits += 1
+                self._store(key, *entry, write_disk=False)  # Already on disk
+                return entry[0]
+            self._stats.misses += 1
+            return None
+
+    def put(self, kind: str, _id: str, payload: bytes):
+        key = self._key(kind, _id)
+        with self._lock:
+            self._remove(key)
+            self._store(key, payload, time.time())
+
+    def invalidate(self, kind: str, _id: Optional[str]):
+        if _id is None:
+            return
+        with self._lock:
+            self._remove(self._key(kind, _id))
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+            for path in self._disk_files():
+                self._unlink(path)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return self._stats.copy()
+
+    def get_model(
+        self, client: Client, expect: Type[T], kind: str, _id: Optional[str]
+    ) -> Optional[T]:
+        """Return a fresh copy of the cached object, bound to `client`, or None on a miss."""
+        if _id is None:
+            return None
+        payload = self.get(kind, _id)
+        if payload is None:
+            return None
+        return expect.parse_obj(client._add_client_to_response(expect, json.loads(payload)))
+
+    def put_model(self, kind: str, model: BaseModel):
+        if getattr(model, "id", None) is not None:
+            self.put(kind, model.id, model.json(by_alias=True).encode("utf-8"))
+
+    # The methods below expect the lock to be held.
+
+    def _store(self, key: str, payload: bytes, stored_at: float, write_disk: bool = True):
+        if write_disk:
+            self._write_disk(key, payload, stored_at)
+        if len(payload) > self.max_bytes:
+            return
+        self._entries[key] = (payload, stored_at)
+        self._stats.memory_bytes += len(payload)
+        while self._stats.memory_bytes > self.max_bytes:
+            _, (evicted, _) = self._entries.popitem(
+                last=False
+            )  # Still on disk, if there is a disk tier
+            self._stats.memory_bytes -= len(evicted)
+            self._stats.evictions += 1
+        self._stats.entries = len(self._entries)
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._stats.memory_bytes -= len(entry[0])
+            self._stats.entries = len(self._entries)
+        if self.disk_path is not None:
+            self._unlink(self._disk_file(key))
+
+    def _disk_file(self, key: str) -> Path:
+        return self.disk_path / (hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+    def _disk_files(self):
+        return list(self.disk_path.glob("*.json")) if self.disk_path is not None else []
+
+    def _unlink(self, path: Path):
+        try:
+            size = path.stat().st_size
+            path.unlink()
+            self._stats.disk_bytes -= size
+        except FileNotFoundError:
+            pass
+
+    def _read_disk(self, key: str) -> Optional[Tuple[bytes, float]]:
+        if self.disk_path is None:
+            return None
+        path = self._disk_file(key)
+        try:
+            stored_at = path.stat().st_mtime
+            payload = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        if self._stale(stored_at):
+            self._unlink(path)
+            return None
+        return payload, stored_at
+
+    def _write_disk(self, key: str, payload: bytes, stored_at: float):
+        if self.disk_path is None or len(payload) > self.max_disk_bytes:
+            return
+        path = self._disk_file(key)
+        # Unique, so processes sharing the directory never write to the same temporary file
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            tmp_path.write_bytes(payload)
+            os.utime(tmp_path, (stored_at, stored_at))
+            self._unlink(path)
+            os.replace(tmp_path, path)
+            self._stats.disk_bytes += len(payload)
+        except OSError as e:
+            logging.warning(f"Could not write cache entry to {path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+        due = self.max_age_s is not None and time.time() - self._pruned_at > self.max_age_s
+        if due or self._stats.disk_bytes > self.max_disk_bytes:
+            self._prune_disk()
+
+    def _prune_disk(self):
+        """Remove the stale files, then the oldest ones beyond the disk budget, and recount the bytes on disk.
+
+        The directory may be shared with other processes, so it is listed rather than tracked."""
+        files = []
+        for path in self._disk_files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        self._stats.disk_bytes = sum(size for _, size, _ in files)
+        for stored_at, _, path in sorted(files):
+            if not self._stale(stored_at) and self._stats.disk_bytes <= self.max_disk_bytes:
+                break
+            self._unlink(path)
+        self._pruned_at = time.time()
+
+
+class SearchCache(ObjectCache):
+    """An ObjectCache of embedding index search results, keyed by index, query, `k` and `include_metadata`.
+
+    Pass one to the client (`Steamship(search_cache=SearchCache())`) to serve repeated searches locally. Each index
+    has a random generation token that is part of every key; inserting into, re-embedding or deleting the index
+    through the client replaces the token, so earlier results are never read again and age out of the LRU.
+    With a disk tier the tokens are kept in files beside the entries, so worker processes sharing `disk_path` share
+    results and each other's invalidations.
+
+    Changes made to an index by other clients are only picked up once entries expire, after `max_age_s`
+    (default: 5 minutes).
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_CACHE_BYTES,
+        disk_path: Optional[Union[str, Path]] = None,
+        max_disk_bytes: int = DEFAULT_DISK_CACHE_BYTES,
+        max_age_s: Optional[float] = DEFAULT_SEARCH_CACHE_AGE_S,
+    ):
+        super().__init__(
+            max_bytes=max_bytes,
+            disk_path=disk_path,
+            max_disk_bytes=max_disk_bytes,
+            max_age_s=max_age_s,
+        )
+        self._generations: Dict[str, str] = {}
+        if self.disk_path is not None:
+            (self.disk_path / "generations").mkdir(exist_ok=True)
+
+    def _generation_file(self, index_id: str) -> Path:
+        return self.disk_path / "generations" / hashlib.sha256(index_id.encode("utf-8")).hexdigest()
+
+    def _generation(self, index_id: str) -> str:
+        if self.disk_path is not None:
+            try:
+                return self._generation_file(index_id).read_text()
+            except FileNotFoundError:
+                return self.invalidate_index(index_id)
+        with self._lock:
+            return self._generations.setdefault(index_id, uuid.uuid4().hex)
+
+    def invalidate_index(self, index_id: str) -> str:
+        """Drop every cached result of the index, returning its new generation token."""
+        generation = uuid.uuid4().hex
+        if self.disk_path is None:
+            with self._lock:
+                self._generations[index_id] = generation
+            return generation
+        path = self._generation_file(index_id)
+        tmp_path = path.with_name(f"{path.name}.{generation}.tmp")
+        tmp_path.write_text(generation)
+        os.replace(tmp_path, path)
+        return generation
+
+    def search_key(
+        self, index_id: str, query: Union[str, list], k: int, include_metadata: bool
+    ) -> str:
+        key = json.dumps([self._generation(index_id), query, k, include_metadata])
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
@@ -4,24 +4,38 @@ import logging
 import typing
 from abc import ABC
 from inspect import isclass
-from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, TypeVar, Union
 
 import inflection
+import requests
 from pydantic import BaseModel, PrivateAttr
 from requests import Session
+from requests.adapters import HTTPAdapter
 
+from steamship.base.cache import ObjectCache, SearchCache
 from steamship.base.configuration import Configuration
 from steamship.base.error import SteamshipError
 from steamship.base.mime_types import MimeTypes
 from steamship.base.model import CamelModel, to_camel
 from steamship.base.request import Request
 from steamship.base.tasks import Task, TaskState
+from steamship.utils.content_cache import ContentCache
 from steamship.utils.url import Verb, is_local
 
 _logger = logging.getLogger(__name__)
 
 T = TypeVar("T")  # TODO (enias): Do we need this?
 
+# Number of keep-alive connections the client holds per host. Bulk operations share the client's session across
+# threads, so their concurrency should stay at or below this value to reuse connections rather than open new ones.
+HTTP_POOL_SIZE = 32
+
+# Default size of the chunks yielded when streaming binary content.
+DEFAULT_STREAM_CHUNK_SIZE = 1024 * 1024
+
+# Called as streamed content arrives with (bytes received so far, total bytes if the server reported it).
+StreamProgressCallback = Callable[[int, Optional[int]], None]
+
 
 def _multipart_name(path: str, val: Any) -> List[Tuple[Optional[str], str, Optional[str]]]:
     """Decode any object into a series of HTTP Multi-part segments that Vapor will consume.
@@ -48,6 +62,83 @@ def _multipart_name(path: str, val: Any) -> List[Tuple[Optional[str], str, Optio
     return ret
 
 
+def _slice_chunks(chunks: Iterator[bytes], offset: int, length: Optional[int]) -> Iterator[bytes]:
+    """Yield the bytes [offset, offset + length) of the content streamed in `chunks`."""
+    for chunk in chunks:
+        if offset:
+            dropped = min(offset, len(chunk))
+            chunk = chunk[dropped:]
+            offset -= dropped
+        if length is not None:
+            chunk = chunk[:length]
+            length -= len(chunk)
+        if chunk:
+            yield chunk
+        if length == 0:
+            return
+
+
+def _range_headers(offset: int, length: Optional[int]) -> Dict[str, str]:
+    if not offset and length is None:
+        return {}
+    end = "" if length is None else offset + length - 1
+    return {"Range": f"bytes={offset}-{end}"}
+
+
+def _stream_response(
+    send: Callable[[], requests.Response],
+    chunk_size: int,
+    offset: int,
+    length: Optional[int],
+    on_progress: Optional[StreamProgressCallback],
+) -> Iterator[bytes]:
+    """Send the request on the first `next()` and yield the requested range of its body."""
+    with send() as resp:
+        if not resp.ok:
+            raise SteamshipError(
+                f"Streaming call did not complete successfully.  Server returned HTTP {resp.status_code}: {resp.text}",
+                status_code=resp.status_code,
+            )
+        total = resp.headers.get("Content-Length")
+        total = int(total) if total is not None else None
+        chunks = resp.iter_content(chunk_size=chunk_size)
+        if (offset or length is not None) and resp.status_code != 206:
+            # The server ignored the Range header and is sending the full content.
+            chunks = _slice_chunks(chunks, offset, length)
+            if total is not None:
+                total = max(total - offset, 0)
+                total = total if length is None else min(total, length)
+
+        received = 0
+        for chunk in chunks:
+            received += len(chunk)
+            if on_progress:
+                on_progress(received, total)
+            yield chunk
+
+
+def stream_url(
+    url: str,
+    chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+    offset: int = 0,
+    length: Optional[int] = None,
+    on_progress: Optional[StreamProgressCallback] = None,
+    timeout_s: Optional[float] = None,
+    session: Optional[Session] = None,
+) -> Iterator[bytes]:
+    """Stream a GET of `url` without Steamship credentials (e.g. a pre-signed `content_url`); see `Client.stream`.
+
+    Uses `session` if given, and a one-off connection otherwise."""
+    headers = _range_headers(offset, length)
+    return _stream_response(
+        lambda: (session or requests).get(url, headers=headers, stream=True, timeout=timeout_s),
+        chunk_size,
+        offset,
+        length,
+        on_progress,
+    )
+
+
 class Client(CamelModel, ABC):
     """Client model.py class.
 
@@ -56,6 +147,9 @@ class Client(CamelModel, ABC):
 
     config: Configuration
     _session: Session = PrivateAttr()
+    _object_cache: Optional[ObjectCache] = PrivateAttr(None)
+    _content_cache: Optional[ContentCache] = PrivateAttr(None)
+    _search_cache: Optional[SearchCache] = PrivateAttr(None)
 
     def __init__(
         self,
@@ -69,17 +163,27 @@ class Client(CamelModel, ABC):
         config_file: str = None,
         config: Configuration = None,
         trust_workspace_config: bool = False,  # For use by lambda_handler; don't fetch the workspace
+        object_cache: Optional[ObjectCache] = None,
+        content_cache: Optional[ContentCache] = None,
+        search_cache: Optional[SearchCache] = None,
         **kwargs,
     ):
         """Create a new client.
 
         If `workspace` is provided, it will anchor the client in a workspace by that name, creating it if necessary.
         Otherwise the `default` workspace will be used.
+
+        If `object_cache` is provided, Files and Blocks fetched by id are served from it on repeated reads.
+        If `content_cache` is provided, the raw content of Blocks is kept in it and read from disk after the first read.
+        If `search_cache` is provided, repeated embedding index searches are answered from it.
         """
         if config is not None and not isinstance(config, Configuration):
             config = Configuration.parse_obj(config)
 
         self._session = Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
         config = config or Configuration(
             api_key=api_key,
             api_base=api_base,
@@ -91,6 +195,9 @@ class Client(CamelModel, ABC):
         )
 
         super().__init__(config=config)
+        self._object_cache = object_cache
+        self._content_cache = content_cache
+        self._search_cache = search_cache
         # The lambda_handler will pass in the workspace via the workspace_id, so we need to plumb this through to make sure
         # that the workspace switch performed doesn't mistake `workspace=None` as a request for the default workspace
         self.switch_workspace(
@@ -100,6 +207,18 @@ class Client(CamelModel, ABC):
             trust_workspace_config=trust_workspace_config,
         )
 
+    @property
+    def object_cache(self) -> Optional[ObjectCache]:
+        return self._object_cache
+
+    @property
+    def content_cache(self) -> Optional[ContentCache]:
+        return self._content_cache
+
+    @property
+    def search_cache(self) -> Optional[SearchCache]:
+        return self._search_cache
+
     def switch_workspace(  # noqa: C901
         self,
         workspace_handle: str = None,
@@ -507,11 +626,13 @@ class Client(CamelModel, ABC):
 
         if error is not None:
             logging.warning(f"Client received error from server: {error}", exc_info=error)
+            error.status_code = resp.status_code
             raise error
 
         if not resp.ok:
             raise SteamshipError(
-                f"API call did not complete successfully.  Server returned: {response_data}"
+                f"API call did not complete successfully.  Server returned: {response_data}",
+                status_code=resp.status_code,
             )
 
         elif task is not None:
@@ -600,6 +721,57 @@ class Client(CamelModel, ABC):
             timeout_s=timeout_s,
         )
 
+    def stream(
+        self,
+        operation: str = None,
+        payload: Union[Request, dict] = None,
+        url: str = None,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        offset: int = 0,
+        length: Optional[int] = None,
+        on_progress: Optional[StreamProgressCallback] = None,
+        timeout_s: Optional[float] = None,
+    ) -> Iterator[bytes]:
+        """Stream the binary response of a call in chunks of at most `chunk_size` bytes.
+
+        Either POSTs `payload` to the API `operation` or, if `url` is provided, GETs that URL without Steamship
+        credentials (e.g. a pre-signed `content_url`). Both use the client's pooled HTTP session.
+
+        `offset` and `length` select a byte range of the content. The range is requested with an HTTP Range header;
+        if the server ignores it, the range is cut out of the full response on the client instead.
+        """
+        if (operation is None) == (url is None):
+            raise SteamshipError(
+                message="Please provide exactly one of `operation` or `url` to stream."
+            )
+        if url is not None:
+            return stream_url(
+                url,
+                chunk_size=chunk_size,
+                offset=offset,
+                length=length,
+                on_progress=on_progress,
+                timeout_s=timeout_s,
+                session=self._session,
+            )
+
+        headers = _range_headers(offset, length)
+        headers.update(self._headers())
+        data = self._prepare_data(payload=payload)
+        return _stream_response(
+            lambda: self._session.post(
+                self._url(operation=operation),
+                json=data,
+                headers=headers,
+                stream=True,
+                timeout=timeout_s,
+            ),
+            chunk_size,
+            offset,
+            length,
+            on_progress,
+        )
+
     def logs(
         self,
         offset: int = 0,
@@ -12,6 +12,7 @@ class SteamshipError(Exception):
     suggestion: str = None
     code: str = None
     error: str = None
+    status_code: int = None  # HTTP status of the Engine response that reported this error, if any
 
     def __init__(
         self,
@@ -20,9 +21,11 @@ class SteamshipError(Exception):
         suggestion: str = None,
         code: str = None,
         error: Union[Exception, str] = None,
+        status_code: int = None,
     ):
         super().__init__()
         self.message = message
+        self.status_code = status_code
         self.suggestion = suggestion
         self.internal_message = internal_message
         self.code = code
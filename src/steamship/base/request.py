@@ -1,3 +1,6 @@
+from enum import Enum
+from typing import Optional
+
 from steamship.base.model import CamelModel
 
 
@@ -25,8 +28,19 @@ class IdentifierRequest(Request):
     handle: str = None
 
 
+class SortOrder(str, Enum):
+    ASC = "ASC"
+    DESC = "DESC"
+
+
 class ListRequest(Request):
-    pass
+    """Base class for list operations that support paging.
+
+    Leaving `page_size` unset asks the Engine for its default (unpaged) behavior."""
+
+    page_size: Optional[int] = None
+    page_token: Optional[str] = None
+    sort_order: Optional[SortOrder] = None
 
 
 class DeleteRequest(Request):
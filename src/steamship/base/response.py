@@ -1,5 +1,15 @@
+from typing import Optional
+
 from steamship.base.model import CamelModel
 
 
 class Response(CamelModel):
     pass
+
+
+class ListResponse(Response):
+    """Base class for the responses of paged list operations.
+
+    `next_page_token` is None once the last page has been returned."""
+
+    next_page_token: Optional[str] = None
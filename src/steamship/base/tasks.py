@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import asyncio
 import time
-from typing import Any, Callable, Dict, Generic, List, Optional, Set, Type, TypeVar
+from typing import Any, Callable, Dict, Generic, Iterator, List, Optional, Set, Type, TypeVar
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from steamship.base.error import SteamshipError
 from steamship.base.model import CamelModel, GenericCamelModel
-from steamship.base.request import DeleteRequest, IdentifierRequest, Request
+from steamship.base.request import DeleteRequest, IdentifierRequest, ListRequest, Request, SortOrder
+from steamship.base.response import ListResponse
+from steamship.utils.concurrency import DEFAULT_CONCURRENCY, BulkItemResult, run_concurrently
 from steamship.utils.metadata import metadata_to_str, str_to_metadata
+from steamship.utils.paging import iterate_pages
 
 T = TypeVar("T")
 
@@ -21,13 +25,17 @@ class CreateTaskCommentRequest(Request):
     metadata: str = None
 
 
-class ListTaskCommentRequest(Request):
+class ListTaskCommentRequest(ListRequest):
     task_id: str = None
     external_id: str = None
     external_type: str = None
     external_group: str = None
 
 
+# The keyword arguments of `TaskComment.create` that `TaskComment.create_many` accepts per comment.
+_COMMENT_FIELDS = {"task_id", "external_id", "external_type", "external_group", "metadata"}
+
+
 class TaskComment(CamelModel):
     client: Client = Field(None, exclude=True)
     id: str = None
@@ -71,6 +79,36 @@ class TaskComment(CamelModel):
             expect=TaskComment,
         )
 
+    @staticmethod
+    def create_many(
+        client: Client,
+        comments: List[Dict[str, Any]],
+        task_id: str = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> List[BulkItemResult[TaskComment]]:
+        """Create many comments, keeping up to `concurrency` create calls in flight.
+
+        Each comment is a dict of the keyword arguments of `create`: `task_id`, `external_id`, `external_type`,
+        `external_group` and `metadata`, which may be any JSON-serializable value. `task_id` is used for comments
+        that do not name their own.
+
+        Returns one result per comment, in input order. A failure to create one comment is reported in its
+        result and does not stop the others from being created.
+        """
+        requests = []
+        for comment in comments:
+            unknown = set(comment) - _COMMENT_FIELDS
+            if unknown:
+                raise SteamshipError(
+                    message=f"Unexpected task comment fields: {', '.join(sorted(unknown))}."
+                )
+            requests.append({"task_id": task_id, **comment})
+        return run_concurrently(
+            lambda kwargs: TaskComment.create(client, **kwargs),
+            requests,
+            concurrency=concurrency,
+        )
+
     @staticmethod
     def list(
         client: Client,
@@ -78,12 +116,18 @@ class TaskComment(CamelModel):
         external_id: str = None,
         external_type: str = None,
         external_group: str = None,
+        page_size: Optional[int] = None,
+        page_token: Optional[str] = None,
+        sort_order: Optional[SortOrder] = None,
     ) -> TaskCommentList:
         req = ListTaskCommentRequest(
             taskId=task_id,
             external_id=external_id,
             external_type=external_type,
             externalGroup=external_group,
+            page_size=page_size,
+            page_token=page_token,
+            sort_order=sort_order,
         )
         return client.post(
             "task/comment/list",
@@ -91,6 +135,31 @@ class TaskComment(CamelModel):
             expect=TaskCommentList,
         )
 
+    @staticmethod
+    def iter(
+        client: Client,
+        task_id: str = None,
+        external_id: str = None,
+        external_type: str = None,
+        external_group: str = None,
+        page_size: int = 100,
+        sort_order: Optional[SortOrder] = None,
+    ) -> Iterator[TaskComment]:
+        """Lazily iterate over the matching comments, fetching `page_size` of them per request."""
+        return iterate_pages(
+            lambda page_token: TaskComment.list(
+                client,
+                task_id=task_id,
+                external_id=external_id,
+                external_type=external_type,
+                external_group=external_group,
+                page_size=page_size,
+                page_token=page_token,
+                sort_order=sort_order,
+            ),
+            lambda page: page.comments,
+        )
+
     def delete(self) -> TaskComment:
         req = DeleteRequest(id=self.id)
         return self.client.post(
@@ -100,7 +169,7 @@ class TaskComment(CamelModel):
         )
 
 
-class TaskCommentList(CamelModel):
+class TaskCommentList(ListResponse):
     comments: List[TaskComment]
 
 
@@ -173,6 +242,9 @@ class Task(GenericCamelModel, Generic[T]):
     max_retries: int = None  # The maximum number of retries allowed for this task
     retries: int = None  # The number of retries already used.
 
+    # Called with this task once it has succeeded or failed; see `add_done_callback`.
+    _done_callbacks: List[Callable[[Task], None]] = PrivateAttr(default_factory=list)
+
     def as_error(self) -> SteamshipError:
         return SteamshipError(
             message=self.status_message, suggestion=self.status_suggestion, code=self.status_code
@@ -200,6 +272,21 @@ class Task(GenericCamelModel, Generic[T]):
         other = other or Task()
         for k, v in other.__dict__.items():
             self.__dict__[k] = v
+        self._run_done_callbacks()
+
+    def add_done_callback(self, callback: Callable[[Task], None]):
+        """Calls `callback` with this task once it is seen to have succeeded or failed, e.g. by `wait()`.
+
+        The callback runs at once if the task has already completed, and otherwise in the thread whose refresh
+        observes the completion. A task that is never refreshed to completion never calls it."""
+        self._done_callbacks.append(callback)
+        self._run_done_callbacks()
+
+    def _run_done_callbacks(self):
+        if self.state in (TaskState.succeeded, TaskState.failed) and self._done_callbacks:
+            callbacks, self._done_callbacks = self._done_callbacks, []
+            for callback in callbacks:
+                callback(self)
 
     def add_comment(
         self,
@@ -264,6 +351,28 @@ class Task(GenericCamelModel, Generic[T]):
                 message=f"Task {self.task_id} did not complete within requested timeout of {max_timeout_s}s. The task is still running on the server. You can retrieve its status via Task.get() or try waiting again with wait()."
             )
 
+    async def wait_async(self, max_timeout_s: float = 180, retry_delay_s: float = 1):
+        """Like `wait`, but sleeps without blocking the event loop, so several tasks can be awaited together.
+
+        Each status check runs in the loop's default executor. For example, to search several indexes at once:
+
+            tasks = [index.search(query, wait=False) for index in indexes]
+            await asyncio.gather(*(task.wait_async() for task in tasks))
+        """
+        loop = asyncio.get_running_loop()
+        t0 = time.perf_counter()
+        while time.perf_counter() - t0 < max_timeout_s and self.state not in (
+            TaskState.succeeded,
+            TaskState.failed,
+        ):
+            await asyncio.sleep(retry_delay_s)
+            await loop.run_in_executor(None, self.refresh)
+
+        if self.state not in (TaskState.succeeded, TaskState.failed):
+            raise SteamshipError(
+                message=f"Task {self.task_id} did not complete within requested timeout of {max_timeout_s}s. The task is still running on the server. You can retrieve its status via Task.get() or try waiting again with wait()."
+            )
+
     def refresh(self):
         if self.task_id is None:
             raise SteamshipError(message="Unable to refresh task because `task_id` is None")
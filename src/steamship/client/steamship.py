@@ -7,6 +7,7 @@ from typing import Any, Dict, Generator, List, Optional
 
 from pydantic import BaseModel
 
+from steamship.base.cache import ObjectCache, SearchCache
 from steamship.base.client import Client
 from steamship.base.configuration import Configuration
 from steamship.base.error import SteamshipError
@@ -19,6 +20,7 @@ from steamship.data.plugin.index_plugin_instance import EmbeddingIndexPluginInst
 from steamship.data.plugin.plugin_instance import PluginInstance
 from steamship.data.plugin.prompt_generation_plugin_instance import PromptGenerationPluginInstance
 from steamship.data.workspace import Workspace
+from steamship.utils.content_cache import ContentCache
 from steamship.utils.metadata import hash_dict
 
 _logger = logging.getLogger(__name__)
@@ -53,6 +55,9 @@ class Steamship(Client):
         config_file: str = None,
         config: Configuration = None,
         trust_workspace_config: bool = False,  # For use by lambda_handler; don't fetch the workspace
+        object_cache: Optional[ObjectCache] = None,
+        content_cache: Optional[ContentCache] = None,
+        search_cache: Optional[SearchCache] = None,
         **kwargs,
     ):
         super().__init__(
@@ -66,6 +71,9 @@ class Steamship(Client):
             config_file=config_file,
             config=config,
             trust_workspace_config=trust_workspace_config,
+            object_cache=object_cache,
+            content_cache=content_cache,
+            search_cache=search_cache,
             **kwargs,
         )
         # We use object.__setattr__ here in order to bypass Pydantic's overloading of it (which would block this
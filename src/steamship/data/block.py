@@ -1,17 +1,24 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import Any, List, Optional, Type, Union
+from pathlib import Path
+from typing import Any, FrozenSet, Iterator, List, Optional, Type, Union
 
 import requests
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from steamship import MimeTypes, SteamshipError
-from steamship.base.client import Client
+from steamship.base.client import (
+    DEFAULT_STREAM_CHUNK_SIZE,
+    Client,
+    StreamProgressCallback,
+    stream_url,
+)
 from steamship.base.model import CamelModel
 from steamship.base.request import DeleteRequest, IdentifierRequest, Request
 from steamship.base.response import Response
 from steamship.data.tags.tag import Tag
+from steamship.utils.binary_utils import write_chunks
 
 
 class BlockQueryRequest(Request):
@@ -48,6 +55,10 @@ class Block(CamelModel):
         BlockUploadType
     ] = None  # for returning Blocks as the result of a generate request
 
+    # The parts this object holds; a File projection may leave out or filter its tags (see `File.is_loaded`).
+    _loaded: FrozenSet[str] = PrivateAttr(frozenset({"tags"}))
+    _partial: FrozenSet[str] = PrivateAttr(frozenset())
+
     class ListRequest(Request):
         file_id: str = None
 
@@ -65,11 +76,19 @@ class Block(CamelModel):
         client: Client,
         _id: str = None,
     ) -> Block:
-        return client.post(
+        cache = client.object_cache
+        if cache is not None:
+            cached = cache.get_model(client, Block, "block", _id)
+            if cached is not None:
+                return cached
+        block = client.post(
             "block/get",
             IdentifierRequest(id=_id),
             expect=Block,
         )
+        if cache is not None:
+            cache.put_model("block", block)
+        return block
 
     @staticmethod
     def create(
@@ -116,19 +135,41 @@ class Block(CamelModel):
             else None
         )
 
-        return client.post(
-            "block/create",
-            req,
-            expect=Block,
-            file=file_data,
-        )
+        try:
+            return client.post(
+                "block/create",
+                req,
+                expect=Block,
+                file=file_data,
+            )
+        finally:
+            # After the request, so a concurrent read cannot cache the File as it was before it
+            if client.object_cache is not None:
+                client.object_cache.invalidate("file", file_id)
+
+    def is_loaded(self, part: str) -> bool:
+        """Whether this Block holds all its `tags`, i.e. they were not omitted or filtered by a File projection."""
+        return part in self._loaded
+
+    def load_tags(self) -> List[Tag]:
+        """Fetch this Block's tags if a File projection omitted or filtered them, and return them."""
+        if not self.is_loaded("tags"):
+            self.tags = Block.get(self.client, _id=self.id).tags
+            self._loaded = self._loaded | {"tags"}
+            self._partial = self._partial - {"tags"}
+        return self.tags
 
     def delete(self) -> Block:
-        return self.client.post(
-            "block/delete",
-            DeleteRequest(id=self.id),
-            expect=Tag,
-        )
+        try:
+            return self.client.post(
+                "block/delete",
+                DeleteRequest(id=self.id),
+                expect=Tag,
+            )
+        finally:
+            if self.client.object_cache is not None:
+                self.client.object_cache.invalidate("block", self.id)
+                self.client.object_cache.invalidate("file", self.file_id)
 
     @staticmethod
     def query(
@@ -143,8 +184,11 @@ class Block(CamelModel):
         )
         return res
 
-    def index(self, embedding_plugin_instance: Any = None):
-        """Index this block."""
+    def index(self, embedding_plugin_instance: Any = None, dedupe: bool = False):
+        """Index this block.
+
+        With `dedupe`, the block is skipped if the index already holds the same text; see
+        `EmbeddingIndexPluginInstance.insert`."""
         tags = [
             Tag(
                 text=self.text,
@@ -155,10 +199,21 @@ class Block(CamelModel):
                 end_idx=len(self.text),
             )
         ]
-        return embedding_plugin_instance.insert(tags)
+        return embedding_plugin_instance.insert(tags, dedupe=dedupe)
+
+    def _content_cache_key(self) -> str:
+        return f"{self.id}|{self.content_url or ''}"
 
     def raw(self):
+        """Return the raw content of this Block.
+
+        If the client has a content cache, the content is downloaded once and then read from disk."""
+        cache = self.client.content_cache if self.client is not None else None
+        if cache is not None and self.id is not None:
+            return cache.read_or_fetch(self._content_cache_key(), self.raw_stream)
         if self.content_url is not None:
+            if self.client is not None:
+                return b"".join(self.client.stream(url=self.content_url))
             return requests.get(self.content_url).content
         else:
             return self.client.post(
@@ -169,6 +224,63 @@ class Block(CamelModel):
                 raw_response=True,
             )
 
+    def raw_view(self) -> memoryview:
+        """Return the raw content of this Block as a read-only memoryview.
+
+        With a content cache on the client, the view maps the cached file into memory rather than copying it."""
+        cache = self.client.content_cache if self.client is not None else None
+        if cache is not None and self.id is not None:
+            key = self._content_cache_key()
+            cache.get_or_fetch(key, self.raw_stream)
+            view = cache.view(key)
+            if view is not None:
+                return view
+        return memoryview(self.raw())
+
+    def raw_stream(
+        self,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        offset: int = 0,
+        length: Optional[int] = None,
+        on_progress: Optional[StreamProgressCallback] = None,
+    ) -> Iterator[bytes]:
+        """Stream the raw content of this Block in chunks instead of loading it into memory as `raw` does.
+
+        `offset` and `length` select a byte range of the content."""
+        if self.content_url is not None:
+            stream = self.client.stream if self.client is not None else stream_url
+            return stream(
+                url=self.content_url,
+                chunk_size=chunk_size,
+                offset=offset,
+                length=length,
+                on_progress=on_progress,
+            )
+        return self.client.stream(
+            "block/raw",
+            payload={"id": self.id},
+            chunk_size=chunk_size,
+            offset=offset,
+            length=length,
+            on_progress=on_progress,
+        )
+
+    def raw_to_path(
+        self,
+        path: Union[str, Path],
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        offset: int = 0,
+        length: Optional[int] = None,
+        on_progress: Optional[StreamProgressCallback] = None,
+    ) -> Path:
+        """Stream the raw content of this Block into the file at `path`."""
+        return write_chunks(
+            self.raw_stream(
+                chunk_size=chunk_size, offset=offset, length=length, on_progress=on_progress
+            ),
+            path,
+        )
+
     def is_text(self):
         """Return whether this is a text Block."""
         return self.mime_type == MimeTypes.TXT
@@ -1,21 +1,30 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, List, Optional, Type, Union
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from steamship import SteamshipError
-from steamship.base import Task
+from steamship.base import Task, TaskState
 from steamship.base.client import Client
 from steamship.base.model import CamelModel
 from steamship.base.request import DeleteRequest, Request
 from steamship.base.response import Response
 from steamship.data.search import Hit
+from steamship.utils.concurrency import DEFAULT_CONCURRENCY, BulkItemResult, run_concurrently
 from steamship.utils.metadata import metadata_to_str
+from steamship.utils.vector_encoding import EncodedVectors, VectorEncoding, vectors_or_encoded
 
 MAX_RECOMMENDED_ITEM_LENGTH = 5000
 
+# Bounds on each request made by `EmbeddingIndex.insert_many`.
+DEFAULT_INSERT_BATCH_ITEMS = 500
+DEFAULT_INSERT_BATCH_BYTES = 4 * 1024 * 1024
+
 
 class EmbedAndSearchRequest(Request):
     query: str
@@ -49,21 +58,18 @@ class EmbeddedItem(CamelModel):
 
     def clone_for_insert(self) -> EmbeddedItem:
         """Produces a clone with a string representation of the metadata"""
-        ret = EmbeddedItem(
-            id=self.id,
-            index_id=self.index_id,
-            file_id=self.file_id,
-            block_id=self.block_id,
-            tag_id=self.tag_id,
-            value=self.value,
-            external_id=self.external_id,
-            external_type=self.external_type,
-            metadata=self.metadata,
-            embedding=self.embedding,
-        )
-        if isinstance(ret.metadata, dict) or isinstance(ret.metadata, list):
-            ret.metadata = json.dumps(ret.metadata)
-        return ret
+        # A shallow copy skips re-validating every field; only the metadata is replaced.
+        if isinstance(self.metadata, dict) or isinstance(self.metadata, list):
+            return self.copy(update={"metadata": json.dumps(self.metadata)})
+        return self.copy()
+
+    def insert_size(self) -> int:
+        """Estimate the number of bytes this item adds to an insert request."""
+        size = 100  # Field names and punctuation
+        for text in (self.value, self.metadata, self.external_id, self.external_type):
+            if isinstance(text, str):
+                size += len(text.encode("utf-8"))
+        return size + 20 * len(self.embedding or [])
 
 
 class IndexCreateRequest(Request):
@@ -99,12 +105,34 @@ class IndexInsertResponse(Response):
 
 class IndexEmbedRequest(Request):
     id: str
+    item_ids: Optional[List[str]] = None  # If set, only these items need embedding
 
 
 class IndexEmbedResponse(Response):
     id: Optional[str] = None
 
 
+class IndexEmbedTask(Task[IndexEmbedResponse]):
+    """The Task of an `EmbeddingIndex.embed` call, with counts of the items it covers.
+
+    The counts are kept by the client and survive `refresh()` and `wait()`."""
+
+    submitted_items: int = 0  # Items inserted through the client since the previous embed
+    embedded_items: int = 0  # Items inserted through the client and embedded, including these
+
+    # The index whose record of inserted item ids can be trimmed once this task succeeds.
+    _index: Optional[EmbeddingIndex] = PrivateAttr(None)
+
+    def update(self, other: Optional[Task] = None):
+        super().update(other)
+        self._forget_embedded()
+
+    def _forget_embedded(self):
+        if self._index is not None and self.state == TaskState.succeeded:
+            self._index._forget_embedded(self.embedded_items)
+            self._index = None
+
+
 class IndexSearchRequest(Request):
     id: str
     query: str = None
@@ -118,11 +146,60 @@ class ListItemsRequest(Request):
     file_id: str = None
     block_id: str = None
     span_id: str = None
+    embedding_encoding: Optional[VectorEncoding] = None
+    # Set to False to list the items without their embeddings
+    include_embeddings: Optional[bool] = None
 
 
 class ListItemsResponse(Response):
     items: List[EmbeddedItem]
 
+    # If a binary `embedding_encoding` was requested, the embeddings of `items`, in order, in place of
+    # each item's `embedding`.
+    encoded_embeddings: Optional[EncodedVectors] = None
+
+    def vectors(self) -> Any:
+        """The embeddings of `items`, in order: a float32 NumPy array if NumPy is installed."""
+        if self.encoded_embeddings is None and any(not item.embedding for item in self.items):
+            return None
+        return vectors_or_encoded([item.embedding for item in self.items], self.encoded_embeddings)
+
+
+def _insert_batches(
+    items: List[EmbeddedItem], max_items: int, max_bytes: int
+) -> Iterator[List[EmbeddedItem]]:
+    batch, size = [], 0
+    for item in items:
+        item_size = item.insert_size()
+        if batch and (len(batch) >= max_items or size + item_size > max_bytes):
+            yield batch
+            batch, size = [], 0
+        batch.append(item)
+        size += item_size
+    if batch:
+        yield batch
+
+
+def _batch_ranges(
+    batches: List[List[EmbeddedItem]], results: List[BulkItemResult]
+) -> List[Tuple[int, int]]:
+    """The [start, end) positions in the inserted items of the batches the `results` are for."""
+    starts = [0]
+    for batch in batches:
+        starts.append(starts[-1] + len(batch))
+    return [(starts[result.index], starts[result.index + 1]) for result in results]
+
+
+def _failed_batches_error(
+    batches: List[List[EmbeddedItem]], failed: List[BulkItemResult]
+) -> SteamshipError:
+    ranges = ", ".join(f"[{start}, {end})" for start, end in _batch_ranges(batches, failed))
+    return SteamshipError(
+        message=f"{len(failed)} of {len(batches)} insert batches failed: the items at {ranges}. "
+        + f"The first failure was: {failed[0].error}",
+        error=failed[0].error,
+    )
+
 
 class EmbeddingIndex(CamelModel):
     """A persistent, read-optimized index over embeddings."""
@@ -145,6 +222,45 @@ class EmbeddingIndex(CamelModel):
             obj = obj["index"]
         return super().parse_obj(obj)
 
+    # Ids of the items inserted through this object and not yet known to be embedded, in order, after the first
+    # `_forgotten` ones; and how many items (counting those) have been sent for embedding.
+    _item_ids: List[str] = PrivateAttr(default_factory=list)
+    _forgotten: int = PrivateAttr(0)
+    _embedded_mark: int = PrivateAttr(0)
+    _mark_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def _post_change(self, operation: str, request: Request, expect: Type) -> Any:
+        """Post a request that changes the index, dropping its cached search results."""
+        response = self.client.post(operation, request, expect=expect)
+        self._invalidate_searches()
+        if isinstance(response, IndexInsertResponse):
+            with self._mark_lock:
+                self._item_ids.extend(item.id for item in response.item_ids or [])
+                if request.reindex:
+                    self._embedded_mark = self._forgotten + len(self._item_ids)
+            if request.reindex:
+                self._forget_embedded(self._embedded_mark)
+        return response
+
+    def _invalidate_searches(self, task: Optional[Task] = None):
+        """Drop the cached search results of this index. Takes `task` to serve as a `Task.add_done_callback`."""
+        if self.client.search_cache is not None:
+            self.client.search_cache.invalidate_index(self.id)
+
+    def _forget_embedded(self, count: int):
+        """Drop the ids of the first `count` items inserted through this object, which have been embedded."""
+        with self._mark_lock:
+            count = min(count, self._embedded_mark)
+            if count > self._forgotten:
+                del self._item_ids[: count - self._forgotten]
+                self._forgotten = count
+
+    @property
+    def pending_items(self) -> int:
+        """The number of items inserted through this object with `reindex=False` and not embedded since."""
+        with self._mark_lock:
+            return self._forgotten + len(self._item_ids) - self._embedded_mark
+
     def insert_file(
         self,
         file_id: str,
@@ -166,7 +282,7 @@ class EmbeddingIndex(CamelModel):
             metadata=metadata,
             reindex=reindex,
         )
-        return self.client.post(
+        return self._post_change(
             "embedding-index/item/create",
             req,
             expect=IndexInsertResponse,
@@ -194,29 +310,91 @@ class EmbeddingIndex(CamelModel):
                                 f"Inserted item {i} of length {len(item.value)} exceeded maximum recommended length of {MAX_RECOMMENDED_ITEM_LENGTH} characters. You may insert it anyway by passing allow_long_records=True."
                             )
 
+    def _insert_batch(self, items: List[EmbeddedItem], reindex: bool) -> IndexInsertResponse:
+        return self._post_change(
+            "embedding-index/item/create",
+            IndexInsertRequest(index_id=self.id, items=items, reindex=reindex),
+            expect=IndexInsertResponse,
+        )
+
     def insert_many(
         self,
         items: List[Union[EmbeddedItem, str]],
         reindex: bool = True,
         allow_long_records=False,
+        batch_size: int = DEFAULT_INSERT_BATCH_ITEMS,
+        max_batch_bytes: int = DEFAULT_INSERT_BATCH_BYTES,
+        concurrency: int = DEFAULT_CONCURRENCY,
     ) -> IndexInsertResponse:
-        new_items = []
-        for item in items:
-            if isinstance(item, str):
-                new_items.append(EmbeddedItem(value=item))
-            else:
-                new_items.append(item)
+        """Insert many items, splitting them into requests of at most `batch_size` items and `max_batch_bytes`.
 
-        req = IndexInsertRequest(
-            index_id=self.id,
-            items=[item.clone_for_insert() for item in new_items],
-            reindex=reindex,
+        Batches are sent with up to `concurrency` in flight. The returned `item_ids` are in the order of `items`.
+        If several batches are sent, the index is re-embedded once after all of them rather than once per batch.
+
+        Failed batches are not retried, since the Engine may have inserted their items before failing. If any
+        batch fails, the others stay inserted (and, with `reindex`, are embedded) and a SteamshipError is raised
+        naming the positions in `items` of the failed batches, so that just those can be inserted again.
+        """
+        batches, results = self._insert_in_batches(
+            items, reindex, allow_long_records, batch_size, max_batch_bytes, concurrency
         )
-        self._check_input(req, allow_long_records)
-        return self.client.post(
-            "embedding-index/item/create",
-            req,
-            expect=IndexInsertResponse,
+        failed = [result for result in results if not result.ok]
+        if failed:
+            raise _failed_batches_error(batches, failed)
+        return IndexInsertResponse(
+            item_ids=[item_id for result in results for item_id in result.output.item_ids or []]
+        )
+
+    def _insert_in_batches(
+        self,
+        items: List[Union[EmbeddedItem, str]],
+        reindex: bool,
+        allow_long_records: bool,
+        batch_size: int = DEFAULT_INSERT_BATCH_ITEMS,
+        max_batch_bytes: int = DEFAULT_INSERT_BATCH_BYTES,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> Tuple[List[List[EmbeddedItem]], List[BulkItemResult[IndexInsertResponse]]]:
+        """Insert `items` as `insert_many` does, returning the batches and the result of each batch.
+
+        A single batch is sent as is, and its error is raised; with several, failed batches are only reported."""
+        new_items = [
+            EmbeddedItem(value=item) if isinstance(item, str) else item.clone_for_insert()
+            for item in items
+        ]
+        self._check_input(
+            IndexInsertRequest.construct(index_id=self.id, items=new_items), allow_long_records
+        )
+
+        batches = list(_insert_batches(new_items, batch_size, max_batch_bytes))
+        if len(batches) <= 1:
+            response = self._insert_batch(new_items, reindex)
+            return [new_items], [BulkItemResult(index=0, output=response)]
+
+        results = run_concurrently(
+            lambda batch: self._insert_batch(batch, reindex=False),
+            batches,
+            concurrency=concurrency,
+        )
+        if reindex and any(result.ok for result in results):
+            self.embed()
+        return batches, results
+
+    def bulk_inserter(
+        self,
+        max_items: int = DEFAULT_INSERT_BATCH_ITEMS,
+        max_bytes: int = DEFAULT_INSERT_BATCH_BYTES,
+        flush_interval_s: Optional[float] = 5,
+        reindex: bool = True,
+        allow_long_records: bool = False,
+    ) -> BulkInserter:
+        """Return a `BulkInserter` that buffers `insert` calls into batched requests; use it as a context manager."""
+        return BulkInserter(
+            self,
+            max_items=max_items,
+            max_bytes=max_bytes,
+            flush_interval_s=flush_interval_s,
+            reindex=reindex,
+            allow_long_records=allow_long_records,
         )
 
     def insert(
@@ -238,37 +416,107 @@ class EmbeddingIndex(CamelModel):
             reindex=reindex,
         )
         self._check_input(req, allow_long_records)
-        return self.client.post(
+        return self._post_change(
             "embedding-index/item/create",
             req,
             expect=IndexInsertResponse,
         )
 
-    def embed(
-        self,
-    ) -> Task[IndexEmbedResponse]:
-        req = IndexEmbedRequest(id=self.id)
-        return self.client.post(
+    def embed(self, incremental: bool = False) -> IndexEmbedTask:
+        """Embed the items of the index that have not been embedded yet.
+
+        The returned Task counts the items inserted through this object since the previous embed. With
+        `incremental`, the request names just those items, and if there are none, no request is made and a
+        completed Task is returned. This suits bulk loads: insert with `reindex=False`, then embed once.
+
+        The ids of the items are only kept until they are known to be embedded: once the Task succeeds (as seen by
+        `wait()` or `refresh()`), or an insert with `reindex` embeds them."""
+        with self._mark_lock:
+            start, end = self._embedded_mark, self._forgotten + len(self._item_ids)
+            pending = self._item_ids[start - self._forgotten :]
+        if incremental and not pending:
+            return IndexEmbedTask(
+                client=self.client,
+                state=TaskState.succeeded,
+                output=IndexEmbedResponse(id=self.id),
+                embedded_items=end,
+            )
+
+        req = IndexEmbedRequest(id=self.id, item_ids=pending if incremental else None)
+        task = self._post_change(
             "embedding-index/embed",
             req,
             expect=IndexEmbedResponse,
         )
+        with self._mark_lock:
+            self._embedded_mark = max(self._embedded_mark, end)
+        embed_task = IndexEmbedTask(
+            client=task.client,
+            expect=task.expect,
+            submitted_items=len(pending),
+            embedded_items=end,
+            **task.dict(),
+        )
+        embed_task._index = self
+        embed_task._forget_embedded()  # If it has already succeeded
+        # Searches run while the embed is in progress may have cached results from the old embeddings.
+        embed_task.add_done_callback(self._invalidate_searches)
+        return embed_task
 
     def list_items(
         self,
         file_id: str = None,
         block_id: str = None,
         span_id: str = None,
+        embedding_encoding: Optional[VectorEncoding] = None,
+        include_embeddings: Optional[bool] = None,
     ) -> ListItemsResponse:
-        req = ListItemsRequest(id=self.id, file_id=file_id, block_id=block_id, spanId=span_id)
+        """List the items of the index.
+
+        Pass a binary `embedding_encoding` to receive the embeddings compactly in `encoded_embeddings`; use
+        `vectors()` on the response to read them in either form. Set `include_embeddings` to False when only the
+        items' values and metadata are needed."""
+        req = ListItemsRequest(
+            id=self.id,
+            file_id=file_id,
+            block_id=block_id,
+            spanId=span_id,
+            embedding_encoding=embedding_encoding,
+            include_embeddings=include_embeddings,
+        )
         return self.client.post(
             "embedding-index/item/list",
             req,
             expect=ListItemsResponse,
         )
 
+    def export_snapshot(
+        self,
+        path: Union[str, Path],
+        metric: Optional[str] = None,
+        file_id: str = None,
+        block_id: str = None,
+    ) -> Path:
+        """Write the items of the index (optionally only those of one File or Block) and their embeddings to a
+        snapshot directory at `path`, for `steamship.data.index_snapshot.load_snapshot` to open.
+
+        `metric` is the `VectorMetric` the snapshot will be searched with; cosine similarity by default."""
+        from steamship.data.index_snapshot import write_snapshot
+        from steamship.data.vector_index import VectorMetric
+
+        response = self.list_items(
+            file_id=file_id, block_id=block_id, embedding_encoding=VectorEncoding.FLOAT32
+        )
+        return write_snapshot(
+            path,
+            response.items or [],
+            vectors=response.vectors(),
+            metric=metric or VectorMetric.COSINE,
+            index_id=self.id,
+        )
+
     def delete(self) -> EmbeddingIndex:
-        return self.client.post(
+        return self._post_change(
             "embedding-index/delete",
             DeleteRequest(id=self.id),
             expect=EmbeddingIndex,
@@ -279,7 +527,13 @@ class EmbeddingIndex(CamelModel):
         query: Union[str, List[str]],
         k: int = 1,
         include_metadata: bool = False,
+        wait: bool = True,
     ) -> Task[QueryResults]:
+        """Search the index for the `k` items nearest `query`, or each query in a list.
+
+        If the client has a `search_cache`, repeated searches are answered from it with a completed Task. Otherwise
+        a search that is not cached waits for its result, unless `wait` is False; its result is then cached once
+        the Task is seen to complete. Without a `search_cache`, the Task is returned as soon as it is created."""
         if isinstance(query, list):
             req = IndexSearchRequest(
                 id=self.id, queries=query, k=k, include_metadata=include_metadata
@@ -288,13 +542,27 @@ class EmbeddingIndex(CamelModel):
             req = IndexSearchRequest(
                 id=self.id, query=query, k=k, include_metadata=include_metadata
             )
-        ret = self.client.post(
-            "embedding-index/search",
-            req,
-            expect=QueryResults,
-        )
+        cache = self.client.search_cache
+        if cache is None:
+            return self.client.post("embedding-index/search", req, expect=QueryResults)
+
+        key = cache.search_key(self.id, query, k, include_metadata)
+        cached = cache.get_model(self.client, QueryResults, "search", key)
+        if cached is not None:
+            return Task(
+                client=self.client, expect=QueryResults, state=TaskState.succeeded, output=cached
+            )
+        task = self.client.post("embedding-index/search", req, expect=QueryResults)
+
+        def _cache_result(completed: Task):
+            # Under the key of the index's generation when the search was made, so a change since then hides it.
+            if completed.state == TaskState.succeeded and completed.output is not None:
+                cache.put("search", key, completed.output.json(by_alias=True).encode("utf-8"))
 
-        return ret
+        task.add_done_callback(_cache_result)
+        if wait:
+            task.wait()
+        return task
 
     @staticmethod
     def create(
@@ -321,3 +589,103 @@ class EmbeddingIndex(CamelModel):
             req,
             expect=EmbeddingIndex,
         )
+
+
+class BulkInserter:
+    """Buffers items inserted into an EmbeddingIndex and sends them in batches.
+
+    A batch is sent when the buffer reaches `max_items` items or `max_bytes`, when the oldest buffered item has
+    waited `flush_interval_s`, on `flush()`, and when the context exits. Batches are inserted without re-embedding;
+    the index is re-embedded once on exit if `reindex` is set. `item_ids` collects the ids of the inserted items in
+    insertion order.
+
+    A batch that fails is not retried and its items are dropped. The error is raised by the call that sent it or,
+    for a periodic flush, by the next call to `insert` or `close`.
+
+        with index.bulk_inserter() as inserter:
+            for text in texts:
+                inserter.insert(text)
+    """
+
+    def __init__(
+        self,
+        index: EmbeddingIndex,
+        max_items: int = DEFAULT_INSERT_BATCH_ITEMS,
+        max_bytes: int = DEFAULT_INSERT_BATCH_BYTES,
+        flush_interval_s: Optional[float] = 5,
+        reindex: bool = True,
+        allow_long_records: bool = False,
+    ):
+        self.index = index
+        self.allow_long_records = allow_long_records
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.flush_interval_s = flush_interval_s
+        self.reindex = reindex
+        self.item_ids: List[IndexItemId] = []
+        self._buffer: List[EmbeddedItem] = []
+        self._buffer_bytes = 0
+        self._oldest: Optional[float] = None
+        self._lock = threading.RLock()
+        self._error: Optional[Exception] = None
+        self._closed = threading.Event()
+        self._timer: Optional[threading.Thread] = None
+        if flush_interval_s is not None:
+            self._timer = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._timer.start()
+
+    def __enter__(self) -> BulkInserter:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close(flush=exc_type is None)
+
+    def insert(self, item: Union[EmbeddedItem, str]):
+        item = EmbeddedItem(value=item) if isinstance(item, str) else item.clone_for_insert()
+        self.index._check_input(
+            IndexInsertRequest.construct(items=[item], value=None), self.allow_long_records
+        )
+        with self._lock:
+            self._raise_error()
+            self._buffer.append(item)
+            self._buffer_bytes += item.insert_size()
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            if len(self._buffer) >= self.max_items or self._buffer_bytes >= self.max_bytes:
+                self.flush()
+
+    def flush(self):
+        """Send the buffered items now."""
+        with self._lock:
+            if not self._buffer:
+                return
+            batch, self._buffer, self._buffer_bytes, self._oldest = self._buffer, [], 0, None
+            response = self.index._insert_batch(batch, reindex=False)
+            self.item_ids.extend(response.item_ids or [])
+
+    def close(self, flush: bool = True):
+        """Stop the periodic flushing and, if `flush` is set, send the remaining items and re-embed the index."""
+        self._closed.set()
+        if self._timer is not None:
+            self._timer.join()
+        if flush:
+            self.flush()
+            self._raise_error()
+            if self.reindex and self.item_ids:
+                self.index.embed()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _flush_periodically(self):
+        while not self._closed.wait(min(self.flush_interval_s, 1)):
+            with self._lock:
+                if self._oldest is None or time.monotonic() - self._oldest < self.flush_interval_s:
+                    continue
+                try:
+                    self.flush()
+                except Exception as e:
+                    # Surfaced by the next call to `insert` or `close`.
+                    self._error = e
@@ -1,21 +1,45 @@
 from __future__ import annotations
 
 import io
+import json
+import time
 from enum import Enum
-from typing import TYPE_CHECKING, Any, List, Optional, Type, Union
-
-from pydantic import BaseModel, Field
+from http import HTTPStatus
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
+
+from pydantic import BaseModel, Field, PrivateAttr
 
 from steamship import MimeTypes, SteamshipError
-from steamship.base.client import Client
+from steamship.base.client import DEFAULT_STREAM_CHUNK_SIZE, Client, StreamProgressCallback
 from steamship.base.model import CamelModel
-from steamship.base.request import GetRequest, IdentifierRequest, Request
-from steamship.base.response import Response
+from steamship.base.request import GetRequest, IdentifierRequest, ListRequest, Request, SortOrder
+from steamship.base.response import ListResponse, Response
 from steamship.base.tasks import Task
 from steamship.data.block import Block
-from steamship.data.embeddings import EmbeddingIndex
 from steamship.data.tags import Tag
-from steamship.utils.binary_utils import flexi_create
+from steamship.utils.binary_utils import flexi_create, write_chunks
+from steamship.utils.concurrency import (
+    DEFAULT_CONCURRENCY,
+    BulkItemResult,
+    ProgressCallback,
+    is_transient_error,
+    run_concurrently,
+)
+from steamship.utils.paging import iterate_pages
 
 if TYPE_CHECKING:
     from steamship.data.operations.tagger import TagResponse
@@ -27,22 +51,246 @@ class FileUploadType(str, Enum):
     BLOCKS = "blocks"  # Blocks are sent to create a file
 
 
+# An item for `File.create_many`: content, a path to read content from, a list of Blocks, or a dict of
+# `File.create` keyword arguments (which may use `path` in place of `content`).
+FileCreateItem = Union[str, bytes, Path, List[Block], Dict[str, Any]]
+
+
+def _file_create_kwargs(item: FileCreateItem) -> Dict[str, Any]:
+    """Normalize a `FileCreateItem` into `File.create` keyword arguments, reading any path it names."""
+    if isinstance(item, (str, bytes)):
+        return {"content": item}
+    if isinstance(item, Path):
+        return {"content": item.read_bytes()}
+    if isinstance(item, list):
+        return {"blocks": item}
+    kwargs = dict(item)
+    path = kwargs.pop("path", None)
+    if path is not None:
+        kwargs["content"] = Path(path).read_bytes()
+    return kwargs
+
+
+def _file_create_handle(item: FileCreateItem) -> Optional[str]:
+    return item.get("handle") if isinstance(item, dict) else None
+
+
+# An item for `File.append_blocks`: the text of a Block, a Block, or a dict of `Block.create` keyword arguments.
+BlockAppendItem = Union[str, Block, Dict[str, Any]]
+
+
+def _block_create_kwargs(item: BlockAppendItem) -> Dict[str, Any]:
+    if isinstance(item, str):
+        return {"text": item}
+    if isinstance(item, Block):
+        return {"text": item.text, "tags": item.tags, "url": item.url, "mime_type": item.mime_type}
+    return dict(item)
+
+
 class FileClearResponse(Response):
     id: str
 
 
-class ListFileRequest(Request):
+class FileProjectionRequest(Request):
+    """Fields selecting which parts of the returned Files the Engine should include.
+
+    Leaving them unset returns every block and tag."""
+
+    include_blocks: Optional[bool] = None
+    include_tags: Optional[bool] = None
+    tag_kinds: Optional[List[str]] = None  # Only return tags of these kinds
+
+
+class FileGetRequest(IdentifierRequest, FileProjectionRequest):
+    pass
+
+
+class ListFileRequest(ListRequest, FileProjectionRequest):
     pass
 
 
-class ListFileResponse(Response):
+class ListFileResponse(ListResponse):
     files: List[File]
 
 
-class FileQueryRequest(Request):
+class FileQueryRequest(FileProjectionRequest):
     tag_filter_query: str
 
 
+def _mark_omitted(obj: Union[File, Block], part: str) -> None:
+    setattr(obj, part, [])
+    obj._loaded = obj._loaded - {part}
+
+
+def _mark_partial(obj: Union[File, Block], tag_kinds: List[str]) -> None:
+    obj.tags = [tag for tag in obj.tags or [] if tag.kind in tag_kinds]
+    obj._loaded = obj._loaded - {"tags"}
+    obj._partial = obj._partial | {"tags"}
+
+
+def _project_files(
+    files: List[File],
+    include_blocks: Optional[bool] = None,
+    include_tags: Optional[bool] = None,
+    tag_kinds: Optional[List[str]] = None,
+) -> None:
+    """Apply a projection to Files returned by the Engine.
+
+    Omitted blocks and tags are left as empty lists but recorded as not loaded (see `File.is_loaded`), so that
+    they are not mistaken for empty parts and can be fetched with `File.load_blocks` and friends. Tags restricted
+    to `tag_kinds` are kept but recorded as not loaded either, since they are only some of the tags."""
+    for file in files:
+        if include_blocks is False:
+            _mark_omitted(file, "blocks")
+        for obj in [file, *file.blocks]:
+            if include_tags is False:
+                _mark_omitted(obj, "tags")
+            elif tag_kinds is not None:
+                _mark_partial(obj, tag_kinds)
+
+
+# Bounds on each insert request made by `File.index`.
+DEFAULT_INDEX_CHUNK_BLOCKS = 500
+DEFAULT_INDEX_CHUNK_BYTES = 4 * 1024 * 1024
+
+
+class IndexChunkResult(CamelModel):
+    """The outcome of inserting one chunk of a File's blocks into an embedding index."""
+
+    first_block: int  # Position among the blocks being indexed of the chunk's first block
+    block_count: int
+    text_bytes: int
+    elapsed_s: float
+    skipped_blocks: int = 0  # Blocks whose content the index already held
+    error: Optional[str] = None
+
+
+class FileIndexResult(CamelModel):
+    chunks: List[IndexChunkResult] = []
+    indexed_blocks: int = 0
+    skipped_blocks: int = 0  # Blocks already present in the index, by id or by content
+    embed_task: Optional[Task] = None  # Embeds the inserted blocks; None if none were inserted
+
+    @property
+    def ok(self) -> bool:
+        return all(chunk.error is None for chunk in self.chunks)
+
+
+def _index_chunks(
+    blocks: List[Block], max_blocks: int, max_bytes: int
+) -> List[Tuple[int, List[Block], int]]:
+    """Group blocks into (first position, blocks, text bytes) chunks within both bounds.
+
+    A single block larger than `max_bytes` gets a chunk of its own."""
+    chunks = []
+    start, chunk, size = 0, [], 0
+    for position, block in enumerate(blocks):
+        block_bytes = len((block.text or "").encode("utf-8"))
+        if chunk and (len(chunk) >= max_blocks or size + block_bytes > max_bytes):
+            chunks.append((start, chunk, size))
+            start, chunk, size = position, [], 0
+        chunk.append(block)
+        size += block_bytes
+    if chunk:
+        chunks.append((start, chunk, size))
+    return chunks
+
+
+def _indexed_block_ids(plugin_instance: Any, file_id: str) -> Set[str]:
+    block_ids = set()
+    for item in plugin_instance.index.list_items(file_id=file_id, include_embeddings=False).items:
+        metadata = item.metadata
+        if isinstance(metadata, str):
+            try:
+                metadata = json.loads(metadata)
+            except ValueError:
+                metadata = None
+        block_id = item.block_id or (metadata or {}).get("_block_id")
+        if block_id is not None:
+            block_ids.add(block_id)
+    return block_ids
+
+
+class FileDelta(CamelModel):
+    """The blocks and tags that changed between two versions of a File."""
+
+    added_blocks: List[Block] = []
+    changed_blocks: List[Block] = []
+    removed_blocks: List[Block] = []
+    added_tags: List[Tag] = []
+    changed_tags: List[Tag] = []
+    removed_tags: List[Tag] = []
+
+    def __bool__(self) -> bool:
+        return any(self.__dict__.values())
+
+
+def _merge_by_id(
+    current: List[Any],
+    incoming: List[Any],
+    added: List[Any],
+    changed: List[Any],
+    removed: List[Any],
+    exclude: Set[str],
+    in_scope: Callable[[Any], bool] = lambda obj: True,
+) -> List[Any]:
+    """Merge `incoming` objects into `current` ones with the same id, updating them in place.
+
+    Returns the merged list: `incoming`'s order, reusing the current object for each id, followed by the current
+    objects outside `in_scope`, which `incoming` is not expected to contain."""
+    current_by_id = {obj.id: obj for obj in current if obj.id is not None}
+    merged = []
+    for new in incoming:
+        old = current_by_id.pop(new.id, None)
+        if old is None:
+            added.append(new)
+            merged.append(new)
+            continue
+        if old.dict(exclude=exclude) != new.dict(exclude=exclude):
+            old.__dict__.update(
+                {k: v for k, v in new.__dict__.items() if k not in exclude and k != "client"}
+            )
+            changed.append(old)
+        merged.append(old)
+    for old in current_by_id.values():
+        (removed if in_scope(old) else merged).append(old)
+    return merged
+
+
+def _merge_tags(
+    owner: Union[File, Block], incoming: Union[File, Block], delta: FileDelta, tag_kinds
+) -> None:
+    if not incoming.is_loaded("tags") and "tags" not in incoming._partial:
+        return  # Tags were not fetched, so nothing is known about them
+    owner.tags = _merge_by_id(
+        owner.tags or [],
+        incoming.tags,
+        delta.added_tags,
+        delta.changed_tags,
+        delta.removed_tags,
+        exclude={"client"},
+        in_scope=lambda tag: tag_kinds is None or tag.kind in tag_kinds,
+    )
+    if incoming.is_loaded("tags"):
+        owner._loaded = owner._loaded | {"tags"}
+        owner._partial = owner._partial - {"tags"}
+
+
+def _cache_file(file: File) -> None:
+    """Write `file` through to its client's object cache, if it has one.
+
+    A File with parts omitted or filtered by a projection is not a complete copy, so its cache entry is dropped
+    instead."""
+    cache = file.client.object_cache if file.client is not None else None
+    if cache is None:
+        return
+    complete = file.is_loaded("blocks") and file.is_loaded("tags")
+    if complete and all(block.is_loaded("tags") for block in file.blocks or []):
+        cache.put_model("file", file)
+    else:
+        cache.invalidate("file", file.id)
+
+
 class File(CamelModel):
     """A file."""
 
@@ -55,6 +303,11 @@ class File(CamelModel):
     tags: List[Tag] = []
     filename: str = None
 
+    # The parts (blocks, tags) this object holds; a projection leaves out the parts it omitted or filtered.
+    _loaded: FrozenSet[str] = PrivateAttr(frozenset({"blocks", "tags"}))
+    # The parts a projection filtered (tags restricted to some kinds), which are held only in part.
+    _partial: FrozenSet[str] = PrivateAttr(frozenset())
+
     class CreateResponse(Response):
         data_: Any = None
         mime_type: str = None
@@ -88,23 +341,94 @@ class File(CamelModel):
         return super().parse_obj(obj)
 
     def delete(self) -> File:
-        return self.client.post(
-            "file/delete",
-            IdentifierRequest(id=self.id),
-            expect=File,
-        )
+        try:
+            return self.client.post(
+                "file/delete",
+                IdentifierRequest(id=self.id),
+                expect=File,
+            )
+        finally:
+            # After the request, so a concurrent read cannot cache the File as it was before it
+            self._invalidate_cached()
+
+    def _invalidate_cached(self, task: Optional[Task] = None):
+        """Drop this File and its blocks from the client's object cache.
+
+        Takes the `task` argument so it can be passed to `Task.add_done_callback` by operations that change the File
+        in the Engine."""
+        cache = self.client.object_cache if self.client is not None else None
+        if cache is not None:
+            cache.invalidate("file", self.id)
+            for block in self.blocks or []:
+                cache.invalidate("block", block.id)
 
     @staticmethod
     def get(
         client: Client,
         _id: str = None,
         handle: str = None,
+        include_blocks: Optional[bool] = None,
+        include_tags: Optional[bool] = None,
+        tag_kinds: Optional[List[str]] = None,
     ) -> File:
-        return client.post(
+        """Fetch a File by id or handle.
+
+        Setting `include_blocks` or `include_tags` to False omits the File's blocks or tags from the
+        response; they are left empty and can be fetched later with `load_blocks` or `load_tags`.
+        `tag_kinds` restricts the returned tags to those kinds.
+
+        If the client has an object cache, complete Files fetched by id are served from and stored in
+        it.
+        """
+        cache = client.object_cache
+        cacheable = (
+            cache is not None
+            and _id is not None
+            and (include_blocks, include_tags, tag_kinds) == (None, None, None)
+        )
+        if cacheable:
+            cached = cache.get_model(client, File, "file", _id)
+            if cached is not None:
+                return cached
+
+        file = client.post(
             "file/get",
-            IdentifierRequest(id=_id, handle=handle),
+            FileGetRequest(
+                id=_id,
+                handle=handle,
+                include_blocks=include_blocks,
+                include_tags=include_tags,
+                tag_kinds=tag_kinds,
+            ),
             expect=File,
         )
+        _project_files([file], include_blocks, include_tags, tag_kinds)
+        if cacheable:
+            cache.put_model("file", file)
+        return file
+
+    def is_loaded(self, part: str) -> bool:
+        """Whether this File holds all its `blocks` or `tags`, i.e. they were not omitted or filtered by a projection."""
+        return part in self._loaded
+
+    def load_blocks(self) -> List[Block]:
+        """Fetch this File's blocks if a projection omitted them, and return them.
+
+        The blocks' tags are fetched too, unless this File's tags were omitted as well."""
+        if not self.is_loaded("blocks"):
+            omit_tags = not self.is_loaded("tags")
+            fetched = File.get(self.client, self.id, include_tags=False if omit_tags else None)
+            self.blocks = fetched.blocks
+            self._loaded = self._loaded | {"blocks"}
+        return self.blocks
+
+    def load_tags(self) -> List[Tag]:
+        """Fetch this File's tags if a projection omitted or filtered them, and return them."""
+        if not self.is_loaded("tags"):
+            self.tags = File.get(self.client, self.id, include_blocks=False).tags
+            self._loaded = self._loaded | {"tags"}
+            self._partial = self._partial - {"tags"}
+        return self.tags
 
     @staticmethod
     def create(
@@ -160,6 +484,73 @@ class File(CamelModel):
             expect=File,
         )
 
+    @staticmethod
+    def create_many(
+        client: Client,
+        items: List[FileCreateItem],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        retries: int = 2,
+        on_progress: Optional[ProgressCallback] = None,
+        skip_existing_handles: bool = False,
+    ) -> List[BulkItemResult[File]]:
+        """Create many files, keeping up to `concurrency` uploads in flight.
+
+        Each item may be content (str or bytes), a `Path` to read content from, a list of Blocks, or a dict of
+        `File.create` keyword arguments. Paths are only read once their upload starts.
+
+        Returns one result per item, in input order. An upload that fails with a transient error (a network
+        failure, or a rate limit or server error from the Engine) is retried up to `retries` times; other failures,
+        such as a missing path or a rejected MIME type, are reported in the item's result at once. A failed item
+        does not stop the others.
+
+        `on_progress` is called with (items finished, `len(items)`).
+
+        If `skip_existing_handles` is set, items whose handle already names a file in the workspace return
+        that file instead of creating a new one, and items repeating a handle earlier in `items` are skipped
+        and return the same file as the first one. The skipped items count as finished from the first progress
+        report on.
+        """
+        first_index_for_handle = {}
+        to_create = []
+        for index, item in enumerate(items):
+            handle = _file_create_handle(item) if skip_existing_handles else None
+            if handle in first_index_for_handle:
+                continue
+            if handle is not None:
+                first_index_for_handle[handle] = index
+            to_create.append(item)
+
+        def _create(item: FileCreateItem) -> File:
+            kwargs = _file_create_kwargs(item)
+            if skip_existing_handles and kwargs.get("handle") is not None:
+                try:
+                    return File.get(client, handle=kwargs["handle"])
+                except SteamshipError as e:
+                    if e.status_code != HTTPStatus.NOT_FOUND:
+                        raise
+            return File.create(client, **kwargs)
+
+        skipped = len(items) - len(to_create)
+        created = iter(
+            run_concurrently(
+                _create,
+                to_create,
+                concurrency=concurrency,
+                retries=retries,
+                on_progress=on_progress
+                and (lambda finished, _: on_progress(finished + skipped, len(items))),
+                retry_if=is_transient_error,
+            )
+        )
+
+        # Re-expand the results to cover the items skipped as repeated handles.
+        results = []
+        for index, item in enumerate(items):
+            first_index = first_index_for_handle.get(_file_create_handle(item), index)
+            source = results[first_index] if first_index != index else next(created)
+            results.append(source.copy(update={"index": index}))
+        return results
+
     @staticmethod
     def create_with_plugin(
         client: Client,
@@ -177,26 +568,118 @@ class File(CamelModel):
 
         return client.post("file/create", payload=req, expect=File, as_background_task=True)
 
-    def refresh(self) -> File:
-        refreshed = File.get(self.client, self.id)
-        self.__init__(**refreshed.dict())
-        self.client = refreshed.client
-        for block in self.blocks:
-            block.client = self.client
+    def refresh(
+        self,
+        include_blocks: Optional[bool] = None,
+        include_tags: Optional[bool] = None,
+        tag_kinds: Optional[List[str]] = None,
+    ) -> File:
+        """Update this File in place from the Engine; see `refresh_delta`."""
+        self.refresh_delta(
+            include_blocks=include_blocks, include_tags=include_tags, tag_kinds=tag_kinds
+        )
         return self
 
+    def refresh_delta(
+        self,
+        include_blocks: Optional[bool] = None,
+        include_tags: Optional[bool] = None,
+        tag_kinds: Optional[List[str]] = None,
+    ) -> FileDelta:
+        """Fetch this File from the Engine, merge it into this object, and return what changed.
+
+        The projection arguments behave as in `File.get`, and narrowing them is what reduces the download:
+        polling for new tags of one kind need only fetch those (`include_blocks=False, tag_kinds=[...]`).
+        Parts that were not fetched are left untouched.
+        """
+        cache = self.client.object_cache
+        if cache is not None:
+            cache.invalidate("file", self.id)  # Always revalidate against the Engine
+        refreshed = File.get(
+            self.client,
+            self.id,
+            include_blocks=include_blocks,
+            include_tags=include_tags,
+            tag_kinds=tag_kinds,
+        )
+        delta = self.merge(refreshed, tag_kinds=tag_kinds)
+        _cache_file(self)
+        return delta
+
+    def merge(self, other: File, tag_kinds: Optional[List[str]] = None) -> FileDelta:
+        """Merge another copy of this File into it in place and return what changed.
+
+        Blocks and tags are matched by id. Unchanged ones keep their identity, so references to them stay valid;
+        changed ones are updated in place. Blocks or tags absent from `other` because it was fetched with a
+        projection are kept; with `tag_kinds`, tags of other kinds are kept too.
+        """
+        delta = FileDelta()
+        for name in ("handle", "mime_type", "workspace_id", "filename"):
+            self.__dict__[name] = other.__dict__[name]
+        _merge_tags(self, other, delta, tag_kinds)
+
+        if other.is_loaded("blocks"):
+            current_blocks = {block.id: block for block in self.blocks or []}
+            self.blocks = _merge_by_id(
+                list(current_blocks.values()),
+                other.blocks,
+                delta.added_blocks,
+                delta.changed_blocks,
+                delta.removed_blocks,
+                exclude={"client", "tags"},
+            )
+            for incoming in other.blocks:
+                block = current_blocks.get(incoming.id)
+                if block is not None:
+                    _merge_tags(block, incoming, delta, tag_kinds)
+            for block in self.blocks:
+                block.client = self.client
+            self._loaded = self._loaded | {"blocks"}
+        return delta
+
+    def watch(
+        self,
+        poll_interval_s: float = 1,
+        timeout_s: Optional[float] = None,
+        include_blocks: Optional[bool] = None,
+        include_tags: Optional[bool] = None,
+        tag_kinds: Optional[List[str]] = None,
+    ) -> Iterator[FileDelta]:
+        """Poll the Engine every `poll_interval_s`, merging changes into this File and yielding each non-empty delta.
+
+        Runs until `timeout_s` has elapsed, or forever if it is None; stop early by breaking out of the loop.
+        The projection arguments are passed to `refresh_delta`.
+        """
+        t0 = time.perf_counter()
+        while timeout_s is None or time.perf_counter() - t0 < timeout_s:
+            time.sleep(poll_interval_s)
+            delta = self.refresh_delta(
+                include_blocks=include_blocks, include_tags=include_tags, tag_kinds=tag_kinds
+            )
+            if delta:
+                yield delta
+
     @staticmethod
     def query(
         client: Client,
         tag_filter_query: str,
+        include_blocks: Optional[bool] = None,
+        include_tags: Optional[bool] = None,
+        tag_kinds: Optional[List[str]] = None,
     ) -> FileQueryResponse:
-
-        req = FileQueryRequest(tag_filter_query=tag_filter_query)
+        """Query for Files. The projection arguments behave as in `File.get`."""
+        req = FileQueryRequest(
+            tag_filter_query=tag_filter_query,
+            include_blocks=include_blocks,
+            include_tags=include_tags,
+            tag_kinds=tag_kinds,
+        )
         res = client.post(
             "file/query",
             payload=req,
             expect=FileQueryResponse,
         )
+        _project_files(res.files, include_blocks, include_tags, tag_kinds)
         return res
 
     def raw(self):
@@ -208,18 +691,60 @@ class File(CamelModel):
             raw_response=True,
         )
 
+    def raw_stream(
+        self,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        offset: int = 0,
+        length: Optional[int] = None,
+        on_progress: Optional[StreamProgressCallback] = None,
+    ) -> Iterator[bytes]:
+        """Stream the raw content of this File in chunks instead of loading it into memory as `raw` does.
+
+        `offset` and `length` select a byte range of the content."""
+        return self.client.stream(
+            "file/raw",
+            payload=GetRequest(id=self.id),
+            chunk_size=chunk_size,
+            offset=offset,
+            length=length,
+            on_progress=on_progress,
+        )
+
+    def raw_to_path(
+        self,
+        path: Union[str, Path],
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        offset: int = 0,
+        length: Optional[int] = None,
+        on_progress: Optional[StreamProgressCallback] = None,
+    ) -> Path:
+        """Stream the raw content of this File into the file at `path`."""
+        return write_chunks(
+            self.raw_stream(
+                chunk_size=chunk_size, offset=offset, length=length, on_progress=on_progress
+            ),
+            path,
+        )
+
     def blockify(self, plugin_instance: str = None, wait_on_tasks: List[Task] = None) -> Task:
         from steamship.data.operations.blockifier import BlockifyRequest
         from steamship.plugin.outputs.block_and_tag_plugin_output import BlockAndTagPluginOutput
 
         req = BlockifyRequest(type="file", id=self.id, plugin_instance=plugin_instance)
 
-        return self.client.post(
-            "plugin/instance/blockify",
-            payload=req,
-            expect=BlockAndTagPluginOutput,
-            wait_on_tasks=wait_on_tasks,
-        )
+        try:
+            task = self.client.post(
+                "plugin/instance/blockify",
+                payload=req,
+                expect=BlockAndTagPluginOutput,
+                wait_on_tasks=wait_on_tasks,
+            )
+        finally:
+            self._invalidate_cached()
+        # The plugin writes the blocks as it runs, so the cache is dropped again once the task completes.
+        if isinstance(task, Task):
+            task.add_done_callback(self._invalidate_cached)
+        return task
 
     def tag(
         self,
@@ -230,31 +755,137 @@ class File(CamelModel):
         from steamship.data.plugin import PluginTargetType
 
         req = TagRequest(type=PluginTargetType.FILE, id=self.id, plugin_instance=plugin_instance)
-        return self.client.post(
-            "plugin/instance/tag", payload=req, expect=TagResponse, wait_on_tasks=wait_on_tasks
-        )
-
-    def index(self, plugin_instance: Any = None) -> EmbeddingIndex:
+        try:
+            task = self.client.post(
+                "plugin/instance/tag", payload=req, expect=TagResponse, wait_on_tasks=wait_on_tasks
+            )
+        finally:
+            self._invalidate_cached()
+        # The plugin writes the tags as it runs, so the cache is dropped again once the task completes.
+        if isinstance(task, Task):
+            task.add_done_callback(self._invalidate_cached)
+        return task
+
+    def index(
+        self,
+        plugin_instance: Any = None,
+        max_chunk_blocks: int = DEFAULT_INDEX_CHUNK_BLOCKS,
+        max_chunk_bytes: int = DEFAULT_INDEX_CHUNK_BYTES,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        skip_indexed: bool = False,
+        dedupe: bool = False,
+    ) -> FileIndexResult:
         """Index every block in the file.
 
+        Blocks are inserted into the `EmbeddingIndexPluginInstance` in chunks of at most `max_chunk_blocks` blocks
+        and `max_chunk_bytes` bytes of text, with up to `concurrency` chunks in flight. The Tags for a chunk are only
+        built when it is sent. If `skip_indexed` is set, blocks the index already holds for this file are skipped. If
+        `dedupe` is set, blocks whose text the index already holds are skipped; see `EmbeddingIndexPluginInstance.insert`.
+
+        Returns the timing and outcome of each chunk. A failed chunk is reported in its result and does not stop
+        the others. The chunks are inserted without embedding them; once all have been sent, the index is embedded
+        in a single task, returned as `embed_task`, covering the blocks of every chunk that was inserted.
+
         TODO(ted): Enable indexing the results of a tag query.
         TODO(ted): It's hard to load the EmbeddingIndexPluginInstance with just a handle because of the chain
         of things that need to be created to it to function."""
+        blocks = self.load_blocks() or []
+        if skip_indexed:
+            indexed = _indexed_block_ids(plugin_instance, self.id)
+            to_index = [block for block in blocks if block.id not in indexed]
+        else:
+            to_index = blocks
+
+        def _insert(chunk: Tuple[int, List[Block], int]) -> IndexChunkResult:
+            first_block, chunk_blocks, text_bytes = chunk
+            t0 = time.perf_counter()
+            error, skipped = None, 0
+            try:
+                # Preserve the prior behavior of embedding the full text of each block.
+                result = plugin_instance.insert(
+                    [
+                        Tag(text=block.text, file_id=self.id, block_id=block.id, kind="block")
+                        for block in chunk_blocks
+                    ],
+                    dedupe=dedupe,
+                    reindex=False,
+                )
+                skipped = result.skipped if dedupe else 0
+            except Exception as e:
+                error = str(e)
+            return IndexChunkResult(
+                first_block=first_block,
+                block_count=len(chunk_blocks),
+                text_bytes=text_bytes,
+                elapsed_s=time.perf_counter() - t0,
+                skipped_blocks=skipped,
+                error=error,
+            )
 
-        # Preserve the prior behavior of embedding the full text of each block.
-        tags = [
-            Tag(text=block.text, file_id=self.id, block_id=block.id, kind="block")
-            for block in self.blocks or []
-        ]
-        return plugin_instance.insert(tags)
+        results = run_concurrently(
+            _insert,
+            _index_chunks(to_index, max_chunk_blocks, max_chunk_bytes),
+            concurrency=concurrency,
+        )
+        chunks = [result.output for result in results]
+        indexed_blocks = sum(
+            chunk.block_count - chunk.skipped_blocks for chunk in chunks if chunk.error is None
+        )
+        return FileIndexResult(
+            chunks=chunks,
+            indexed_blocks=indexed_blocks,
+            skipped_blocks=len(blocks) - len(to_index) + sum(c.skipped_blocks for c in chunks),
+            embed_task=plugin_instance.index.embed() if indexed_blocks else None,
+        )
 
     @staticmethod
-    def list(client: Client) -> ListFileResponse:
-        return client.post(
+    def list(
+        client: Client,
+        page_size: Optional[int] = None,
+        page_token: Optional[str] = None,
+        sort_order: Optional[SortOrder] = None,
+        headers_only: bool = False,
+    ) -> ListFileResponse:
+        """List the files in the workspace.
+
+        If `page_size` is set, at most that many files are returned along with a `next_page_token` to fetch the
+        following page with. If `headers_only` is set, the files are listed without their blocks and tags, which
+        are left empty until fetched with `load_blocks` or `load_tags`.
+        """
+        include = False if headers_only else None
+        req = ListFileRequest(
+            page_size=page_size,
+            page_token=page_token,
+            sort_order=sort_order,
+            include_blocks=include,
+            include_tags=include,
+        )
+        res = client.post(
             "file/list",
-            ListFileRequest(),
+            req,
             expect=ListFileResponse,
         )
+        _project_files(res.files, include_blocks=include, include_tags=include)
+        return res
+
+    @staticmethod
+    def iter(
+        client: Client,
+        page_size: int = 100,
+        sort_order: Optional[SortOrder] = None,
+        headers_only: bool = False,
+    ) -> Iterator[File]:
+        """Lazily iterate over the files in the workspace, fetching `page_size` of them per request."""
+        return iterate_pages(
+            lambda page_token: File.list(
+                client,
+                page_size=page_size,
+                page_token=page_token,
+                sort_order=sort_order,
+                headers_only=headers_only,
+            ),
+            lambda page: page.files,
+        )
 
     def append_block(
         self,
@@ -280,11 +911,51 @@ class File(CamelModel):
             mime_type=mime_type,
         )
         self.blocks.append(block)
+        _cache_file(self)
         return block
 
+    def append_blocks(
+        self,
+        blocks: List[BlockAppendItem],
+        concurrency: int = 1,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> List[BulkItemResult[Block]]:
+        """Append many blocks, with their tags, to this File.
+
+        Each item may be the text of a block, a Block, or a dict of `Block.create` keyword arguments (e.g. to pass
+        `content`). The created blocks are appended to this client-side File in input order, with `index_in_file`
+        set, so no `refresh()` is needed.
+
+        By default the blocks are uploaded one after another over the client's pooled connection, which keeps
+        their order in the File the same as in `blocks`. With `concurrency` > 1 uploads overlap and the Engine
+        may order the blocks by arrival instead; the client-side File is then sorted by the index the Engine
+        assigned.
+
+        Returns one result per item, in input order. A failed upload is reported in its result and does not stop
+        the others.
+        """
+        results = run_concurrently(
+            lambda item: Block.create(self.client, file_id=self.id, **_block_create_kwargs(item)),
+            blocks,
+            concurrency=concurrency,
+            on_progress=on_progress,
+        )
+        created = [result.output for result in results if result.ok]
+        if self.blocks is None:
+            self.blocks = []
+        next_index = len(self.blocks)
+        for block in created:
+            if block.index_in_file is None:
+                block.index_in_file = next_index
+            next_index = block.index_in_file + 1
+        self.blocks.extend(sorted(created, key=lambda block: block.index_in_file))
+        _cache_file(self)
+        return results
+
 
 class FileQueryResponse(Response):
     files: List[File]
 
 
 ListFileResponse.update_forward_refs()
+FileDelta.update_forward_refs()
@@ -0,0 +1,261 @@
+"""Search an embedding index by keyword as well as by meaning.
+
+Vector search finds text that means the same as a query but can miss an exact term such as a SKU or a name.
+`HybridSearch` keeps a BM25 inverted index over the `value` text of the items of an `EmbeddingIndexPluginInstance`,
+on the client, built from `load()` (which lists the index's items) and kept current by inserting through it. Each
+search over-fetches from the remote index, ranks the same query lexically, and fuses the two rankings into one
+`SearchResults`.
+"""
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from enum import Enum
+from operator import itemgetter
+from typing import Dict, List, Tuple, Union
+
+from steamship.base.error import SteamshipError
+from steamship.base.tasks import TaskState
+from steamship.data.embeddings import EmbeddedItem, QueryResult
+from steamship.data.plugin.index_plugin_instance import (
+    EmbeddingIndexPluginInstance,
+    InsertResult,
+    SearchResult,
+    SearchResults,
+    _stashed_metadata,
+)
+from steamship.data.search import Hit
+from steamship.data.tags.tag import Tag
+
+DEFAULT_RRF_K = 60
+DEFAULT_OVERFETCH = 4  # Candidates fetched from each ranking per result returned
+
+_TOKEN = re.compile(r"\w+")
+
+
+class FusionMethod(str, Enum):
+    RRF = "rrf"  # Reciprocal rank fusion: each ranking adds weight / (rrf_k + rank)
+    WEIGHTED = "weighted"  # Each ranking adds weight * its min-max normalized score
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens, after Unicode (NFKC) normalization."""
+    return _TOKEN.findall(unicodedata.normalize("NFKC", text or "").lower())
+
+
+class BM25Index:
+    """An in-memory inverted index over texts, ranked with Okapi BM25.
+
+    Parameters
+    ----------
+    k1 : float
+        How quickly repeated occurrences of a term stop adding to a text's score.
+    b : float
+        How much a text's score is discounted for its length, from 0 (not at all) to 1.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)  # Term -> row -> occurrences
+        self._lengths: List[int] = []
+        self._total_length = 0
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._saturation: List[float] = []  # k1 * length normalization per row; rebuilt after adds
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def add(self, key: str, text: str):
+        """Index `text` under `key`. Keys already in the index are left as they are."""
+        terms = Counter(tokenize(text))
+        with self._lock:
+            if key in self._rows:
+                return
+            row = len(self._ids)
+            self._ids.append(key)
+            self._rows[key] = row
+            for term, count in terms.items():
+                self._postings[term][row] = count
+            self._lengths.append(sum(terms.values()))
+            self._total_length += self._lengths[row]
+            self._saturation = []
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Return the keys of the `k` texts scoring highest for `query`, with their scores, best first.
+
+        Query terms found in more than half of the texts only add to the scores of texts that match a rarer
+        term, if any do."""
+        scores: Dict[int, float] = defaultdict(float)
+        with self._lock:
+            count = len(self._ids)
+            if len(self._saturation) != count:
+                average_length = self._total_length / count if self._total_length else 1
+                self._saturation = [
+                    self.k1 * (1 - self.b + self.b * length / average_length)
+                    for length in self._lengths
+                ]
+            terms = [term for term in set(tokenize(query)) if term in self._postings]
+            for term in sorted(terms, key=lambda term: len(self._postings[term])):
+                postings = self._postings[term]
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                if scores and len(postings) > count / 2:
+                    # A term in most texts adds little, so only rescore the texts matching a rarer term
+                    postings = {row: postings[row] for row in scores if row in postings}
+                weight = idf * (self.k1 + 1)
+                for row, occurrences in postings.items():
+                    scores[row] += weight * occurrences / (occurrences + self._saturation[row])
+            best = heapq.nlargest(k, scores.items(), key=itemgetter(1))
+            return [(self._ids[row], score) for row, score in best]
+
+
+def _fuse_rrf(rankings: List[Tuple[List[str], float]], rrf_k: int) -> Dict[str, float]:
+    fused: Dict[str, float] = defaultdict(float)
+    for keys, weight in rankings:
+        for rank, key in enumerate(keys, start=1):
+            fused[key] += weight / (rrf_k + rank)
+    return fused
+
+
+def _fuse_weighted(rankings: List[Tuple[List[Tuple[str, float]], float]]) -> Dict[str, float]:
+    fused: Dict[str, float] = defaultdict(float)
+    for scored, weight in rankings:
+        if not scored:
+            continue
+        low = min(score for _, score in scored)
+        spread = max(score for _, score in scored) - low
+        for key, score in scored:
+            fused[key] += weight * ((score - low) / spread if spread else 1.0)
+    return fused
+
+
+class HybridSearch:
+    """Searches an `EmbeddingIndexPluginInstance` by meaning and by keyword, fusing the two rankings.
+
+    Parameters
+    ----------
+    index : EmbeddingIndexPluginInstance
+        The index to search. Items only reach the keyword index through `load` or `insert`.
+    fusion : FusionMethod
+        How the vector and keyword rankings are combined. Default: reciprocal rank fusion.
+    vector_weight : float
+        The weight of the vector ranking, between 0 and 1; the keyword ranking gets the rest.
+    rrf_k : int
+        Damps the advantage of the first few ranks in reciprocal rank fusion.
+    overfetch : int
+        Each search ranks `k * overfetch` candidates from each side before fusing them.
+    """
+
+    def __init__(
+        self,
+        index: EmbeddingIndexPluginInstance,
+        fusion: FusionMethod = FusionMethod.RRF,
+        vector_weight: float = 0.5,
+        rrf_k: int = DEFAULT_RRF_K,
+        overfetch: int = DEFAULT_OVERFETCH,
+    ):
+        if not 0 <= vector_weight <= 1:
+            raise SteamshipError(message="`vector_weight` must be between 0 and 1.")
+        self.index = index
+        self.fusion = FusionMethod(fusion)
+        self.vector_weight = vector_weight
+        self.rrf_k = rrf_k
+        self.overfetch = max(overfetch, 1)
+        self.lexical = BM25Index()
+        # The keyword-indexed items, by id, without embeddings
+        self._items: Dict[str, EmbeddedItem] = {}
+
+    def _add(self, item: EmbeddedItem):
+        metadata = item.metadata
+        if metadata is not None and not isinstance(metadata, str):
+            metadata = json.dumps(metadata)  # Stored serialized, so each result parses its own copy
+        self._items[item.id] = EmbeddedItem(
+            id=item.id,
+            value=item.value,
+            external_id=item.external_id,
+            external_type=item.external_type,
+            metadata=metadata,
+        )
+        self.lexical.add(item.id, item.value)
+
+    def load(self) -> HybridSearch:
+        """Add every item of the index to the keyword index."""
+        for item in self.index.index.list_items(include_embeddings=False).items or []:
+            self._add(item)
+        return self
+
+    def insert(
+        self, tags: Union[Tag, List[Tag]], allow_long_records: bool = False, dedupe: bool = False
+    ) -> InsertResult:
+        """Insert tags as `EmbeddingIndexPluginInstance.insert` does, adding them to the keyword index too."""
+        tags = [tags] if isinstance(tags, Tag) else tags
+        result = self.index.insert(tags, allow_long_records=allow_long_records, dedupe=dedupe)
+        for tag, item_id in zip(tags, result.item_ids):
+            if item_id is not None:
+                self._add(
+                    EmbeddedItem(
+                        id=item_id,
+                        value=tag.text,
+                        external_id=tag.name,
+                        external_type=tag.kind,
+                        metadata=_stashed_metadata(tag),
+                    )
+                )
+        return result
+
+    def _keyword_result(self, item_id: str, score: float) -> SearchResult:
+        item = self._items[item_id]
+        hit = Hit(
+            id=item.id,
+            value=item.value,
+            score=score,
+            external_id=item.external_id,
+            external_type=item.external_type,
+            metadata=item.metadata,
+        )
+        return SearchResult.from_query_result(QueryResult(value=hit, score=score, id=item.id))
+
+    def search(self, query: str, k: int = 1) -> SearchResults:
+        """Return the `k` items ranked best by fusing a vector search of the index and a keyword search.
+
+        Each result's `score` is its fused score."""
+        if query is None or len(query.strip()) == 0:
+            raise SteamshipError(message="Query field must be non-empty.")
+        candidates = k * self.overfetch
+        task = self.index.search(query, k=candidates)
+        if task.state == TaskState.failed:
+            raise task.as_error()
+        vector_results = {result.tag.id: result for result in task.output.items or []}
+        vector_scored = [(item_id, result.score) for item_id, result in vector_results.items()]
+        keyword_scored = self.lexical.search(query, k=candidates)
+
+        weights = (self.vector_weight, 1 - self.vector_weight)
+        if self.fusion == FusionMethod.RRF:
+            fused = _fuse_rrf(
+                [
+                    ([item_id for item_id, _ in vector_scored], weights[0]),
+                    ([item_id for item_id, _ in keyword_scored], weights[1]),
+                ],
+                self.rrf_k,
+            )
+        else:
+            fused = _fuse_weighted([(vector_scored, weights[0]), (keyword_scored, weights[1])])
+
+        results = []
+        for item_id, score in heapq.nlargest(k, fused.items(), key=itemgetter(1)):
+            if item_id in vector_results:
+                result = vector_results[item_id].copy(update={"score": score})
+            else:
+                result = self._keyword_result(item_id, score)
+            results.append(result)
+        return SearchResults(items=results)
@@ -0,0 +1,274 @@
+"""Snapshots of an EmbeddingIndex on local disk, for warm-starting a `LocalVectorIndex`.
+
+A snapshot is a directory holding:
+
+* `vectors.npy`: the embeddings as a little-endian float32 array of shape (count, dimension), already normalized if
+  the snapshot's metric is cosine similarity, so it can be memory-mapped and searched as it is;
+* one `<column>.jsonl` file per item field (`id`, `value`, `metadata`, ...), holding one JSON value per line;
+* `offsets.npy`: the byte offset of each line of each column file, as a uint64 array of shape (count + 1, columns);
+* `manifest.json`, written last, so a directory without one holds an incomplete snapshot.
+
+`EmbeddingIndex.export_snapshot` writes the files one item at a time. `load_snapshot` memory-maps them, so it opens
+in milliseconds however large the index is, processes that open the same snapshot share its pages, and the fields
+of an item are only parsed when a search returns it. The .npy files are written and read without NumPy if it is not
+installed; with it, they are ordinary NumPy arrays.
+"""
+from __future__ import annotations
+
+import ast
+import json
+import math
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Sequence, Tuple, Union
+
+from steamship.base.error import SteamshipError
+from steamship.base.model import CamelModel
+from steamship.data.embeddings import EmbeddedItem
+from steamship.data.vector_index import EmbedFunction, LocalVectorIndex, VectorMetric
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SNAPSHOT_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+VECTORS_FILE = "vectors.npy"
+OFFSETS_FILE = "offsets.npy"
+COLUMNS = [
+    "id",
+    "index_id",
+    "file_id",
+    "block_id",
+    "tag_id",
+    "value",
+    "external_id",
+    "external_type",
+    "metadata",
+]
+
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"  # Format version 1.0
+_NPY_HEADER_SIZE = 128  # Fixed, so the final shape can be written over the placeholder
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+class SnapshotManifest(CamelModel):
+    format_version: int = SNAPSHOT_FORMAT_VERSION
+    index_id: Optional[str] = None
+    metric: VectorMetric = VectorMetric.COSINE
+    count: int = 0
+    dimension: int = 0
+    columns: List[str] = COLUMNS
+
+
+def _npy_header(descr: str, shape: Sequence[int]) -> bytes:
+    header = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': {tuple(shape)}, }}"
+    header = header.ljust(_NPY_HEADER_SIZE - len(_NPY_MAGIC) - 3) + "\n"
+    return _NPY_MAGIC + struct.pack("<H", len(header)) + header.encode("latin1")
+
+
+def _little_endian(typecode: str, values: Sequence[Any]) -> bytes:
+    packed = array(typecode, values)
+    if not _LITTLE_ENDIAN:
+        packed.byteswap()
+    return packed.tobytes()
+
+
+class _NpyWriter:
+    """Writes a 2-D .npy file a few rows at a time; the number of rows in its header is filled in on exit."""
+
+    def __init__(self, path: Path, descr: str, width: int):
+        self.descr = descr
+        self.width = width
+        self.rows = 0
+        self._file = open(path, "wb")
+        self._file.write(_npy_header(descr, (0, width)))
+
+    def __enter__(self) -> _NpyWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._file.seek(0)
+        self._file.write(_npy_header(self.descr, (self.rows, self.width)))
+        self._file.close()
+
+    def write(self, data: bytes, rows: int):
+        self._file.write(data)
+        self.rows += rows
+
+
+def _vector_chunks(vectors: Any, dimension: int, normalize: bool) -> Iterator[Tuple[bytes, int]]:
+    """Yield the vectors as little-endian float32 bytes, with the number of rows, a chunk at a time."""
+    if np is not None and isinstance(vectors, np.ndarray):
+        for start in range(0, len(vectors), 4096):  # Bound the size of the normalized copy
+            chunk = vectors[start : start + 4096].astype(np.float32)
+            if normalize:
+                norms = np.linalg.norm(chunk, axis=1, keepdims=True)
+                norms[norms == 0] = 1
+                chunk /= norms
+            yield chunk.astype("<f4").tobytes(), len(chunk)
+        return
+    for vector in vectors:
+        if len(vector) != dimension:
+            raise SteamshipError(
+                message=f"Expected vectors of dimension {dimension}, but got one of dimension {len(vector)}."
+            )
+        norm = math.sqrt(sum(x * x for x in vector)) if normalize else 0
+        yield _little_endian("f", [x / norm for x in vector] if norm else vector), 1
+
+
+def write_snapshot(
+    path: Union[str, Path],
+    items: Sequence[EmbeddedItem],
+    vectors: Optional[Sequence[Sequence[float]]] = None,
+    metric: VectorMetric = VectorMetric.COSINE,
+    index_id: Optional[str] = None,
+) -> Path:
+    """Write `items` and their embeddings as a snapshot in the directory `path`, replacing any snapshot there.
+
+    `vectors`, if given, holds the embeddings of `items` in order (as a list of lists or a 2-D NumPy array, such
+    as `ListItemsResponse.vectors()`); otherwise each item's `embedding` is used."""
+    metric = VectorMetric(metric)
+    if vectors is None:
+        if any(not item.embedding for item in items):
+            raise SteamshipError(message="Every item in a snapshot must have an `embedding`.")
+        vectors = [item.embedding for item in items]
+    elif len(vectors) != len(items):
+        raise SteamshipError(message="Expected one vector per item.")
+    directory = Path(path)
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / MANIFEST_FILE).unlink(missing_ok=True)
+
+    dimension = len(vectors[0]) if len(vectors) else 0
+    with _NpyWriter(directory / VECTORS_FILE, "<f4", dimension) as writer:
+        for data, rows in _vector_chunks(vectors, dimension, metric == VectorMetric.COSINE):
+            writer.write(data, rows)
+    _write_columns(directory, items)
+
+    manifest = SnapshotManifest(
+        index_id=index_id, metric=metric, count=len(items), dimension=dimension
+    )
+    (directory / MANIFEST_FILE).write_text(manifest.json(by_alias=True))
+    return directory
+
+
+def _write_columns(directory: Path, items: Sequence[EmbeddedItem]):
+    column_files = [open(directory / f"{column}.jsonl", "wb") for column in COLUMNS]
+    try:
+        with _NpyWriter(directory / OFFSETS_FILE, "<u8", len(COLUMNS)) as writer:
+            offsets = [0] * len(COLUMNS)
+            for item in items:
+                writer.write(_little_endian("Q", offsets), 1)
+                for i, column in enumerate(COLUMNS):
+                    line = json.dumps(getattr(item, column)).encode("utf-8") + b"\n"
+                    column_files[i].write(line)
+                    offsets[i] += len(line)
+            writer.write(_little_endian("Q", offsets), 1)
+    finally:
+        for column_file in column_files:
+            column_file.close()
+
+
+def _open_bytes(path: Path, memory_mapped: bool) -> Union[mmap.mmap, bytes]:
+    with open(path, "rb") as file:
+        if memory_mapped:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return file.read()
+
+
+def _read_npy(path: Path, descr: str, memory_mapped: bool, use_numpy: bool) -> Any:
+    """Read a 2-D .npy file as a NumPy array, or as a flat buffer of its values without NumPy."""
+    if use_numpy:
+        values = np.load(path, mmap_mode="r" if memory_mapped else None)
+        if values.dtype != np.dtype(descr) or values.ndim != 2:
+            raise SteamshipError(message=f"{path} does not hold a 2-D array of {descr}.")
+        return values
+
+    data = _open_bytes(path, memory_mapped)
+    if data[:6] != _NPY_MAGIC[:6]:
+        raise SteamshipError(message=f"{path} is not a .npy file.")
+    if data[6] == 1:
+        start, length = 10, struct.unpack("<H", data[8:10])[0]
+    else:
+        start, length = 12, struct.unpack("<I", data[8:12])[0]
+    header = ast.literal_eval(bytes(data[start : start + length]).decode("latin1"))
+    if header["descr"] != descr or header["fortran_order"] or len(header["shape"]) != 2:
+        raise SteamshipError(message=f"{path} does not hold a 2-D array of {descr}.")
+    values = memoryview(data)[start + length :].cast("f" if descr == "<f4" else "Q")
+    if not _LITTLE_ENDIAN:  # Swap a private copy into native order
+        values = array(values.format, values.tobytes())
+        values.byteswap()
+    return values
+
+
+class _SnapshotItems(Sequence):
+    """The items of a snapshot, each read from the column files when it is accessed."""
+
+    def __init__(
+        self, directory: Path, manifest: SnapshotManifest, memory_mapped: bool, use_numpy: bool
+    ):
+        self._count = manifest.count
+        self._columns = manifest.columns
+        self._offsets = _read_npy(directory / OFFSETS_FILE, "<u8", memory_mapped, use_numpy)
+        if use_numpy:
+            self._offsets = self._offsets.reshape(-1)
+        self._data = [
+            _open_bytes(directory / f"{column}.jsonl", memory_mapped) for column in self._columns
+        ]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[EmbeddedItem]:
+        return (self[row] for row in range(self._count))
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(self._count))]
+        if row < 0:
+            row += self._count
+        if not 0 <= row < self._count:
+            raise IndexError("Snapshot item index out of range")
+        width = len(self._columns)
+        fields = {}
+        for i, (column, data) in enumerate(zip(self._columns, self._data)):
+            start, end = int(self._offsets[row * width + i]), int(
+                self._offsets[(row + 1) * width + i]
+            )
+            fields[column] = json.loads(bytes(data[start:end]))
+        return EmbeddedItem(**fields)
+
+
+def load_snapshot(
+    path: Union[str, Path],
+    mmap: bool = True,
+    embed: Optional[EmbedFunction] = None,
+    use_numpy: bool = True,
+) -> LocalVectorIndex:
+    """Open the snapshot in the directory `path` as a `LocalVectorIndex` with the snapshot's metric.
+
+    With `mmap`, the files are memory-mapped rather than read: the index opens without reading its vectors, and
+    processes that load the same snapshot share one copy of them. Items added to the index afterwards are held in
+    memory as usual; the first addition copies the snapshot into memory too."""
+    directory = Path(path)
+    manifest_path = directory / MANIFEST_FILE
+    if not manifest_path.exists():
+        raise SteamshipError(message=f"{directory} does not hold a complete index snapshot.")
+    manifest = SnapshotManifest.parse_raw(manifest_path.read_text())
+    if manifest.format_version != SNAPSHOT_FORMAT_VERSION:
+        raise SteamshipError(
+            message=f"Unsupported index snapshot format version {manifest.format_version}."
+        )
+
+    local = LocalVectorIndex(metric=manifest.metric, embed=embed, use_numpy=use_numpy)
+    if manifest.count == 0:
+        return local
+    use_numpy = use_numpy and np is not None
+    vectors = _read_npy(directory / VECTORS_FILE, "<f4", mmap, use_numpy)
+    items = _SnapshotItems(directory, manifest, mmap, use_numpy)
+    local._attach(items, vectors, manifest.dimension)
+    return local
@@ -1,13 +1,68 @@
-from typing import Any, Dict, List, Optional, Union, cast
+import hashlib
+import json
+import threading
+import unicodedata
+from typing import Any, Dict, List, Optional, Set, Union, cast
 
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
 from steamship.base.error import SteamshipError
 from steamship.base.model import CamelModel
-from steamship.base.tasks import Task
-from steamship.data.embeddings import EmbeddedItem, EmbeddingIndex, QueryResult, QueryResults
+from steamship.base.tasks import Task, TaskState
+from steamship.data.embeddings import (
+    EmbeddedItem,
+    EmbeddingIndex,
+    IndexItemId,
+    IndexSearchRequest,
+    QueryResult,
+    QueryResults,
+    _batch_ranges,
+    _failed_batches_error,
+)
 from steamship.data.plugin.plugin_instance import PluginInstance
 from steamship.data.tags.tag import Tag
+from steamship.utils.concurrency import DEFAULT_CONCURRENCY, run_concurrently
+
+# Number of queries sent in each request by `EmbeddingIndexPluginInstance.search_many`.
+DEFAULT_SEARCH_BATCH_QUERIES = 100
+
+# Metadata key under which `insert(..., dedupe=True)` records the content hash of each item.
+CONTENT_HASH_KEY = "_content_hash"
+_STASHED_KEYS = ("_file_id", "_tag_id", "_block_id", CONTENT_HASH_KEY)
+
+
+def content_hash(tag: Tag) -> str:
+    """Hash the fields of a Tag that determine its embedded item: its normalized text, kind, name and value.
+
+    Text is compared after Unicode (NFC) normalization and collapsing runs of whitespace. The Tag's own id and its
+    `file_id` and `block_id` are left out, so deduplication is by content alone: the same text from two Files is
+    one item, attributed to the File it was first inserted from."""
+    text = " ".join(unicodedata.normalize("NFC", tag.text or "").split())
+    value = {key: v for key, v in (tag.value or {}).items() if key not in _STASHED_KEYS}
+    payload = json.dumps([text, tag.kind, tag.name, value], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _stashed_metadata(tag: Tag) -> Dict[str, Any]:
+    """The metadata of the item a Tag is inserted as: a copy of its value, plus the ids that `SearchResult`
+    restores from it."""
+    # To make this change Python-only, some fields are stached in `hit.metadata`.
+    # This has the temporary consequence of these keys not being safe. This will be resolved when we spread
+    # this refactor to the engine.
+    return {
+        **(tag.value or {}),
+        "_file_id": tag.file_id,
+        "_tag_id": tag.id,
+        "_block_id": tag.block_id,
+    }
+
+
+class InsertResult(CamelModel):
+    inserted: int = 0
+    skipped: int = 0  # Tags left out because the index already held the same content
+    item_ids: List[
+        Optional[str]
+    ] = []  # The item each tag was inserted as, in order; None where skipped
 
 
 class EmbedderInvocation(CamelModel):
@@ -36,20 +91,10 @@ class SearchResult(CamelModel):
         # To make this change Python-only, some fields are stached in `hit.metadata`.
         # This has the temporary consequence of these keys not being safe. This will be resolved when we spread
         # this refactor to the engine.
-        block_id = None
-        if "_block_id" in value:
-            block_id = value.get("_block_id")
-        del value["_block_id"]
-
-        file_id = None
-        if "_file_id" in value:
-            file_id = value.get("_file_id")
-        del value["_file_id"]
-
-        tag_id = None
-        if "_tag_id" in value:
-            tag_id = value.get("_tag_id")
-        del value["_tag_id"]
+        block_id = value.pop("_block_id", None)
+        file_id = value.pop("_file_id", None)
+        tag_id = value.pop("_tag_id", None)
+        value.pop(CONTENT_HASH_KEY, None)
 
         tag = Tag(
             id=hit.id,
@@ -78,6 +123,12 @@ class SearchResults(CamelModel):
         return SearchResults(items=items)
 
 
+def _project_search_results(task: Task):
+    """Project the QueryResults output of a completed search Task into SearchResults."""
+    if task.state == TaskState.succeeded and isinstance(task.output, QueryResults):
+        task.output = SearchResults.from_query_results(task.output)
+
+
 class EmbeddingIndexPluginInstance(PluginInstance):
     """A persistent, read-optimized index over embeddings.
 
@@ -88,6 +139,10 @@ class EmbeddingIndexPluginInstance(PluginInstance):
     embedder: PluginInstance = Field(None, exclude=True)
     index: EmbeddingIndex = Field(None, exclude=True)
 
+    # Content hashes of the items in the index, listed on the first deduplicating insert and kept up to date.
+    _content_hashes: Optional[Set[str]] = PrivateAttr(None)
+    _content_hashes_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
     def reset(self):
         self.index.delete()
         self.index = EmbeddingIndex.create(
@@ -96,6 +151,8 @@ class EmbeddingIndexPluginInstance(PluginInstance):
             embedder_plugin_instance_handle=self.embedder.handle,
             fetch_if_exists=False,
         )
+        with self._content_hashes_lock:
+            self._content_hashes = set()
 
     def delete(self):
         """Delete the EmbeddingIndexPluginInstnace.
@@ -105,69 +162,223 @@ class EmbeddingIndexPluginInstance(PluginInstance):
         """
         return self.index.delete()
 
-    def insert(self, tags: Union[Tag, List[Tag]], allow_long_records: bool = False):
-        """Insert tags into the embedding index."""
+    def _indexed_content_hashes(self) -> Set[str]:
+        """Expects `_content_hashes_lock` to be held."""
+        if self._content_hashes is None:
+            hashes = set()
+            for item in self.index.list_items(include_embeddings=False).items or []:
+                metadata = item.metadata
+                if isinstance(metadata, str):
+                    try:
+                        metadata = json.loads(metadata)
+                    except ValueError:
+                        metadata = None
+                if isinstance(metadata, dict) and metadata.get(CONTENT_HASH_KEY):
+                    hashes.add(metadata[CONTENT_HASH_KEY])
+            self._content_hashes = hashes
+        return self._content_hashes
+
+    def _claim_new_content(self, tags: List[Tag]) -> List[Tag]:
+        """Return the tags whose content is not yet in the index, recording their hashes as indexed.
+
+        Expects tags prepared by `insert`, whose values may be updated."""
+        new_tags = []
+        with self._content_hashes_lock:
+            indexed = self._indexed_content_hashes()
+            for tag in tags:
+                tag_hash = content_hash(tag)
+                if tag_hash not in indexed:
+                    indexed.add(tag_hash)
+                    tag.value[CONTENT_HASH_KEY] = tag_hash
+                    new_tags.append(tag)
+        return new_tags
+
+    def _release_content_hashes(self, tags: List[Tag]):
+        """Forget the hashes claimed for `tags` that were not inserted, so that they can be inserted again."""
+        with self._content_hashes_lock:
+            self._content_hashes.difference_update(tag.value[CONTENT_HASH_KEY] for tag in tags)
+
+    def insert(
+        self,
+        tags: Union[Tag, List[Tag]],
+        allow_long_records: bool = False,
+        dedupe: bool = False,
+        reindex: bool = True,
+    ) -> InsertResult:
+        """Insert tags into the embedding index.
+
+        The tags are embedded as part of the insert. When inserting in several calls, pass `reindex=False` and call
+        `index.embed()` once after the last one, rather than re-embedding the index for every call.
+
+        With `dedupe`, tags whose `content_hash` matches an item already in the index, or an earlier tag in
+        `tags`, are skipped rather than embedded again. The hashes are stored in the items' metadata, listed from
+        the index (without embeddings) on the first deduplicating insert, and then kept on this object. Content is
+        compared alone (see `content_hash`), so a skipped tag's File and Block are not recorded; changed content is
+        inserted as a new item, since the index cannot replace items.
+
+        The tags themselves are not modified.
+        """
 
         # Make a list if a single tag was provided
         if isinstance(tags, Tag):
             tags = [tags]
 
+        prepared = []
         for tag in tags:
             if not tag.text:
                 raise SteamshipError(
                     message="Please set the `text` field of your Tag before inserting it into an index."
                 )
-
-            # Now we need to prepare an EmbeddingIndexItem of a particular shape that encodes the tag.
-            metadata = tag.value or {}
-            if not isinstance(metadata, dict):
+            if not isinstance(tag.value or {}, dict):
                 raise SteamshipError(
                     "Only Tags with a dict or None value can be embedded. "
                     + f"This tag had a value of type: {type(tag.value)}"
                 )
+            prepared.append(tag.copy(update={"value": _stashed_metadata(tag)}))
+
+        to_insert = self._claim_new_content(prepared) if dedupe else prepared
+        if not to_insert:
+            return InsertResult(skipped=len(tags), item_ids=[None] * len(tags))
+
+        item_ids = self._insert_tags(to_insert, allow_long_records, dedupe, reindex)
+        inserted_ids = {id(tag): item.id for tag, item in zip(to_insert, item_ids)}
+        return InsertResult(
+            inserted=len(to_insert),
+            skipped=len(tags) - len(to_insert),
+            item_ids=[inserted_ids.get(id(tag)) for tag in prepared],
+        )
 
-            # To make this change Python-only, some fields are stached in `hit.metadata`.
-            # This has the temporary consequence of these keys not being safe. This will be resolved when we spread
-            # this refactor to the engine.
-            metadata["_file_id"] = tag.file_id
-            metadata["_tag_id"] = tag.id
-            metadata["_block_id"] = tag.block_id
-            tag.value = metadata
-
+    def _insert_tags(
+        self, tags: List[Tag], allow_long_records: bool, dedupe: bool, reindex: bool
+    ) -> List[IndexItemId]:
+        """Insert tags prepared by `insert`, releasing the claimed hashes of those that were not written."""
         embedded_items = [
             EmbeddedItem(
                 value=tag.text,
                 external_id=tag.name,
                 external_type=tag.kind,
+                file_id=tag.file_id,
+                block_id=tag.block_id,
                 metadata=tag.value,
             )
             for tag in tags
         ]
-
-        # We always reindex in this new style; to not do so is to expose details (when embedding occurrs) we'd rather
-        # not have users exercise control over.
-        self.index.insert_many(embedded_items, reindex=True, allow_long_records=allow_long_records)
-
-    def search(self, query: str, k: Optional[int] = None) -> Task[SearchResults]:
+        try:
+            batches, results = self.index._insert_in_batches(
+                embedded_items, reindex=reindex, allow_long_records=allow_long_records
+            )
+        except Exception:
+            if dedupe:
+                self._release_content_hashes(tags)
+            raise
+        failed = [result for result in results if not result.ok]
+        if failed:
+            # Batches that succeeded stay inserted, so only the hashes of the failed ones are released.
+            if dedupe:
+                for start, end in _batch_ranges(batches, failed):
+                    self._release_content_hashes(tags[start:end])
+            raise _failed_batches_error(batches, failed)
+        return [item_id for result in results for item_id in result.output.item_ids or []]
+
+    def search(self, query: str, k: Optional[int] = None, wait: bool = True) -> Task[SearchResults]:
         """Search the embedding index.
 
         This wrapper implementation simply projects the `Hit` data structure into a `Tag`
+
+        With `wait=False`, the search Task is returned as soon as it is created, and its output is projected when it
+        is seen to complete, so callers can `wait()` (or `await task.wait_async()`) on several searches at once. If
+        the client has a `search_cache`, a cached search returns a completed Task, and other results are cached
+        when their Task completes.
         """
         if query is None or len(query.strip()) == 0:
             raise SteamshipError(message="Query field must be non-empty.")
 
         # Metadata will always be included; this is the equivalent of Tag.value
-        wrapped_result = self.index.search(query, k=k, include_metadata=True)
-
-        # For now, we'll have to do this synchronously since we're trying to avoid changing things on the engine.
-        wrapped_result.wait()
-
-        # We're going to do a switcheroo on the output type of Task here.
-        search_results = SearchResults.from_query_results(wrapped_result.output)
-        wrapped_result.output = search_results
-
-        # Return the index's search result, but projected into the data structure of Tags
-        return cast(Task[SearchResults], wrapped_result)
+        task = self.index.search(query, k=k, include_metadata=True, wait=False)
+        # Registered after the index caches the QueryResults, so the cache holds them rather than the projection.
+        task.add_done_callback(_project_search_results)
+        if wait:
+            task.wait()
+        return cast(Task[SearchResults], task)
+
+    def _search_batch(self, queries: List[str], k: Optional[int]) -> List[SearchResults]:
+        """Search for distinct `queries` in one request, returning their results in the same order.
+
+        The results of a multi-query search are attributed by the `query` each hit echoes. If the hits do not
+        echo it, they are taken to be `k` per query, in query order, and a response of another size is an error.
+        """
+        task = self.index.search(queries, k=k, include_metadata=True)
+        task.wait()
+        if task.state == TaskState.failed:
+            raise task.as_error()
+        items = task.output.items or []
+        if len(queries) == 1:
+            grouped = [items]
+        elif all(item.value is not None and item.value.query is not None for item in items):
+            by_query = {query: [] for query in queries}
+            for item in items:
+                if item.value.query not in by_query:
+                    raise SteamshipError(
+                        message=f"The index returned a result for an unknown query: {item.value.query}"
+                    )
+                by_query[item.value.query].append(item)
+            grouped = list(by_query.values())
+        else:
+            per_query = k if k is not None else IndexSearchRequest.__fields__["k"].default
+            if len(items) != per_query * len(queries):
+                raise SteamshipError(
+                    message=f"The index returned {len(items)} results for {len(queries)} queries without "
+                    + f"naming their queries, so they cannot be matched to queries with k={per_query}."
+                )
+            grouped = [items[i : i + per_query] for i in range(0, len(items), per_query)]
+        return [SearchResults.from_query_results(QueryResults(items=group)) for group in grouped]
+
+    def search_many(
+        self,
+        queries: List[str],
+        k: Optional[int] = None,
+        batch_size: int = DEFAULT_SEARCH_BATCH_QUERIES,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        retries: int = 2,
+    ) -> List[SearchResults]:
+        """Search the embedding index for each of `queries`, returning one SearchResults per query, in order.
+
+        Queries are sent `batch_size` to a request, with up to `concurrency` requests in flight, and each failed
+        request is retried up to `retries` times. Repeated queries are only searched once, and each of their
+        positions gets its own copy of the results.
+
+        Raises a SteamshipError if any batch still fails.
+        """
+        if any(query is None or len(query.strip()) == 0 for query in queries):
+            raise SteamshipError(message="Every query must be non-empty.")
+
+        unique = list(dict.fromkeys(queries))
+        batches = [unique[i : i + batch_size] for i in range(0, len(unique), batch_size)]
+        results = run_concurrently(
+            lambda batch: self._search_batch(batch, k),
+            batches,
+            concurrency=concurrency,
+            retries=retries,
+        )
+        failed = [result for result in results if not result.ok]
+        if failed:
+            raise SteamshipError(
+                message=f"{len(failed)} of {len(batches)} search batches failed. "
+                + f"The first failure was: {failed[0].error}",
+                error=failed[0].error,
+            )
+        by_query = {
+            query: found
+            for batch, result in zip(batches, results)
+            for query, found in zip(batch, result.output)
+        }
+        returned = set()
+        ordered = []
+        for query in queries:
+            found = by_query[query]
+            ordered.append(found.copy(deep=True) if query in returned else found)
+            returned.add(query)
+        return ordered
 
     @staticmethod
     def create(
@@ -21,7 +21,8 @@ class Hit(CamelModel):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         metadata = kwargs.get("metadata")
-        if metadata is not None:
+        # Metadata arrives from the Engine as a JSON string, but is already parsed when read back from a cache.
+        if isinstance(metadata, str):
             try:
                 self.metadata = json.loads(metadata)
             except JSONDecodeError:
@@ -1,9 +1,15 @@
+from .span_index import TagSpanIndex
 from .tag import Tag
 from .tag_constants import DocTag, GenerationTag, TagKind, TagValueKey, TokenTag
+from .tag_query import TagQueryIndex
+from .tag_table import TagTable
 
 __all__ = [
     "DocTag",
     "Tag",
+    "TagSpanIndex",
+    "TagQueryIndex",
+    "TagTable",
     "TagKind",
     "TokenTag",
     "TagValueKey",
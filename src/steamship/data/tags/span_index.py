@@ -0,0 +1,177 @@
+"""An index over the character spans of Tags for fast overlap, containment, and point queries."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from steamship.data.tags.tag import Tag
+
+if TYPE_CHECKING:
+    from steamship.data.block import Block
+    from steamship.data.file import File
+
+
+class _SpanTree:
+    """Spans sorted by start, viewed as an implicit balanced binary tree.
+
+    The node for the range [lo, hi) is the element at mid = (lo + hi) // 2, and `max_ends[mid]` holds the largest
+    end within [lo, hi). Searches skip every subtree whose spans all end too early, so a query visits O(log n + k)
+    nodes.
+    """
+
+    def __init__(self, tags: List[Tag]):
+        self.tags = sorted(tags, key=lambda tag: (tag.start_idx, tag.end_idx))
+        self.starts = [tag.start_idx for tag in self.tags]
+        self.ends = [tag.end_idx for tag in self.tags]
+        self.max_ends = list(self.ends)
+        self._build_max_ends(0, len(self.tags))
+
+    def _build_max_ends(self, lo: int, hi: int) -> int:
+        if lo >= hi:
+            return -1
+        mid = (lo + hi) // 2
+        self.max_ends[mid] = max(
+            self.ends[mid], self._build_max_ends(lo, mid), self._build_max_ends(mid + 1, hi)
+        )
+        return self.max_ends[mid]
+
+    def search(self, start_below: int, end_at_least: int) -> List[int]:
+        """Return, in start order, the positions of spans with start < `start_below` and end >= `end_at_least`."""
+        found = []
+
+        def visit(lo: int, hi: int):
+            if lo >= hi:
+                return
+            mid = (lo + hi) // 2
+            if self.max_ends[mid] < end_at_least:
+                return
+            visit(lo, mid)
+            if self.starts[mid] < start_below:
+                if self.ends[mid] >= end_at_least:
+                    found.append(mid)
+                visit(mid + 1, hi)
+
+        visit(0, len(self.tags))
+        return found
+
+
+class TagSpanIndex:
+    """Answers which Tags cover, contain, or lie within a character range without scanning every Tag.
+
+    Only Tags with both `start_idx` and `end_idx` set are indexed. Spans are start-inclusive and end-exclusive,
+    like the Tags themselves. Tag offsets are relative to their Block, so Tags are grouped by `block_id`;
+    queries cover every Block unless `block_id` is given.
+
+    Building the index sorts the Tags once: O(n log n). Queries run in O(log n + k) for k results. Restricting a query
+    to a `kind` and/or `name` uses a separate index over just those Tags, built on first use.
+    """
+
+    def __init__(self, tags: Iterable[Tag] = None, block_id: Optional[str] = None):
+        """Index `tags`, grouping them by their `block_id`, or under `block_id` if it is provided."""
+        self._tags_by_block: Dict[Optional[str], List[Tag]] = {}
+        self._trees: Dict[Tuple[Optional[str], Optional[str], Optional[str]], _SpanTree] = {}
+        self.add_tags(tags or [], block_id=block_id)
+
+    @staticmethod
+    def from_block(block: Block) -> TagSpanIndex:
+        return TagSpanIndex(block.tags or [], block_id=block.id)
+
+    @staticmethod
+    def from_file(file: File) -> TagSpanIndex:
+        """Index the spanned Tags of a File and all of its Blocks."""
+        index = TagSpanIndex(file.tags or [])
+        for block in file.blocks or []:
+            index.add_tags(block.tags or [], block_id=block.id)
+        return index
+
+    def add_tags(self, tags: Iterable[Tag], block_id: Optional[str] = None):
+        """Add `tags` to the index. The structures built for earlier queries are rebuilt on next use."""
+        for tag in tags:
+            if tag.start_idx is None or tag.end_idx is None:
+                continue
+            key = block_id if block_id is not None else tag.block_id
+            self._tags_by_block.setdefault(key, []).append(tag)
+        self._trees.clear()
+
+    def __len__(self) -> int:
+        return sum(len(tags) for tags in self._tags_by_block.values())
+
+    def _trees_for(
+        self, block_id: Optional[str], kind: Optional[str], name: Optional[str]
+    ) -> List[_SpanTree]:
+        block_ids = list(self._tags_by_block) if block_id is None else [block_id]
+        trees = []
+        for bid in block_ids:
+            key = (bid, kind, name)
+            if key not in self._trees:
+                self._trees[key] = _SpanTree(
+                    [
+                        tag
+                        for tag in self._tags_by_block.get(bid, [])
+                        if (kind is None or tag.kind == kind) and (name is None or tag.name == name)
+                    ]
+                )
+            trees.append(self._trees[key])
+        return trees
+
+    def overlapping(
+        self,
+        start_idx: int,
+        end_idx: int,
+        kind: Optional[str] = None,
+        name: Optional[str] = None,
+        block_id: Optional[str] = None,
+    ) -> List[Tag]:
+        """Return the Tags sharing at least one character with [start_idx, end_idx).
+
+        Zero-length Tags are returned if they sit within the range."""
+        result = []
+        for tree in self._trees_for(block_id, kind, name):
+            for i in tree.search(start_below=end_idx, end_at_least=start_idx):
+                if tree.ends[i] > start_idx or (
+                    tree.starts[i] == tree.ends[i] and tree.starts[i] >= start_idx
+                ):
+                    result.append(tree.tags[i])
+        return result
+
+    def containing(
+        self,
+        start_idx: int,
+        end_idx: int,
+        kind: Optional[str] = None,
+        name: Optional[str] = None,
+        block_id: Optional[str] = None,
+    ) -> List[Tag]:
+        """Return the Tags whose span includes all of [start_idx, end_idx)."""
+        result = []
+        for tree in self._trees_for(block_id, kind, name):
+            result.extend(
+                tree.tags[i] for i in tree.search(start_below=start_idx + 1, end_at_least=end_idx)
+            )
+        return result
+
+    def within(
+        self,
+        start_idx: int,
+        end_idx: int,
+        kind: Optional[str] = None,
+        name: Optional[str] = None,
+        block_id: Optional[str] = None,
+    ) -> List[Tag]:
+        """Return the Tags whose span lies entirely inside [start_idx, end_idx)."""
+        result = []
+        for tree in self._trees_for(block_id, kind, name):
+            lo = bisect_left(tree.starts, start_idx)
+            hi = bisect_left(tree.starts, end_idx) if end_idx > start_idx else lo
+            result.extend(tree.tags[i] for i in range(lo, hi) if tree.ends[i] <= end_idx)
+        return result
+
+    def at(
+        self,
+        idx: int,
+        kind: Optional[str] = None,
+        name: Optional[str] = None,
+        block_id: Optional[str] = None,
+    ) -> List[Tag]:
+        """Return the Tags covering the character at `idx`, including zero-length Tags positioned there."""
+        return self.overlapping(idx, idx + 1, kind=kind, name=name, block_id=block_id)
@@ -11,12 +11,27 @@ from steamship.base.model import CamelModel
 from steamship.base.request import Request
 from steamship.base.response import Response
 from steamship.data.tags.tag_constants import GenerationTag, TagKind, TagValueKey
+from steamship.utils.concurrency import (
+    DEFAULT_CONCURRENCY,
+    BulkItemResult,
+    ProgressCallback,
+    run_concurrently,
+)
 
 
 class TagQueryRequest(Request):
     tag_filter_query: str
 
 
+def _invalidate_cached(client: Client, file_id: Optional[str], block_id: Optional[str]):
+    """Drop the cached File and Block a tag belongs to, since their tag lists have changed.
+
+    Called once a mutation's request has completed, so a read racing the request cannot cache the old state."""
+    if client.object_cache is not None:
+        client.object_cache.invalidate("file", file_id)
+        client.object_cache.invalidate("block", block_id)
+
+
 class Tag(CamelModel):
     # Steamship client.
     client: Client = Field(None, exclude=True)
@@ -87,15 +102,79 @@ class Tag(CamelModel):
             end_idx=end_idx,
             value=value,
         )
-        return client.post("tag/create", req, expect=Tag)
+        try:
+            return client.post("tag/create", req, expect=Tag)
+        finally:
+            _invalidate_cached(client, file_id, block_id)
 
-    def delete(self) -> Tag:
-        return self.client.post(
-            "tag/delete",
-            Tag.DeleteRequest(id=self.id, file_id=self.file_id, block_id=self.block_id),
-            expect=Tag,
+    @staticmethod
+    def create_many(
+        client: Client,
+        tags: List[Tag],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        retries: int = 0,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> List[BulkItemResult[Tag]]:
+        """Create many tags, keeping up to `concurrency` create calls in flight.
+
+        The Engine has no bulk tag endpoint, so this still sends one `tag/create` request per tag.
+        Each Tag must name the `file_id` (and, for block tags, the `block_id`) it belongs to.
+        Returns one result per tag, in input order; a failure to create one tag is reported in its
+        result and does not stop the others.
+        """
+        return run_concurrently(
+            lambda tag: Tag.create(
+                client,
+                file_id=tag.file_id,
+                block_id=tag.block_id,
+                kind=tag.kind,
+                name=tag.name,
+                start_idx=tag.start_idx,
+                end_idx=tag.end_idx,
+                value=tag.value,
+            ),
+            tags,
+            concurrency=concurrency,
+            retries=retries,
+            on_progress=on_progress,
         )
 
+    @staticmethod
+    def delete_many(
+        client: Client,
+        ids: List[str],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        retries: int = 0,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> List[BulkItemResult[Tag]]:
+        """Delete the tags with the given ids, keeping up to `concurrency` delete calls in flight.
+
+        As with `create_many`, this sends one `tag/delete` request per id. Returns one result per id, in input order.
+        """
+
+        def _delete(tag_id: str) -> Tag:
+            deleted = client.post("tag/delete", Tag.DeleteRequest(id=tag_id), expect=Tag)
+            _invalidate_cached(client, deleted.file_id, deleted.block_id)
+            return deleted
+
+        return run_concurrently(
+            _delete,
+            ids,
+            concurrency=concurrency,
+            retries=retries,
+            on_progress=on_progress,
+        )
+
+    def delete(self) -> Tag:
+        try:
+            return self.client.post(
+                "tag/delete",
+                Tag.DeleteRequest(id=self.id, file_id=self.file_id, block_id=self.block_id),
+                expect=Tag,
+            )
+        finally:
+            _invalidate_cached(self.client, self.file_id, self.block_id)
+
     def index(self, plugin_instance: Any = None):
         """Index this tag."""
         return plugin_instance.insert(self)
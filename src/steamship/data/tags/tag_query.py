@@ -0,0 +1,448 @@
+"""Client-side evaluation of ShipQL tag filter queries over Files, Blocks and Tags already held in memory.
+
+`File.query`, `Block.query` and `Tag.query` send their `tag_filter_query` to the Engine. When the relevant objects are
+already loaded, a `TagQueryIndex` answers the same queries locally, returning the same response types.
+
+The supported language is the one documented in docs/data/queries: the `blocktag` and `filetag` predicates; `kind`,
+`name`, `file_id` and `block_id` equality; `value("path") <op> <literal>` comparisons; the `overlaps`, `samespan`,
+`sameblock` and `samefile` relations; `and`/`or` conjunctions; and `all`.
+"""
+from __future__ import annotations
+
+import json
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from steamship.base.error import SteamshipError
+from steamship.data.tags.span_index import TagSpanIndex
+from steamship.data.tags.tag import Tag, TagQueryResponse
+from steamship.data.tags.tag_table import TagTable
+
+if TYPE_CHECKING:
+    from steamship.data.block import Block, BlockQueryResponse
+    from steamship.data.file import File, FileQueryResponse
+
+_TOKEN_RE = re.compile(
+    r"""\s*(?:
+        (?P<string>"(?:[^"\\]|\\.)*")
+        |(?P<number>-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)
+        |(?P<op>>=|<=|=|>|<)
+        |(?P<punct>[(){}])
+        |(?P<word>[A-Za-z_][A-Za-z0-9_]*)
+    )""",
+    re.VERBOSE,
+)
+
+_EQUALITY_PREDICATES = ("kind", "name", "file_id", "block_id")
+_RELATIONS = ("overlaps", "samespan", "sameblock", "samefile")
+
+
+# Parsed queries are nested tuples:
+#   ("all",)
+#   ("blocktag",) / ("filetag",)
+#   ("eq", field, string)                for kind / name / file_id / block_id
+#   ("value", path, op, literal)         op is one of = >= > <= < exists
+#   ("and" | "or", (child, ...))
+#   (relation, child)                    relation is one of _RELATIONS
+Query = Tuple
+
+
+class _Parser:
+    def __init__(self, query: str):
+        self.query = query
+        self.tokens: List[Tuple[str, Any]] = []
+        pos = 0
+        query = query.rstrip()
+        while pos < len(query):
+            match = _TOKEN_RE.match(query, pos)
+            if match is None or match.end() == pos:
+                self.fail(f"unexpected character at position {pos}")
+            pos = match.end()
+            kind = match.lastgroup
+            text = match.group(kind)
+            if kind == "string":
+                self.tokens.append(("literal", json.loads(text)))
+            elif kind == "number":
+                self.tokens.append(("literal", json.loads(text)))
+            elif kind == "word" and text.lower() in ("true", "false"):
+                self.tokens.append(("literal", text.lower() == "true"))
+            elif kind == "word":
+                self.tokens.append(("word", text.lower()))
+            else:
+                self.tokens.append((kind, text))
+        self.pos = 0
+
+    def fail(self, reason: str):
+        raise SteamshipError(message=f"Unable to parse query {self.query!r}: {reason}.")
+
+    def peek(self) -> Optional[Tuple[str, Any]]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self, kind: str, value: Any = None) -> Any:
+        token = self.peek()
+        if token is None or token[0] != kind or (value is not None and token[1] != value):
+            expected = value or kind
+            found = "end of query" if token is None else repr(token[1])
+            self.fail(f"expected {expected} but found {found}")
+        self.pos += 1
+        return token[1]
+
+    def parse(self) -> Query:
+        if self.peek() == ("word", "all") and len(self.tokens) == 1:
+            return ("all",)
+        result = self.expression()
+        if self.peek() is not None:
+            self.fail(f"unexpected {self.peek()[1]!r}")
+        return result
+
+    def expression(self) -> Query:
+        children = [self.term()]
+        conjunction = None
+        while self.peek() in (("word", "and"), ("word", "or")):
+            word = self.take("word")
+            if conjunction is not None and word != conjunction:
+                self.fail("mixed `and` and `or` must be grouped with parentheses")
+            conjunction = word
+            children.append(self.term())
+        return children[0] if conjunction is None else (conjunction, tuple(children))
+
+    def term(self) -> Query:
+        token = self.peek()
+        if token == ("punct", "("):
+            self.take("punct", "(")
+            result = self.expression()
+            self.take("punct", ")")
+            return result
+
+        word = self.take("word")
+        if word in ("blocktag", "filetag"):
+            return (word,)
+        if word in _EQUALITY_PREDICATES:
+            value = self.take("literal")
+            if not isinstance(value, str):
+                self.fail(f"`{word}` must be compared with a string")
+            return ("eq", word, value)
+        if word == "value":
+            self.take("punct", "(")
+            path = self.take("literal")
+            self.take("punct", ")")
+            if self.peek() == ("word", "exists"):
+                self.take("word")
+                return ("value", path, "exists", None)
+            return ("value", path, self.take("op"), self.take("literal"))
+        if word in _RELATIONS:
+            self.take("punct", "{")
+            child = self.expression()
+            self.take("punct", "}")
+            return (word, child)
+        self.fail(f"unknown predicate {word!r}")
+
+
+@lru_cache(maxsize=256)
+def parse_query(query: str) -> Query:
+    """Parse a ShipQL tag filter query, raising a SteamshipError if it is malformed."""
+    return _Parser(query).parse()
+
+
+_MISSING = object()
+
+
+def _value_at(value: Optional[Dict[str, Any]], path: str) -> Any:
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return _MISSING
+        value = value[key]
+    return value
+
+
+def _compare(actual: Any, op: str, literal: Any) -> bool:
+    if op == "exists":
+        return actual is not _MISSING
+    if actual is _MISSING or isinstance(actual, bool) != isinstance(literal, bool):
+        return False
+    if op == "=":
+        return actual == literal
+    numeric = (int, float)
+    if not (
+        (isinstance(actual, numeric) and isinstance(literal, numeric))
+        or (isinstance(actual, str) and isinstance(literal, str))
+    ):
+        return False
+    if op == ">=":
+        return actual >= literal
+    if op == ">":
+        return actual > literal
+    if op == "<=":
+        return actual <= literal
+    return actual < literal
+
+
+class TagQueryIndex:
+    """An in-memory index that answers ShipQL queries over Files, Blocks and Tags held by the client.
+
+    Each Tag becomes a row. Rows are indexed by kind, name, file id, block id and top-level value key, so
+    predicates resolve to row sets by lookup. Conjunctions, disjunctions and relations then combine
+    those sets. Only `value(...)` comparisons scan rows, and only the rows that have the compared key.
+    """
+
+    def __init__(self):
+        self._tags: List[Optional[Tag]] = []
+        self._table_rows: Dict[int, Tuple[TagTable, int]] = {}
+        self._values: List[Optional[Dict[str, Any]]] = []
+        self._spans: List[Tuple[Optional[int], Optional[int]]] = []
+        self._row_blocks: List[Optional[Block]] = []
+        self._row_files: List[Optional[File]] = []
+        self._row_block_keys: List[Optional[str]] = []
+        self._row_file_keys: List[Optional[str]] = []
+        self._blocks: List[Block] = []
+        self._files: List[File] = []
+        self._by_field: Dict[str, Dict[Any, Set[int]]] = {
+            "kind": {},
+            "name": {},
+            "file_id": {},
+            "block_id": {},
+            "value_key": {},
+        }
+        self._blocktag_rows: Set[int] = set()
+
+    @staticmethod
+    def from_files(files: Iterable[File]) -> TagQueryIndex:
+        index = TagQueryIndex()
+        for file in files:
+            index.add_file(file)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._tags)
+
+    def add_file(self, file: File):
+        """Index a File's Tags and the Tags of each of its Blocks."""
+        self._files.append(file)
+        for tag in file.tags or []:
+            self._add_row(
+                tag, tag.kind, tag.name, file.id, None, tag.value, tag.start_idx, tag.end_idx
+            )
+            self._row_files[-1] = file
+        for block in file.blocks or []:
+            self.add_block(block, file=file)
+
+    def add_block(self, block: Block, file: Optional[File] = None):
+        self._blocks.append(block)
+        file_id = block.file_id or (file.id if file is not None else None)
+        # A Block not yet created has no id, so its tags are related through the Block object itself.
+        block_key = block.id if block.id is not None else ("block", id(block))
+        for tag in block.tags or []:
+            self._add_row(
+                tag,
+                tag.kind,
+                tag.name,
+                file_id,
+                block.id,
+                tag.value,
+                tag.start_idx,
+                tag.end_idx,
+                block_key=block_key,
+            )
+            self._row_blocks[-1] = block
+            self._row_files[-1] = file
+
+    def add_tags(self, tags: Iterable[Tag]):
+        """Index free-standing Tags, which are block tags if their `block_id` is set."""
+        for tag in tags:
+            self._add_row(
+                tag,
+                tag.kind,
+                tag.name,
+                tag.file_id,
+                tag.block_id,
+                tag.value,
+                tag.start_idx,
+                tag.end_idx,
+            )
+
+    def add_tag_table(self, table: TagTable):
+        """Index the rows of a TagTable. Tag objects are only created for rows a query returns.
+
+        A row with a `block_index` but no `block_id` (such as one for a Block not yet created, from
+        `TagTable.from_file` or a `BlockAndTagPluginOutput`) is a block tag of the Block at that position in its
+        file, so the relations match it against the other rows for that Block."""
+        kinds, names = table.column("kind"), table.column("name")
+        file_ids, block_ids = table.column("file_id"), table.column("block_id")
+        starts, ends = table.column("start_idx"), table.column("end_idx")
+        for row in range(len(table)):
+            block_key = None
+            if block_ids[row] is None and table.block_index(row) >= 0:
+                # Rows of one table without a file id belong to the same file.
+                block_key = (file_ids[row] or id(table), table.block_index(row))
+            self._table_rows[len(self._tags)] = (table, row)
+            self._add_row(
+                None,
+                kinds[row],
+                names[row],
+                file_ids[row],
+                block_ids[row],
+                table.value(row),
+                starts[row],
+                ends[row],
+                block_key=block_key,
+            )
+
+    def _add_row(
+        self,
+        tag: Optional[Tag],
+        kind: Optional[str],
+        name: Optional[str],
+        file_id: Optional[str],
+        block_id: Optional[str],
+        value: Optional[Dict[str, Any]],
+        start_idx: Optional[int],
+        end_idx: Optional[int],
+        block_key: Optional[Any] = None,
+    ):
+        """Index one Tag. `block_key` identifies the row's Block for the relations when it has no `block_id`."""
+        if block_key is None:
+            block_key = block_id
+        row = len(self._tags)
+        self._tags.append(tag)
+        self._values.append(value)
+        self._spans.append((start_idx, end_idx))
+        self._row_blocks.append(None)
+        self._row_files.append(None)
+        self._row_block_keys.append(block_key)
+        self._row_file_keys.append(file_id)
+        for field, key in (
+            ("kind", kind),
+            ("name", name),
+            ("file_id", file_id),
+            ("block_id", block_id),
+        ):
+            if key is not None:
+                self._by_field[field].setdefault(key, set()).add(row)
+        if isinstance(value, dict):
+            for key in value:
+                self._by_field["value_key"].setdefault(key, set()).add(row)
+        if block_key is not None:
+            self._blocktag_rows.add(row)
+
+    def _tag(self, row: int) -> Tag:
+        tag = self._tags[row]
+        if tag is None:
+            table, table_row = self._table_rows[row]
+            tag = table[table_row]
+        return tag
+
+    def _evaluate(self, query: Query, cache: Dict[int, Set[int]]) -> Set[int]:  # noqa: C901
+        op = query[0]
+        if op == "all":
+            return set(range(len(self._tags)))
+        if op == "blocktag":
+            return set(self._blocktag_rows)
+        if op == "filetag":
+            return set(range(len(self._tags))) - self._blocktag_rows
+        if op == "eq":
+            return set(self._by_field[query[1]].get(query[2], ()))
+        if op == "value":
+            _, path, comparison, literal = query
+            candidates = self._by_field["value_key"].get(path.split(".")[0], ())
+            return {
+                row
+                for row in candidates
+                if _compare(_value_at(self._values[row], path), comparison, literal)
+            }
+        if op == "and":
+            # Intersect in the order written, stopping as soon as the intersection is empty.
+            result = None
+            for child in query[1]:
+                rows = self._evaluate(child, cache)
+                result = rows if result is None else result & rows
+                if not result:
+                    break
+            return result or set()
+        if op == "or":
+            result = set()
+            for child in query[1]:
+                result |= self._evaluate(child, cache)
+            return result
+        # Relations: rows with a distinct partner row that matches the nested query.
+        key = id(query)
+        if key not in cache:
+            cache[key] = self._related(op, self._evaluate(query[1], cache))
+        return set(cache[key])
+
+    def _related(self, relation: str, partners: Set[int]) -> Set[int]:
+        if relation in ("sameblock", "samefile"):
+            keys = self._row_block_keys if relation == "sameblock" else self._row_file_keys
+            partners_per_key: Dict[Any, int] = {}
+            for row in partners:
+                if keys[row] is not None:
+                    partners_per_key[keys[row]] = partners_per_key.get(keys[row], 0) + 1
+            return {
+                row
+                for row, key in enumerate(keys)
+                if key is not None
+                and partners_per_key.get(key, 0) - (1 if row in partners else 0) > 0
+            }
+
+        # overlaps / samespan: compare spans within a Block.
+        span_index = TagSpanIndex()
+        for row in partners:
+            if self._row_block_keys[row] is not None:
+                start, end = self._spans[row]
+                span_index.add_tags(
+                    [Tag(start_idx=start, end_idx=end, value={"row": row})],
+                    block_id=self._row_block_keys[row],
+                )
+        result = set()
+        for row, block_key in enumerate(self._row_block_keys):
+            start, end = self._spans[row]
+            if block_key is None or start is None or end is None:
+                continue
+            if relation == "overlaps":
+                matches = span_index.overlapping(start, max(end, start + 1), block_id=block_key)
+            else:
+                matches = [
+                    tag
+                    for tag in span_index.containing(start, end, block_id=block_key)
+                    if tag.start_idx == start and tag.end_idx == end
+                ]
+            if any(tag.value["row"] != row for tag in matches):
+                result.add(row)
+        return result
+
+    def _matching_rows(self, query: str) -> List[int]:
+        return sorted(self._evaluate(parse_query(query), {}))
+
+    def query_tags(self, tag_filter_query: str) -> TagQueryResponse:
+        """The local equivalent of `Tag.query`."""
+        return TagQueryResponse(
+            tags=[self._tag(row) for row in self._matching_rows(tag_filter_query)]
+        )
+
+    def query_blocks(self, tag_filter_query: str) -> BlockQueryResponse:
+        """The local equivalent of `Block.query`: the indexed Blocks with at least one matching Tag."""
+        from steamship.data.block import BlockQueryResponse
+
+        if parse_query(tag_filter_query) == ("all",):
+            return BlockQueryResponse(blocks=list(self._blocks))
+        blocks, seen = [], set()
+        for row in self._matching_rows(tag_filter_query):
+            block = self._row_blocks[row]
+            if block is not None and id(block) not in seen:
+                seen.add(id(block))
+                blocks.append(block)
+        return BlockQueryResponse(blocks=blocks)
+
+    def query_files(self, tag_filter_query: str) -> FileQueryResponse:
+        """The local equivalent of `File.query`: the indexed Files with at least one matching Tag."""
+        from steamship.data.file import FileQueryResponse
+
+        if parse_query(tag_filter_query) == ("all",):
+            return FileQueryResponse(files=list(self._files))
+        files, seen = [], set()
+        for row in self._matching_rows(tag_filter_query):
+            file = self._row_files[row]
+            if file is not None and id(file) not in seen:
+                seen.add(id(file))
+                files.append(file)
+        return FileQueryResponse(files=files)
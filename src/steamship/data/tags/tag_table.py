@@ -0,0 +1,231 @@
+"""A compact, columnar container for large numbers of Tags."""
+from __future__ import annotations
+
+from array import array
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional
+
+from steamship.base.model import to_camel
+from steamship.data.tags.tag import Tag
+
+if TYPE_CHECKING:
+    from steamship.data.file import File
+
+_NONE = -1  # Code stored in the integer columns for a missing value
+
+# Columns that can be filtered and grouped on.
+GROUPABLE_COLUMNS = ("kind", "name", "file_id", "block_id", "block_index")
+
+
+class _Interner:
+    """Maps repeated strings to small integer codes and back."""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def code(self, value: Optional[str]) -> int:
+        if value is None:
+            return _NONE
+        if isinstance(value, Enum):
+            value = value.value
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def lookup(self, value: Optional[str]) -> Optional[int]:
+        """Return the code of `value`, or None if it has never been interned."""
+        if isinstance(value, Enum):
+            value = value.value
+        return _NONE if value is None else self.codes.get(value)
+
+    def value(self, code: int) -> Optional[str]:
+        return None if code == _NONE else self.values[code]
+
+
+class TagTable:
+    """Stores Tags column by column instead of as one pydantic object per Tag.
+
+    Kinds, names, file ids and block ids are interned into int32 codes, spans are kept in int32 arrays, and the
+    rarely-set `value` and `text` fields live in sparse side stores keyed by row. A row costs tens of bytes rather than
+    the hundreds of a `Tag`, which matters for taggers that emit hundreds of thousands of Tags.
+
+    `block_index` records the position of a Tag's Block within its File (-1 for File-level Tags), so Tags can be
+    attached to Blocks that do not have ids yet, as in plugin outputs.
+
+    Conversion to and from `List[Tag]` is lossless for every field but `client`.
+    """
+
+    def __init__(self):
+        self._ids: List[Optional[str]] = []
+        # Interned string columns
+        self._interners = {
+            "kind": _Interner(),
+            "name": _Interner(),
+            "file_id": _Interner(),
+            "block_id": _Interner(),
+        }
+        self._columns = {
+            "kind": array("i"),
+            "name": array("i"),
+            "file_id": array("i"),
+            "block_id": array("i"),
+            "block_index": array("i"),
+            "start_idx": array("i"),
+            "end_idx": array("i"),
+        }
+        self._values: Dict[int, Dict[str, Any]] = {}
+        self._texts: Dict[int, str] = {}
+
+    @staticmethod
+    def from_tags(tags: Iterable[Tag], block_index: int = _NONE) -> TagTable:
+        table = TagTable()
+        table.extend(tags, block_index=block_index)
+        return table
+
+    @staticmethod
+    def from_file(file: File) -> TagTable:
+        """Collect the Tags of a File and of each of its Blocks."""
+        table = TagTable.from_tags(file.tags or [])
+        for i, block in enumerate(file.blocks or []):
+            table.extend(block.tags or [], block_index=i)
+        return table
+
+    def append(self, tag: Tag, block_index: int = _NONE):
+        row = len(self._ids)
+        self._ids.append(tag.id)
+        columns = self._columns
+        for name, interner in self._interners.items():
+            columns[name].append(interner.code(getattr(tag, name)))
+        columns["block_index"].append(block_index)
+        columns["start_idx"].append(_NONE if tag.start_idx is None else tag.start_idx)
+        columns["end_idx"].append(_NONE if tag.end_idx is None else tag.end_idx)
+        if tag.value is not None:
+            self._values[row] = tag.value
+        if tag.text is not None:
+            self._texts[row] = tag.text
+
+    def extend(self, tags: Iterable[Tag], block_index: int = _NONE):
+        for tag in tags:
+            self.append(tag, block_index=block_index)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _field(self, column: str, row: int) -> Any:
+        code = self._columns[column][row]
+        if column in self._interners:
+            return self._interners[column].value(code)
+        return None if code == _NONE and column != "block_index" else code
+
+    def row_dict(self, row: int, by_alias: bool = False) -> Dict[str, Any]:
+        """Return row `row` as the dict a Tag would serialize to, omitting fields that are not set."""
+        fields = {
+            "id": self._ids[row],
+            "file_id": self._field("file_id", row),
+            "block_id": self._field("block_id", row),
+            "kind": self._field("kind", row),
+            "name": self._field("name", row),
+            "value": self._values.get(row),
+            "start_idx": self._field("start_idx", row),
+            "end_idx": self._field("end_idx", row),
+            "text": self._texts.get(row),
+        }
+        return {
+            (to_camel(key) if by_alias else key): value
+            for key, value in fields.items()
+            if value is not None
+        }
+
+    def value(self, row: int) -> Optional[Dict[str, Any]]:
+        return self._values.get(row)
+
+    def block_index(self, row: int) -> int:
+        return self._columns["block_index"][row]
+
+    def __getitem__(self, row: int) -> Tag:
+        return Tag(**self.row_dict(row))
+
+    def __iter__(self) -> Iterator[Tag]:
+        return (self[row] for row in range(len(self)))
+
+    def to_tags(self) -> List[Tag]:
+        return list(self)
+
+    def column(self, name: str) -> List[Any]:
+        """Return the decoded values of a column, one per row."""
+        return [self._field(name, row) for row in range(len(self))]
+
+    def select(self, rows: Iterable[int]) -> TagTable:
+        """Return a new table holding only `rows`, in the given order."""
+        table = TagTable()
+        # Share the interners so the codes can be copied across unchanged.
+        table._interners = self._interners
+        for row in rows:
+            new_row = len(table._ids)
+            table._ids.append(self._ids[row])
+            for name, values in self._columns.items():
+                table._columns[name].append(values[row])
+            if row in self._values:
+                table._values[new_row] = self._values[row]
+            if row in self._texts:
+                table._texts[new_row] = self._texts[row]
+        return table
+
+    def _code_for(self, column: str, value: Any) -> Optional[int]:
+        if column in self._interners:
+            return self._interners[column].lookup(value)
+        return value
+
+    def rows_where(self, **criteria: Any) -> List[int]:
+        """Return the rows whose columns equal every given value, e.g. `rows_where(kind="ner", name="person")`.
+
+        Criteria are matched by comparing integer codes, so no Tag objects are created."""
+        columns = []
+        for column, value in criteria.items():
+            if column not in GROUPABLE_COLUMNS:
+                raise ValueError(
+                    f"Cannot filter on column {column}. Expected one of {GROUPABLE_COLUMNS}."
+                )
+            code = self._code_for(column, value)
+            if code is None:
+                return []  # The value never occurs in this table
+            columns.append((self._columns[column], code))
+
+        if not columns:
+            return list(range(len(self)))
+        first, first_code = columns[0]
+        rows = [row for row, code in enumerate(first) if code == first_code]
+        for values, code in columns[1:]:
+            rows = [row for row in rows if values[row] == code]
+        return rows
+
+    def filter(self, **criteria: Any) -> TagTable:
+        """Return a new table of the rows matching `criteria`; see `rows_where`."""
+        return self.select(self.rows_where(**criteria))
+
+    def group_by(self, column: str) -> Dict[Any, TagTable]:
+        """Split the table into one table per distinct value of `column`."""
+        if column not in GROUPABLE_COLUMNS:
+            raise ValueError(
+                f"Cannot group on column {column}. Expected one of {GROUPABLE_COLUMNS}."
+            )
+        groups: Dict[int, List[int]] = {}
+        for row, code in enumerate(self._columns[column]):
+            groups.setdefault(code, []).append(row)
+        return {self._field(column, rows[0]): self.select(rows) for rows in groups.values()}
+
+    def counts(self, column: str) -> Dict[Any, int]:
+        """Count the rows per distinct value of `column`."""
+        if column not in GROUPABLE_COLUMNS:
+            raise ValueError(
+                f"Cannot count on column {column}. Expected one of {GROUPABLE_COLUMNS}."
+            )
+        counts: Dict[int, int] = {}
+        first_row: Dict[int, int] = {}
+        for row, code in enumerate(self._columns[column]):
+            counts[code] = counts.get(code, 0) + 1
+            first_row.setdefault(code, row)
+        return {self._field(column, first_row[code]): n for code, n in counts.items()}
@@ -0,0 +1,403 @@
+"""An in-process mirror of an EmbeddingIndex that answers searches without a round trip to the Engine.
+
+`LocalVectorIndex.from_index` copies the items of an `EmbeddingIndex`, with their embeddings, into memory. Searches
+then return the same `QueryResults` (or, through `search_tags`, `SearchResults`) as a remote search, synchronously.
+
+Vectors are held as one contiguous float32 matrix and scored with a batched matrix product when NumPy is installed.
+Without NumPy they are held in a float32 `array` and scored in pure Python, which is fine for tens of thousands of
+vectors. For larger indexes, `build_partitions` clusters the vectors (IVF) so each search only scores the vectors in
+the partitions nearest the query.
+"""
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import random
+from array import array
+from enum import Enum
+from operator import mul
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple, Union
+
+from steamship.base.error import SteamshipError
+from steamship.data.embeddings import EmbeddedItem, EmbeddingIndex, QueryResult, QueryResults
+from steamship.data.plugin.index_plugin_instance import SearchResults
+from steamship.data.search import Hit
+from steamship.utils.vector_encoding import VectorEncoding
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Embeds a list of query strings, returning one vector per string.
+EmbedFunction = Callable[[List[str]], List[List[float]]]
+
+
+class VectorMetric(str, Enum):
+    COSINE = "cosine"  # Vectors are normalized on insert, so scores are cosine similarities
+    DOT = "dot"  # Raw inner products
+
+
+def _normalize(vector: Sequence[float]) -> List[float]:
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else list(vector)
+
+
+class _ArrayStore:
+    """Row-major float32 vectors in an `array`, scored in pure Python."""
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+        self.data = array("f")
+
+    def wrap(self, data: Sequence[float]):
+        """Use the flat buffer `data` (such as a memory-mapped one) as the vectors, without copying it."""
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.data) // self.dimension
+
+    def extend(self, vectors: List[List[float]]):
+        if not isinstance(self.data, array):  # A wrapped buffer is read-only
+            self.data = array("f", self.data)
+        for vector in vectors:
+            self.data.extend(vector)
+
+    def row(self, row: int) -> List[float]:
+        return self.data[row * self.dimension : (row + 1) * self.dimension].tolist()
+
+    def mean(self, rows: List[int]) -> List[float]:
+        total = [0.0] * self.dimension
+        for row in rows:
+            total = list(map(sum, zip(total, self.row(row))))
+        return [x / len(rows) for x in total]
+
+    def top_k(
+        self, query: List[float], k: int, rows: Optional[Sequence[int]] = None
+    ) -> List[Tuple[int, float]]:
+        rows = range(len(self)) if rows is None else rows
+        d = self.dimension
+        with memoryview(self.data) as view:
+            scores = [sum(map(mul, view[row * d : (row + 1) * d], query)) for row in rows]
+        best = heapq.nlargest(k, range(len(scores)), key=scores.__getitem__)
+        return [(rows[i], scores[i]) for i in best]
+
+    def top_k_many(
+        self, queries: List[List[float]], k: int, rows: Optional[List[Sequence[int]]] = None
+    ) -> List[List[Tuple[int, float]]]:
+        return [
+            self.top_k(query, k, rows[i] if rows is not None else None)
+            for i, query in enumerate(queries)
+        ]
+
+    def nearest(self, centroids: _ArrayStore) -> List[int]:
+        """Return the row of `centroids` scoring highest against each of these vectors."""
+        return [centroids.top_k(self.row(row), 1)[0][0] for row in range(len(self))]
+
+
+class _NumpyStore:
+    """Row-major vectors in a float32 NumPy matrix that grows by doubling, scored with matrix products."""
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+        self._matrix = np.empty((0, dimension), dtype=np.float32)
+        self._size = 0
+
+    def wrap(self, matrix):
+        """Use `matrix` (such as a memory-mapped one) as the vectors, without copying it."""
+        self._matrix = matrix
+        self._size = len(matrix)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def matrix(self):
+        return self._matrix[: self._size]
+
+    def extend(self, vectors: List[List[float]]):
+        rows = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dimension)
+        needed = self._size + len(rows)
+        if needed > len(self._matrix):
+            grown = np.empty((max(needed, 2 * len(self._matrix)), self.dimension), np.float32)
+            grown[: self._size] = self.matrix
+            self._matrix = grown
+        self._matrix[self._size : needed] = rows
+        self._size = needed
+
+    def row(self, row: int) -> List[float]:
+        return self._matrix[row].tolist()
+
+    def mean(self, rows: List[int]) -> List[float]:
+        return self._matrix[rows].mean(axis=0).tolist()
+
+    @staticmethod
+    def _best(scores, k: int):
+        if k < len(scores):
+            candidates = np.argpartition(-scores, k - 1)[:k]
+        else:
+            candidates = np.arange(len(scores))
+        return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+    def top_k(
+        self, query: List[float], k: int, rows: Optional[Sequence[int]] = None
+    ) -> List[Tuple[int, float]]:
+        return self.top_k_many([query], k, None if rows is None else [rows])[0]
+
+    def top_k_many(
+        self, queries: List[List[float]], k: int, rows: Optional[List[Sequence[int]]] = None
+    ) -> List[List[Tuple[int, float]]]:
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.dimension)
+        if rows is None:
+            all_scores = queries @ self.matrix.T  # One batched product for every query
+            results = []
+            for scores in all_scores:
+                best = self._best(scores, k)
+                results.append(list(zip(best.tolist(), scores[best].tolist())))
+            return results
+        results = []
+        for query, query_rows in zip(queries, rows):
+            query_rows = np.asarray(query_rows, dtype=np.int64)
+            scores = self._matrix[query_rows] @ query
+            best = self._best(scores, k)
+            results.append(list(zip(query_rows[best].tolist(), scores[best].tolist())))
+        return results
+
+    def nearest(self, centroids: _NumpyStore) -> List[int]:
+        """Return the row of `centroids` scoring highest against each of these vectors."""
+        assignments = []
+        for start in range(0, self._size, 4096):  # Bound the size of the score matrix
+            scores = self._matrix[start : min(start + 4096, self._size)] @ centroids.matrix.T
+            assignments.extend(np.argmax(scores, axis=1).tolist())
+        return assignments
+
+
+class LocalVectorIndex:
+    """An in-memory index of embedded items that answers top-k searches locally.
+
+    Parameters
+    ----------
+    metric : VectorMetric
+        How vectors are compared. Default: cosine similarity.
+    embed : Optional[EmbedFunction]
+        Embeds query strings for `search` and `search_tags`, with the same model as the indexed items. Without it,
+        only `search_vectors` can be used.
+    use_numpy : bool
+        Use NumPy when it is installed. Set to False to force the pure Python implementation.
+    """
+
+    def __init__(
+        self,
+        metric: VectorMetric = VectorMetric.COSINE,
+        embed: Optional[EmbedFunction] = None,
+        use_numpy: bool = True,
+    ):
+        self.metric = VectorMetric(metric)
+        self.embed = embed
+        self.n_probe = 0
+        self._store_class = _NumpyStore if use_numpy and np is not None else _ArrayStore
+        self._store = None
+        self._items: Sequence[EmbeddedItem] = []
+        self._centroids = None
+        self._partitions: List[List[int]] = []
+
+    @staticmethod
+    def from_index(
+        index: EmbeddingIndex,
+        metric: VectorMetric = VectorMetric.COSINE,
+        embed: Optional[EmbedFunction] = None,
+        file_id: str = None,
+        block_id: str = None,
+        use_numpy: bool = True,
+    ) -> LocalVectorIndex:
+        """Copy the items of `index` (optionally only those of one File or Block) and their embeddings."""
+        local = LocalVectorIndex(metric=metric, embed=embed, use_numpy=use_numpy)
+        response = index.list_items(
+            file_id=file_id, block_id=block_id, embedding_encoding=VectorEncoding.FLOAT32
+        )
+        local.add(response.items or [], vectors=response.vectors())
+        return local
+
+    def _attach(self, items: Sequence[EmbeddedItem], vectors, dimension: int):
+        """Make `items` and `vectors` (prepared for the metric) the contents of this empty index, without copying.
+
+        `vectors` is a 2-D NumPy array, or a flat float32 buffer for the pure Python implementation."""
+        self._store = self._store_class(dimension)
+        self._store.wrap(vectors)
+        self._items = items
+
+    @property
+    def dimension(self) -> Optional[int]:
+        return self._store.dimension if self._store is not None else None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _prepare(self, vectors: Sequence[Sequence[float]]) -> Sequence[Sequence[float]]:
+        if np is not None and isinstance(vectors, np.ndarray):
+            return self._prepare_array(vectors)
+        dimension = self.dimension or len(vectors[0])
+        for vector in vectors:
+            if len(vector) != dimension:
+                raise SteamshipError(
+                    message=f"Expected vectors of dimension {dimension}, but got one of dimension {len(vector)}."
+                )
+        if self.metric == VectorMetric.COSINE:
+            return [_normalize(vector) for vector in vectors]
+        return [list(vector) for vector in vectors]
+
+    def _prepare_array(self, vectors):
+        """`_prepare` for a 2-D NumPy array, without creating a Python float per element."""
+        dimension = self.dimension or vectors.shape[1]
+        if vectors.ndim != 2 or vectors.shape[1] != dimension:
+            raise SteamshipError(
+                message=f"Expected vectors of dimension {dimension}, but got an array of shape {vectors.shape}."
+            )
+        vectors = vectors.astype(np.float32)
+        if self.metric == VectorMetric.COSINE:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            norms[norms == 0] = 1
+            vectors /= norms
+        return vectors
+
+    def add(
+        self, items: Iterable[EmbeddedItem], vectors: Optional[Sequence[Sequence[float]]] = None
+    ):
+        """Add embedded items. Their `embedding` is moved into the vector store; the rest of each item is kept.
+
+        `vectors`, if given, holds the embeddings of `items` in order (as a list of lists or a 2-D NumPy array, such
+        as `ListItemsResponse.vectors()`) and is used in place of each item's `embedding`."""
+        items = list(items)
+        if not items:
+            return
+        if vectors is None:
+            if any(not item.embedding for item in items):
+                raise SteamshipError(
+                    message="Every item added to a LocalVectorIndex must have an `embedding`."
+                )
+            vectors = [item.embedding for item in items]
+        elif len(vectors) != len(items):
+            raise SteamshipError(message="Expected one vector per item.")
+        vectors = self._prepare(vectors)
+        if self._store is None:
+            self._store = self._store_class(len(vectors[0]))
+        start = len(self._store)
+        self._store.extend(vectors)
+        if not isinstance(self._items, list):  # Read the items of a snapshot into memory
+            self._items = list(self._items)
+        self._items.extend(item.copy(update={"embedding": None}) for item in items)
+
+        if self._centroids is not None:
+            added = self._store_class(self._store.dimension)
+            added.extend(vectors)
+            for offset, partition in enumerate(added.nearest(self._centroids)):
+                self._partitions[partition].append(start + offset)
+
+    def build_partitions(self, n_lists: int, n_probe: int = 8, iterations: int = 10, seed: int = 0):
+        """Cluster the vectors into `n_lists` partitions with k-means (IVF).
+
+        Each search then scores only the vectors in the `n_probe` partitions whose centroids score highest against
+        the query. This trades a little recall for speed; raise `n_probe` (an attribute that can be changed at any
+        time) to get it back. Items added later are assigned to their nearest partition.
+        """
+        if self._store is None or n_lists > len(self._store):
+            raise SteamshipError(message="`n_lists` must not exceed the number of vectors.")
+        store = self._store
+        centroids = self._store_class(store.dimension)
+        centroids.extend(
+            [store.row(row) for row in random.Random(seed).sample(range(len(store)), n_lists)]
+        )
+        for _ in range(iterations):
+            partitions = self._assign(centroids)
+            means = [
+                store.mean(rows) if rows else centroids.row(i) for i, rows in enumerate(partitions)
+            ]
+            centroids = self._store_class(store.dimension)
+            centroids.extend(self._prepare(means) if self.metric == VectorMetric.COSINE else means)
+        self._centroids = centroids
+        self._partitions = self._assign(centroids)
+        self.n_probe = n_probe
+
+    def _assign(self, centroids) -> List[List[int]]:
+        partitions: List[List[int]] = [[] for _ in range(len(centroids))]
+        for row, partition in enumerate(self._store.nearest(centroids)):
+            partitions[partition].append(row)
+        return partitions
+
+    def clear_partitions(self):
+        """Go back to scoring every vector on each search."""
+        self._centroids = None
+        self._partitions = []
+        self.n_probe = 0
+
+    def _candidates(self, queries: List[List[float]]) -> Optional[List[List[int]]]:
+        if self._centroids is None:
+            return None
+        candidates = []
+        for nearest in self._centroids.top_k_many(queries, self.n_probe):
+            candidates.append(
+                [row for partition, _ in nearest for row in self._partitions[partition]]
+            )
+        return candidates
+
+    def _result(self, row: int, score: float, query: Optional[str], include_metadata: bool):
+        item = self._items[row]
+        metadata = item.metadata if include_metadata else None
+        if metadata is not None and not isinstance(metadata, str):
+            metadata = json.dumps(
+                metadata
+            )  # Hit expects serialized metadata, as the Engine sends it
+        hit = Hit(
+            id=item.id,
+            index=row,
+            value=item.value,
+            score=score,
+            external_id=item.external_id,
+            external_type=item.external_type,
+            metadata=metadata,
+            query=query,
+        )
+        return QueryResult(value=hit, score=score, index=row, id=item.id)
+
+    def search_vectors(
+        self,
+        vectors: Sequence[Sequence[float]],
+        k: int = 1,
+        include_metadata: bool = False,
+        queries: Optional[List[str]] = None,
+    ) -> QueryResults:
+        """Return the `k` best items for each query vector, best first, with the results of each query in turn.
+
+        `queries` optionally names the query behind each vector; it is recorded in each `Hit.query`."""
+        if self._store is None or len(vectors) == 0:
+            return QueryResults(items=[])
+        queries = queries or [None] * len(vectors)
+        prepared = self._prepare(vectors)
+        matches = self._store.top_k_many(prepared, k, self._candidates(prepared))
+        return QueryResults(
+            items=[
+                self._result(row, score, query, include_metadata)
+                for query, query_matches in zip(queries, matches)
+                for row, score in query_matches
+            ]
+        )
+
+    def search(
+        self, query: Union[str, List[str]], k: int = 1, include_metadata: bool = False
+    ) -> QueryResults:
+        """Search as `EmbeddingIndex.search` does, embedding the query with `embed`, and return the results."""
+        if self.embed is None:
+            raise SteamshipError(
+                message="Searching by text requires an `embed` function; use `search_vectors` otherwise."
+            )
+        queries = query if isinstance(query, list) else [query]
+        return self.search_vectors(
+            self.embed(queries), k=k, include_metadata=include_metadata, queries=queries
+        )
+
+    def search_tags(self, query: str, k: int = 1) -> SearchResults:
+        """Search as `EmbeddingIndexPluginInstance.search` does, returning the matching Tags."""
+        if query is None or len(query.strip()) == 0:
+            raise SteamshipError(message="Query field must be non-empty.")
+        return SearchResults.from_query_results(self.search(query, k=k, include_metadata=True))
@@ -1,8 +1,47 @@
 from __future__ import annotations
 
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from pydantic import Field
+
+from steamship.base.error import SteamshipError
 from steamship.data.file import File
+from steamship.data.tags.tag_table import TagTable
 from steamship.plugin.outputs.plugin_output import PluginOutput
 
 
 class BlockAndTagPluginOutput(PluginOutput):
     file: File = None
+
+    # Optionally, Tags for `file` held in columnar form rather than as Tag objects on the File and its Blocks.
+    # Rows with a `block_index` are attached to that Block of `file` when serialized (by `dict()` or `json()`);
+    # the rest to the File itself.
+    tag_table: Optional[TagTable] = Field(None, exclude=True)
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    def _iter(self, to_dict: bool = False, **kwargs) -> Iterator[Tuple[str, Any]]:
+        # `_iter` backs both `dict()` and `json()`; only expand into their output, not into `copy()`.
+        expand = to_dict and self.tag_table is not None and len(self.tag_table) > 0
+        for key, value in super()._iter(to_dict=to_dict, **kwargs):
+            if expand and key == "file":
+                value = self._file_with_table_tags(value, kwargs.get("by_alias", False))
+            yield key, value
+
+    def _file_with_table_tags(
+        self, file: Optional[Dict[str, Any]], by_alias: bool
+    ) -> Dict[str, Any]:
+        file = {} if file is None else file
+        blocks = file.get("blocks") or []
+        for row in range(len(self.tag_table)):
+            block_index = self.tag_table.block_index(row)
+            if block_index >= len(blocks):
+                raise SteamshipError(
+                    message=f"Tag table row {row} refers to block {block_index}, but the file has {len(blocks)} blocks."
+                )
+            target = file if block_index < 0 else blocks[block_index]
+            if target.get("tags") is None:
+                target["tags"] = []
+            target["tags"].append(self.tag_table.row_dict(row, by_alias=by_alias))
+        return file
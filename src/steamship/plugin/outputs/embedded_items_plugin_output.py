@@ -1,9 +1,31 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Any, List, Optional
 
 from steamship.plugin.outputs.plugin_output import PluginOutput
+from steamship.utils.vector_encoding import (
+    EncodedVectors,
+    VectorEncoding,
+    encode_vectors,
+    vectors_or_encoded,
+)
 
 
 class EmbeddedItemsPluginOutput(PluginOutput):
-    embeddings: List[List[float]]
+    embeddings: Optional[List[List[float]]] = None
+
+    # Optionally, the embeddings in a compact binary form instead of `embeddings`; see `from_vectors`.
+    encoded_embeddings: Optional[EncodedVectors] = None
+
+    @staticmethod
+    def from_vectors(
+        vectors: Any, encoding: VectorEncoding = VectorEncoding.JSON
+    ) -> EmbeddedItemsPluginOutput:
+        """Build the output from a list of vectors or a 2-D NumPy array, with `encoding` for the compact form."""
+        if VectorEncoding(encoding) == VectorEncoding.JSON:
+            return EmbeddedItemsPluginOutput(embeddings=[list(map(float, v)) for v in vectors])
+        return EmbeddedItemsPluginOutput(encoded_embeddings=encode_vectors(vectors, encoding))
+
+    def vectors(self) -> Any:
+        """The embeddings, whichever form they were sent in: a float32 NumPy array if NumPy is installed."""
+        return vectors_or_encoded(self.embeddings, self.encoded_embeddings)
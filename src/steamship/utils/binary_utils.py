@@ -2,7 +2,10 @@ import base64
 import io
 import json as jsonlib
 import logging
-from typing import Any, Tuple, Union
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Iterable, Tuple, Union
 
 from pydantic import BaseModel
 
@@ -111,3 +114,26 @@ def flexi_create(  # noqa: C901
             message="There was an exception thrown while trying to encode your package/plugin data.",
             error=ex,
         )
+
+
+def write_chunks(chunks: Iterable[bytes], path: Union[str, Path]) -> Path:
+    """Write streamed `chunks` to `path`.
+
+    The chunks are first written to a temporary file beside `path` which replaces it only once the stream is
+    complete, so a failed download never leaves a truncated file at `path`, and concurrent downloads to the same
+    path do not write into each other's file.
+    """
+    path = Path(path)
+    partial = tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".part", delete=False
+    )
+    partial_path = Path(partial.name)
+    try:
+        with partial:
+            for chunk in chunks:
+                partial.write(chunk)
+        os.replace(partial_path, path)
+    finally:
+        if partial_path.exists():
+            partial_path.unlink()
+    return path
@@ -0,0 +1,124 @@
+"""Helpers for issuing many independent Engine calls with bounded parallelism.
+
+The client is synchronous, so bulk operations fan their calls out over a thread pool that shares the
+client's HTTP session.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Callable, Generic, Iterable, Iterator, List, Optional, TypeVar
+
+from requests import ConnectionError, Timeout
+
+from steamship.base.error import SteamshipError
+from steamship.base.model import GenericCamelModel
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_CONCURRENCY = 8
+
+# Called after each item of a bulk operation finishes with (items finished, total items).
+ProgressCallback = Callable[[int, int], None]
+
+
+class BulkItemResult(GenericCamelModel, Generic[T]):
+    """The outcome of one item of a bulk operation.
+
+    Exactly one of `output` and `error` is set."""
+
+    index: int  # Position of the item in the input of the bulk operation
+    output: Optional[T] = None
+    error: Optional[Exception] = None
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Whether retrying the call that raised `error` might succeed: a network failure, a timeout, or an Engine
+    response of HTTP 429 or 5xx."""
+    if isinstance(error, (ConnectionError, Timeout)):
+        return True
+    status_code = error.status_code if isinstance(error, SteamshipError) else None
+    return status_code is not None and (
+        status_code == HTTPStatus.TOO_MANY_REQUESTS or status_code >= 500
+    )
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Split `items` into consecutive lists of at most `size` elements."""
+    if size < 1:
+        raise ValueError(f"Chunk size must be positive. Got {size}.")
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_concurrently(
+    fn: Callable[[T], R],
+    items: List[T],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    retries: int = 0,
+    retry_delay_s: float = 1,
+    on_progress: Optional[ProgressCallback] = None,
+    retry_if: Optional[Callable[[Exception], bool]] = None,
+) -> List[BulkItemResult[R]]:
+    """Apply `fn` to every item with at most `concurrency` calls in flight.
+
+    Parameters
+    ----------
+    retries : int
+        Number of additional attempts made for an item whose call raised. Default: 0.
+    retry_delay_s : float
+        Delay before the first retry of an item; doubled on each further retry. Default: 1s.
+    on_progress : Optional[ProgressCallback]
+        Called with (items finished, total items) each time an item succeeds or exhausts its retries.
+        It is invoked from worker threads, so keep it short.
+    retry_if : Optional[Callable[[Exception], bool]]
+        If given, only errors for which it returns True are retried, such as `is_transient_error`.
+
+    Errors are captured per item rather than raised; results are returned in input order.
+    """
+    lock = threading.Lock()
+    finished = 0
+
+    def _run(index_and_item) -> BulkItemResult[R]:
+        nonlocal finished
+        index, item = index_and_item
+        attempt = 0
+        while True:
+            try:
+                result = BulkItemResult(index=index, output=fn(item))
+                break
+            except Exception as e:
+                if attempt >= retries or (retry_if is not None and not retry_if(e)):
+                    result = BulkItemResult(index=index, error=e)
+                    break
+                logging.warning(f"Bulk item {index} failed on attempt {attempt + 1}; retrying: {e}")
+                time.sleep(retry_delay_s * 2**attempt)
+                attempt += 1
+
+        if on_progress:
+            with lock:
+                finished += 1
+                on_progress(finished, len(items))
+        return result
+
+    if concurrency <= 1 or len(items) <= 1:
+        return [_run(pair) for pair in enumerate(items)]
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(items))) as executor:
+        return list(executor.map(_run, enumerate(items)))
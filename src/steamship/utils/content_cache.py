@@ -0,0 +1,171 @@
+"""A content-addressed disk cache for raw Block bytes that can be shared by several processes on one host.
+
+Content is stored once per SHA-256 digest under `objects/`, and each key (a Block id, plus its content URL for
+ephemeral Blocks) maps to a digest through a small file under `keys/`. Every file is written to a temporary name and
+renamed into place, so readers never see partial content; eviction and index updates hold an exclusive file lock.
+"""
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+DEFAULT_CONTENT_CACHE_BYTES = 1024 * 1024 * 1024
+
+
+class ContentCache:
+    """Caches raw content on disk, evicting the least recently read content beyond `max_bytes`."""
+
+    def __init__(self, path: Union[str, Path], max_bytes: int = DEFAULT_CONTENT_CACHE_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._objects = self.path / "objects"
+        self._keys = self.path / "keys"
+        self._objects.mkdir(parents=True, exist_ok=True)
+        self._keys.mkdir(parents=True, exist_ok=True)
+
+    @contextmanager
+    def _lock(self):
+        with open(self.path / ".lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _key_file(self, key: str) -> Path:
+        return self._keys / hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _write_atomic(self, directory: Path, name: str, chunks: Iterator[bytes]) -> str:
+        """Write `chunks` to `directory`/`name`, or to a name derived from their digest if `name` is empty."""
+        digest = hashlib.sha256()
+        fd, tmp_name = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    f.write(chunk)
+            name = name or digest.hexdigest()
+            os.replace(tmp_name, directory / name)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+        return name
+
+    def content_path(self, key: str) -> Optional[Path]:
+        """Return the path of the content cached under `key`, marking it as recently used, or None on a miss."""
+        try:
+            digest = self._key_file(key).read_text()
+        except (FileNotFoundError, ValueError):
+            return None
+        path = self._objects / digest
+        try:
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            self._drop_dangling_key(key, digest)
+            return None
+        return path
+
+    def _drop_dangling_key(self, key: str, digest: str):
+        """Remove the key file of `key` if it still names `digest`, whose content has been evicted."""
+        with self._lock():
+            key_file = self._key_file(key)
+            try:
+                if key_file.read_text() == digest and not (self._objects / digest).exists():
+                    key_file.unlink()
+            except FileNotFoundError:
+                pass
+
+    def put(self, key: str, chunks: Iterator[bytes]) -> Path:
+        """Store the content streamed in `chunks` under `key` and return its path."""
+        digest = self._write_atomic(self._objects, "", chunks)
+        with self._lock():
+            self._write_atomic(self._keys, self._key_file(key).name, iter([digest.encode("utf-8")]))
+            self._evict(keep=digest)
+        return self._objects / digest
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], Iterator[bytes]]) -> Path:
+        """Return the path of the content under `key`, storing the chunks returned by `fetch()` on a miss.
+
+        Another process may evict the content as soon as the path is returned; prefer `read_or_fetch` to read it."""
+        return self.content_path(key) or self.put(key, fetch())
+
+    def read(self, key: str) -> Optional[bytes]:
+        path = self.content_path(key)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            # Evicted by another process since it was looked up
+            self._drop_dangling_key(key, path.name)
+            return None
+
+    def read_or_fetch(self, key: str, fetch: Callable[[], Iterator[bytes]]) -> bytes:
+        """Return the content under `key`, storing the chunks returned by `fetch()` on a miss."""
+        content = self.read(key)
+        if content is not None:
+            return content
+        path = self.put(key, fetch())
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            # Evicted by another process straight after it was stored, so fetch it once more without caching it.
+            return b"".join(fetch())
+
+    def view(self, key: str) -> Optional[memoryview]:
+        """Return a read-only, memory-mapped view of the content under `key` without copying it into memory."""
+        path = self.content_path(key)
+        if path is None:
+            return None
+        try:
+            return _map(path)
+        except FileNotFoundError:
+            self._drop_dangling_key(key, path.name)
+            return None
+
+    def invalidate(self, key: str):
+        with self._lock():
+            try:
+                self._key_file(key).unlink()
+            except FileNotFoundError:
+                pass
+
+    def size(self) -> int:
+        """The number of bytes of content held."""
+        return sum(path.stat().st_size for path in self._objects.iterdir())
+
+    def _evict(self, keep: str):
+        """Remove the least recently used content until the cache fits its budget. Expects the lock to be held."""
+        objects = []
+        for path in self._objects.iterdir():
+            if not path.name.startswith(".tmp-"):
+                stat = path.stat()
+                objects.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in objects)
+        for _, size, path in sorted(objects):
+            if total <= self.max_bytes:
+                break
+            if path.name != keep:
+                path.unlink()
+                total -= size
+        # Keys of evicted content now dangle; `content_path` treats them as misses and removes them.
+
+
+def _map(path: Path) -> memoryview:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return memoryview(b"")
+        # The mapping stays valid after the file is closed, and after the file is evicted on POSIX systems.
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
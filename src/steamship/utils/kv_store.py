@@ -2,7 +2,7 @@
 
 from typing import Any, Dict, List, Optional, Tuple
 
-from steamship import Block, File, Steamship, Tag
+from steamship import Block, File, Steamship, SteamshipError, Tag
 
 KV_STORE_MARKER = "__init__"
 
@@ -66,19 +66,23 @@ class KeyValueStore:
                 return tag.value
 
     def delete(self, key: str) -> bool:
-        """Delete the entry represented by `key`"""
+        """Delete the entry represented by `key`.
+
+        Each tag holding the key is deleted with its own request. If any of them fails, a SteamshipError is raised
+        once the others have been attempted."""
         file = self._get_file()
 
         if file is None:
             return False
 
-        deleted = False
-        for tag in file.tags:
-            if tag.kind == self.store_identifier and tag.name == key:
-                tag.delete()
-                deleted = True
-
-        return deleted
+        ids = [tag.id for tag in file.tags if tag.kind == self.store_identifier and tag.name == key]
+        failed = [result for result in Tag.delete_many(self.client, ids) if not result.ok]
+        if failed:
+            raise SteamshipError(
+                message=f"Could not delete {len(failed)} of the {len(ids)} tags holding the key {key!r}.",
+                error=failed[0].error,
+            )
+        return len(ids) > 0
 
     def set(self, key: str, value: Dict[str, Any]):
         """Set the entry (key, value)."""
@@ -0,0 +1,26 @@
+"""Helpers for walking paged list operations."""
+
+from typing import Callable, Iterator, List, Optional, TypeVar
+
+from steamship.base.response import ListResponse
+
+T = TypeVar("T")
+R = TypeVar("R", bound=ListResponse)
+
+
+def iterate_pages(
+    fetch_page: Callable[[Optional[str]], R],
+    page_items: Callable[[R], Optional[List[T]]],
+) -> Iterator[T]:
+    """Lazily yield every item of a paged list operation.
+
+    `fetch_page` is called with the page token of the page to fetch (None for the first page) and `page_items`
+    extracts the items from the returned page. Only one page is held in memory at a time.
+    """
+    page_token = None
+    while True:
+        page = fetch_page(page_token)
+        yield from page_items(page) or []
+        page_token = page.next_page_token
+        if not page_token:
+            return
@@ -0,0 +1,243 @@
+"""Split long text into Blocks annotated with TokenizationTags.
+
+`chunk_text` reads its input incrementally, so it also accepts an open text file or any other iterable of strings,
+and yields Blocks as soon as they are complete. The Blocks can be passed straight to `File.create(blocks=...)`, and
+`index_tags` turns them into Tags for `EmbeddingIndexPluginInstance.insert`.
+"""
+from __future__ import annotations
+
+import re
+from enum import Enum
+from typing import Iterable, Iterator, List, Optional, Pattern, Tuple, Union
+
+from steamship.base.error import SteamshipError
+from steamship.data.block import Block
+from steamship.data.tags.tag import Tag, TokenizationTag
+from steamship.data.tags.tag_constants import TagKind
+
+_PARAGRAPH_SEPARATOR = re.compile(r"\n\s*\n")
+_SENTENCE_SEPARATOR = re.compile(r"(?<=[.!?])\s+")
+_WORD_SEPARATOR = re.compile(r"\s+")
+
+# Key in each TokenizationTag's value holding the offset of its span in the original text.
+SOURCE_OFFSET_KEY = "source_offset"
+
+
+class ChunkStrategy(str, Enum):
+    PARAGRAPH = "paragraph"  # Pack whole paragraphs (separated by blank lines) into Blocks
+    SENTENCE = "sentence"  # Pack whole sentences into Blocks
+    REGEX = "regex"  # Pack the pieces of text between matches of `pattern` into Blocks
+    WINDOW = "window"  # Fixed-size windows of characters, ending at whitespace where possible
+    TOKENS = "tokens"  # Windows of at most `max_tokens` whitespace-separated tokens
+
+
+_UNIT_STRATEGIES = {
+    ChunkStrategy.PARAGRAPH: (_PARAGRAPH_SEPARATOR, "\n\n", TokenizationTag.Type.PARAGRAPH),
+    ChunkStrategy.SENTENCE: (_SENTENCE_SEPARATOR, " ", TokenizationTag.Type.SENTENCE),
+    ChunkStrategy.REGEX: (None, " ", TokenizationTag.Type.SENTENCE),
+}
+
+
+def _pieces(text: Union[str, Iterable[str]]) -> Iterable[str]:
+    return [text] if isinstance(text, str) else text
+
+
+def _cuts(start: int, end: int, max_chars: Optional[int]) -> range:
+    """The offsets at which a unit spanning [start, end) is cut: every 2 * `max_chars` characters, for as long as at
+    least 4 * `max_chars` remain, so that each part but the last is still long enough to be split into windows."""
+    step = 2 * max_chars if max_chars is not None else 0
+    count = (end - start) // step - 1 if step else 0
+    return range(start + step, start + step * count + 1, step or 1) if count > 0 else range(0)
+
+
+def _units(
+    text: Union[str, Iterable[str]],
+    separator: Pattern,
+    max_chars: Optional[int] = None,
+    whitespace_separator: bool = False,
+) -> Iterator[Tuple[int, str]]:
+    """Yield (offset, unit) for each non-blank run of text between `separator` matches.
+
+    With `max_chars`, a unit is cut into parts (see `_cuts`) as soon as enough of it has been read, so the buffered
+    text stays bounded however far the input goes without a separator. If every separator match is whitespace
+    (`whitespace_separator`), each new piece is scanned from the whitespace at the end of the text before it rather
+    than from the last match."""
+    buffer, base = "", 0  # `base` is the offset of buffer[0] in the whole text
+    scan_from = 0  # Any separator match not found yet starts at or after this offset in `buffer`
+    for piece in _pieces(text):
+        buffer += piece
+        position, end = 0, len(buffer)
+        for match in separator.finditer(buffer, scan_from):
+            if match.end() == len(buffer):
+                end = match.start()
+                break  # The separator may continue into the next piece
+            for cut in _cuts(position, match.start(), max_chars):
+                yield base + position, buffer[position:cut]
+                position = cut
+            if buffer[position : match.start()].strip():
+                yield base + position, buffer[position : match.start()]
+            position = match.end()
+        # The rest of the buffer is the start of a unit, of which any parts long enough to cut off are complete.
+        for cut in _cuts(position, end, max_chars):
+            yield base + position, buffer[position:cut]
+            position = cut
+        scan_from = max(len(buffer.rstrip()), position) if whitespace_separator else position
+        buffer = buffer[position:]
+        base += position
+        scan_from -= position
+    if buffer.strip():
+        yield base, buffer
+
+
+def _block(text: str, spans: List[Tuple[int, int, int]], tag_type: TokenizationTag.Type) -> Block:
+    # The fields are known to be valid, so skip pydantic validation, which would dominate the run time.
+    return Block.construct(
+        text=text,
+        tags=[
+            Tag.construct(
+                kind=TagKind.TOKENIZATION,
+                name=tag_type,
+                start_idx=start,
+                end_idx=end,
+                value={SOURCE_OFFSET_KEY: offset},
+            )
+            for start, end, offset in spans
+        ],
+    )
+
+
+def _pack_units(
+    units: Iterator[Tuple[int, str]], max_chars: int, joiner: str, tag_type: TokenizationTag.Type
+) -> Iterator[Block]:
+    """Join consecutive units into Blocks of at most `max_chars`, tagging each unit's span.
+
+    A unit longer than `max_chars` is split into windows of its own."""
+    text, spans = "", []
+    for offset, unit in units:
+        if len(unit) > max_chars:
+            if spans:
+                yield _block(text, spans, tag_type)
+                text, spans = "", []
+            yield from _windows([unit], max_chars, 0, base=offset)
+            continue
+        start = len(text) + len(joiner) if spans else 0
+        if spans and start + len(unit) > max_chars:
+            yield _block(text, spans, tag_type)
+            text, spans, start = "", [], 0
+        text = text + joiner + unit if spans else unit
+        spans.append((start, start + len(unit), offset))
+    if spans:
+        yield _block(text, spans, tag_type)
+
+
+def _windows(
+    text: Union[str, Iterable[str]], max_chars: int, overlap: int, base: int = 0
+) -> Iterator[Block]:
+    """Yield windows of at most `max_chars`, each starting `overlap` characters before the previous one ended.
+
+    A window ends after the last whitespace in its second half, if there is one, to avoid splitting words."""
+    buffer = ""
+    pieces = iter(_pieces(text))
+    exhausted = False
+    while True:
+        while not exhausted and len(buffer) <= max_chars:
+            piece = next(pieces, None)
+            if piece is None:
+                exhausted = True
+            else:
+                buffer += piece
+        if not buffer.strip():
+            return
+        end = min(len(buffer), max_chars)
+        if end < len(buffer):
+            cut = max(
+                buffer.rfind(" ", max_chars // 2, end), buffer.rfind("\n", max_chars // 2, end)
+            )
+            end = cut + 1 if cut > 0 else end
+        yield _block(buffer[:end], [(0, end, base)], TokenizationTag.Type.CHARACTER)
+        if end >= len(buffer) and exhausted:
+            return
+        advance = max(end - overlap, 1)
+        buffer = buffer[advance:]
+        base += advance
+
+
+def _token_windows(
+    text: Union[str, Iterable[str]], max_tokens: int, overlap: int
+) -> Iterator[Block]:
+    window: List[Tuple[int, str]] = []
+    new_words = 0  # Words in `window` not yet part of any yielded Block
+    for word in _units(text, _WORD_SEPARATOR, whitespace_separator=True):
+        window.append(word)
+        new_words += 1
+        if len(window) == max_tokens:
+            yield _token_block(window)
+            window = window[max_tokens - overlap :] if overlap else []
+            new_words = 0
+    if new_words:
+        yield _token_block(window)
+
+
+def _token_block(words: List[Tuple[int, str]]) -> Block:
+    text = " ".join(word for _, word in words)
+    return _block(text, [(0, len(text), words[0][0])], TokenizationTag.Type.WORD)
+
+
+def chunk_text(
+    text: Union[str, Iterable[str]],
+    strategy: ChunkStrategy = ChunkStrategy.PARAGRAPH,
+    max_chars: int = 2000,
+    overlap: int = 0,
+    pattern: Optional[Union[str, Pattern]] = None,
+    max_tokens: int = 256,
+) -> Iterator[Block]:
+    """Split `text` into Blocks using `strategy`.
+
+    Parameters
+    ----------
+    text : Union[str, Iterable[str]]
+        The text, or an iterable of consecutive pieces of it, such as an open text file.
+    strategy : ChunkStrategy
+        How to split the text. Default: paragraphs.
+    max_chars : int
+        The maximum length of a Block for every strategy but `TOKENS`. Default: 2000.
+    overlap : int
+        For `WINDOW`, the number of characters each window repeats from the previous one; for `TOKENS`, the number
+        of tokens. Default: 0.
+    pattern : Optional[Union[str, Pattern]]
+        For `REGEX`, the separator between units.
+    max_tokens : int
+        For `TOKENS`, the maximum number of whitespace-separated tokens per Block. Default: 256.
+
+    The paragraph, sentence and regex strategies keep units whole where they fit, joining them with a blank line or
+    space, and tag each unit's span in its Block. The window and token strategies tag each Block's whole span. Every
+    tag's value records the offset of its span in the original text under `source_offset`.
+    """
+    strategy = ChunkStrategy(strategy)
+    if strategy == ChunkStrategy.WINDOW:
+        if not 0 <= overlap < max_chars:
+            raise SteamshipError(message="`overlap` must be at least 0 and less than `max_chars`.")
+        return _windows(text, max_chars, overlap)
+    if strategy == ChunkStrategy.TOKENS:
+        if not 0 <= overlap < max_tokens:
+            raise SteamshipError(message="`overlap` must be at least 0 and less than `max_tokens`.")
+        return _token_windows(text, max_tokens, overlap)
+
+    separator, joiner, tag_type = _UNIT_STRATEGIES[strategy]
+    if strategy == ChunkStrategy.REGEX:
+        if pattern is None:
+            raise SteamshipError(message="The regex strategy requires a `pattern`.")
+        separator = re.compile(pattern) if isinstance(pattern, str) else pattern
+    units = _units(text, separator, max_chars, whitespace_separator=strategy != ChunkStrategy.REGEX)
+    return _pack_units(units, max_chars, joiner, tag_type)
+
+
+def index_tags(blocks: Iterable[Block], file_id: Optional[str] = None) -> List[Tag]:
+    """Return one Tag per Block, carrying its text, for `EmbeddingIndexPluginInstance.insert`.
+
+    Pass the `file_id` (and use Blocks that have ids, such as those of a created File) to link search results back
+    to the Blocks."""
+    return [
+        Tag(text=block.text, file_id=file_id or block.file_id, block_id=block.id, kind="block")
+        for block in blocks
+    ]
@@ -0,0 +1,157 @@
+"""A compact encoding for batches of embedding vectors.
+
+Vectors sent as JSON float arrays cost about 20 bytes per element and one Python float per element to parse.
+`EncodedVectors` instead carries a whole batch as one base64 string of little-endian float32 or float16 values,
+or of int8 values with a float32 scale per vector. With NumPy installed, `decode_vectors` returns a float32 array
+built directly from the bytes; without it, lists of floats.
+"""
+from __future__ import annotations
+
+import base64
+import struct
+import sys
+from array import array
+from enum import Enum
+from typing import Any, List, Optional, Sequence
+
+from steamship.base.error import SteamshipError
+from steamship.base.model import CamelModel
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_BIG_ENDIAN = sys.byteorder == "big"
+
+
+class VectorEncoding(str, Enum):
+    JSON = "json"  # Lists of floats; the uncompressed fallback
+    FLOAT32 = "float32"  # 4 bytes per element, lossless for float32 embeddings
+    FLOAT16 = "float16"  # 2 bytes per element, about 3 significant digits
+    INT8 = "int8"  # 1 byte per element, scaled per vector so its largest magnitude maps to 127
+
+
+class EncodedVectors(CamelModel):
+    encoding: VectorEncoding
+    count: int  # Number of vectors
+    dimension: int  # Elements per vector
+    data: str  # Base64 of the elements, vector after vector
+    scales: Optional[str] = None  # For INT8: base64 of one little-endian float32 scale per vector
+
+    def decode(self) -> Any:
+        return decode_vectors(self)
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def _float32_bytes(values: Sequence[float]) -> bytes:
+    packed = array("f", values)
+    if _BIG_ENDIAN:
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _float32_values(data: bytes) -> array:
+    values = array("f")
+    values.frombytes(data)
+    if _BIG_ENDIAN:
+        values.byteswap()
+    return values
+
+
+def encode_vectors(
+    vectors: Any, encoding: VectorEncoding = VectorEncoding.FLOAT32
+) -> EncodedVectors:
+    """Encode a list of equal-length vectors, or a 2-D NumPy array, with a binary `encoding`."""
+    encoding = VectorEncoding(encoding)
+    if encoding == VectorEncoding.JSON:
+        raise SteamshipError(
+            message="The JSON form is the plain list of vectors; nothing to encode."
+        )
+    if np is not None:
+        return _encode_numpy(np.asarray(vectors, dtype=np.float32), encoding)
+
+    vectors = [list(vector) for vector in vectors]
+    dimension = len(vectors[0]) if vectors else 0
+    if any(len(vector) != dimension for vector in vectors):
+        raise SteamshipError(message="All vectors must have the same dimension.")
+    flat = [x for vector in vectors for x in vector]
+    scales = None
+    if encoding == VectorEncoding.FLOAT32:
+        data = _float32_bytes(flat)
+    elif encoding == VectorEncoding.FLOAT16:
+        data = struct.pack(f"<{len(flat)}e", *flat)
+    else:
+        vector_scales = [max(map(abs, vector), default=0.0) / 127 or 1.0 for vector in vectors]
+        data = array(
+            "b",
+            (round(x / scale) for vector, scale in zip(vectors, vector_scales) for x in vector),
+        ).tobytes()
+        scales = _b64(_float32_bytes(vector_scales))
+    return EncodedVectors(
+        encoding=encoding, count=len(vectors), dimension=dimension, data=_b64(data), scales=scales
+    )
+
+
+def _encode_numpy(matrix, encoding: VectorEncoding) -> EncodedVectors:
+    if matrix.ndim != 2:
+        matrix = matrix.reshape(len(matrix), -1)
+    scales = None
+    if encoding == VectorEncoding.FLOAT32:
+        data = matrix.astype("<f4").tobytes()
+    elif encoding == VectorEncoding.FLOAT16:
+        data = matrix.astype("<f2").tobytes()
+    else:
+        vector_scales = np.abs(matrix).max(axis=1, initial=0.0) / 127
+        vector_scales[vector_scales == 0] = 1.0
+        data = np.rint(matrix / vector_scales[:, None]).astype(np.int8).tobytes()
+        scales = _b64(vector_scales.astype("<f4").tobytes())
+    count, dimension = matrix.shape
+    return EncodedVectors(
+        encoding=encoding, count=count, dimension=dimension, data=_b64(data), scales=scales
+    )
+
+
+def decode_vectors(encoded: EncodedVectors) -> Any:
+    """Decode `encoded` into a float32 NumPy array of shape (count, dimension), or lists of floats without NumPy."""
+    data = base64.b64decode(encoded.data)
+    scales = base64.b64decode(encoded.scales) if encoded.scales is not None else None
+    count, dimension = encoded.count, encoded.dimension
+    if np is not None:
+        if encoded.encoding == VectorEncoding.FLOAT32:
+            return np.frombuffer(data, dtype="<f4").astype(np.float32).reshape(count, dimension)
+        if encoded.encoding == VectorEncoding.FLOAT16:
+            return np.frombuffer(data, dtype="<f2").astype(np.float32).reshape(count, dimension)
+        if encoded.encoding == VectorEncoding.INT8:
+            matrix = np.frombuffer(data, dtype=np.int8).astype(np.float32).reshape(count, dimension)
+            return matrix * np.frombuffer(scales, dtype="<f4")[:, None]
+        raise SteamshipError(message=f"Cannot decode vectors encoded as {encoded.encoding}.")
+
+    if encoded.encoding == VectorEncoding.FLOAT32:
+        flat = _float32_values(data)
+    elif encoded.encoding == VectorEncoding.FLOAT16:
+        flat = struct.unpack(f"<{count * dimension}e", data)
+    elif encoded.encoding == VectorEncoding.INT8:
+        flat = array("b", data)
+        vector_scales = _float32_values(scales)
+        return [
+            [x * vector_scales[i] for x in flat[i * dimension : (i + 1) * dimension]]
+            for i in range(count)
+        ]
+    else:
+        raise SteamshipError(message=f"Cannot decode vectors encoded as {encoded.encoding}.")
+    return [list(flat[i * dimension : (i + 1) * dimension]) for i in range(count)]
+
+
+def vectors_or_encoded(
+    vectors: Optional[List[List[float]]], encoded: Optional[EncodedVectors]
+) -> Any:
+    """Return the decoded `encoded` vectors if present, else the JSON `vectors` (as an array with NumPy)."""
+    if encoded is not None:
+        return decode_vectors(encoded)
+    if vectors is None:
+        return None
+    return np.asarray(vectors, dtype=np.float32) if np is not None else vectors
@@ -1,9 +1,11 @@
 import base64
 import json
 
+import pytest
+
 from steamship.base.model import CamelModel
 from steamship.plugin.outputs.raw_data_plugin_output import RawDataPluginOutput
-from steamship.utils.binary_utils import flexi_create
+from steamship.utils.binary_utils import flexi_create, write_chunks
 
 
 def test_dump_string():
@@ -46,3 +48,32 @@ def test_dump_raw_data():
     obj2 = RawDataPluginOutput(json=person)
     json_str2 = _base64_decode(obj2.data)
     assert json_str2 == '{"name": "Ted"}'
+
+
+def test_write_chunks(tmp_path):
+    path = write_chunks(iter([b"ab", b"cd"]), tmp_path / "out")
+    assert path.read_bytes() == b"abcd"
+
+    def failing_chunks():
+        yield b"ef"
+        raise RuntimeError("connection dropped")
+
+    with pytest.raises(RuntimeError):
+        write_chunks(failing_chunks(), path)
+    # The previous content is left untouched and no partial file remains
+    assert path.read_bytes() == b"abcd"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_write_chunks_concurrently(tmp_path):
+    path = tmp_path / "out"
+
+    # Interleave two downloads of the same path: each writes its own temporary file.
+    def chunks_then_other_download():
+        yield b"a"
+        write_chunks(iter([b"b"]), path)
+        yield b"a"
+
+    write_chunks(chunks_then_other_download(), path)
+    assert path.read_bytes() == b"aa"
+    assert list(tmp_path.iterdir()) == [path]
@@ -0,0 +1,247 @@
+import time
+
+import pytest
+from steamship_tests.utils.client import get_offline_client
+
+from steamship import Block, File, SteamshipError, Tag
+from steamship.base import ObjectCache, SearchCache, Task, TaskState
+from steamship.base.client import Client
+from steamship.data.embeddings import EmbeddingIndex, IndexInsertResponse, QueryResult, QueryResults
+from steamship.data.file import _cache_file, _project_files
+from steamship.data.search import Hit
+
+
+def test_object_cache_lru_byte_budget():
+    cache = ObjectCache(max_bytes=10)
+    cache.put("file", "a", b"12345")
+    cache.put("file", "b", b"12345")
+    assert cache.get("file", "a") == b"12345"  # Now most recently used
+    cache.put("file", "c", b"123")
+
+    assert cache.get("file", "b") is None
+    assert cache.get("file", "c") == b"123"
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions) == (2, 1, 1)
+    assert stats.memory_bytes == 8
+    assert stats.entries == 2
+    assert stats.hit_rate == pytest.approx(2 / 3)
+
+    cache.invalidate("file", "a")
+    assert cache.get("file", "a") is None
+
+
+def test_object_cache_disk_tier(tmp_path):
+    cache = ObjectCache(max_bytes=6, disk_path=tmp_path)
+    cache.put("file", "a", b"12345")
+    cache.put("file", "b", b"12345")  # Evicts "a" from memory
+    assert cache.stats().disk_bytes == 10  # Both written through
+
+    assert cache.get("file", "a") == b"12345"
+    assert cache.stats().disk_hits == 1
+    assert cache.get("file", "b") == b"12345"  # Evicted from memory when "a" came back
+    assert cache.stats().disk_hits == 2
+    assert len(list(tmp_path.iterdir())) == 2  # Reads keep the files
+
+    cache.invalidate("file", "a")
+    assert cache.stats().disk_bytes == 5
+    cache.clear()
+    assert cache.get("file", "b") is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_object_cache_shared_disk_tier(tmp_path, monkeypatch):
+    first = ObjectCache(disk_path=tmp_path, max_age_s=10)
+    second = ObjectCache(disk_path=tmp_path, max_age_s=10)
+    first.put("file", "a", b"one")
+    assert second.get("file", "a") == b"one"
+    assert first.get("file", "a") == b"one"  # Still on disk after the other instance read it
+
+    second.put("file", "b", b"two")
+    assert first.get("file", "b") == b"two"
+    assert ObjectCache(disk_path=tmp_path).stats().disk_bytes == 6
+
+    now = time.time()
+    monkeypatch.setattr("steamship.base.cache.time.time", lambda: now + 11)
+    second.put("file", "c", b"three")  # Prunes the files that have expired
+    assert ObjectCache(disk_path=tmp_path).get("file", "a") is None
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_object_cache_max_age(monkeypatch):
+    cache = ObjectCache(max_age_s=10)
+    cache.put("block", "a", b"{}")
+    now = time.time()
+    monkeypatch.setattr("steamship.base.cache.time.time", lambda: now + 11)
+    assert cache.get("block", "a") is None
+
+    cache = ObjectCache()  # Entries expire by default
+    cache.put("block", "a", b"{}")
+    monkeypatch.setattr("steamship.base.cache.time.time", lambda: now + 120)
+    assert cache.get("block", "a") is None
+
+
+def test_file_get_served_from_cache():
+    cache = ObjectCache()
+    client = get_offline_client(object_cache=cache)
+    file = File(
+        client=client,
+        id="f1",
+        blocks=[Block(id="b1", text="hi", tags=[Tag(id="t1", kind="k")])],
+        tags=[],
+    )
+    cache.put_model("file", file)
+
+    cached = File.get(client, _id="f1")
+    assert cached == file
+    assert cached is not file
+    assert cached.client.object_cache is cache
+    assert cached.blocks[0].tags[0].kind == "k"
+
+    # A File with a projected-away part is not written through.
+    _project_files([file], include_blocks=False)
+    _cache_file(file)
+    assert cache.get("file", "f1") is None
+
+
+def test_file_with_filtered_tags_is_not_cached(monkeypatch):
+    cache = ObjectCache()
+    client = get_offline_client(object_cache=cache)
+
+    def post(self, operation, payload=None, expect=None, **kwargs):
+        if operation == "block/create":
+            return Block(client=self, id="b2", file_id="f1", text="new")
+        tags = [Tag(id="t1", kind="a"), Tag(id="t2", kind="b")]
+        return File(client=self, id="f1", blocks=[Block(id="b1", tags=tags)], tags=tags)
+
+    monkeypatch.setattr(Client, "post", post)
+    file = File.get(client, _id="f1", tag_kinds=["a"])
+    assert [tag.kind for tag in file.tags] == ["a"] and [t.kind for t in file.blocks[0].tags] == [
+        "a"
+    ]
+    assert not file.is_loaded("tags") and not file.blocks[0].is_loaded("tags")
+
+    file.append_block(text="new")
+    assert cache.get("file", "f1") is None
+    assert [tag.kind for tag in file.load_tags()] == ["a", "b"] and file.is_loaded("tags")
+
+
+def test_mutations_invalidate_after_the_request(monkeypatch):
+    cache = ObjectCache()
+    client = get_offline_client(object_cache=cache)
+    stale = File(client=client, id="f1", blocks=[Block(client=client, id="b1", file_id="f1")])
+
+    def post(self, operation, payload=None, expect=None, **kwargs):
+        # A read racing the mutation caches the File and Block as they were before it.
+        cache.put_model("file", stale)
+        cache.put_model("block", stale.blocks[0])
+        if operation == "block/create":
+            raise SteamshipError(message="unavailable", status_code=503)
+        return expect(id="x", file_id="f1", block_id="b1")
+
+    monkeypatch.setattr(Client, "post", post)
+    mutations = [
+        lambda: Tag.create(client, file_id="f1", block_id="b1", kind="k"),
+        lambda: Tag(client=client, id="t1", file_id="f1", block_id="b1").delete(),
+        lambda: stale.blocks[0].delete(),
+        stale.delete,
+    ]
+    for mutate in mutations:
+        mutate()
+        assert cache.get("file", "f1") is None and cache.get("block", "b1") is None
+
+    with pytest.raises(SteamshipError):
+        Block.create(client, file_id="f1", text="new")
+    assert cache.get("file", "f1") is None  # Even a failed request may have changed the File
+
+
+def test_plugin_tasks_invalidate_the_file(monkeypatch):
+    cache = ObjectCache()
+    client = get_offline_client(object_cache=cache)
+    file = File(client=client, id="f1", blocks=[Block(client=client, id="b1", file_id="f1")])
+
+    def post(self, operation, payload=None, expect=None, **kwargs):
+        state = TaskState.succeeded if operation == "task/status" else TaskState.running
+        return Task(client=self, task_id="t", state=state)
+
+    monkeypatch.setattr(Client, "post", post)
+    for run in (file.tag, file.blockify):
+        cache.put_model("file", file)
+        cache.put_model("block", file.blocks[0])
+        task = run("plugin")
+        assert cache.get("file", "f1") is None and cache.get("block", "b1") is None
+
+        # A read while the plugin runs caches the File again, until the task is seen to complete.
+        cache.put_model("file", file)
+        task.wait(retry_delay_s=0)
+        assert cache.get("file", "f1") is None
+
+
+def test_search_cache_invalidation_is_shared_on_disk(tmp_path):
+    first, second = SearchCache(disk_path=tmp_path), SearchCache(disk_path=tmp_path)
+    key = first.search_key("index", "query", 3, True)
+    assert second.search_key("index", "query", 3, True) == key
+    assert first.search_key("index", "query", 4, True) != key
+    assert first.search_key("other", "query", 3, True) != key
+
+    first.put("search", key, b"results")
+    assert second.get("search", key) == b"results"  # Written through, not only on eviction
+
+    second.invalidate_index("index")
+    assert first.search_key("index", "query", 3, True) != key
+
+    memory_only = SearchCache()
+    key = memory_only.search_key("index", ["a", "b"], 1, False)
+    assert memory_only.search_key("index", ["a", "b"], 1, False) == key
+    memory_only.invalidate_index("index")
+    assert memory_only.search_key("index", ["a", "b"], 1, False) != key
+
+
+def test_index_search_served_from_cache(monkeypatch):
+    requests = []
+
+    def post(self, operation, payload=None, expect=None, **kwargs):
+        requests.append(operation)
+        if operation == "embedding-index/search":
+            output = QueryResults(items=[QueryResult(value=Hit(id="1", value="hit"), score=0.5)])
+            return Task(client=self, state=TaskState.succeeded, output=output, expect=expect)
+        return IndexInsertResponse(item_ids=[])
+
+    monkeypatch.setattr(Client, "post", post)
+    cache = SearchCache()
+    client = get_offline_client(search_cache=cache)
+    index = EmbeddingIndex(client=client, id="index")
+
+    assert index.search("query", k=2).output.items[0].value.value == "hit"
+    cached = index.search("query", k=2)
+    assert cached.state == TaskState.succeeded
+    assert cached.output.items[0].score == 0.5
+    index.search("query", k=3)
+    assert requests.count("embedding-index/search") == 2
+
+    index.insert("new item")
+    index.search("query", k=2)
+    assert requests.count("embedding-index/search") == 3
+    assert cache.stats().hit_rate == pytest.approx(1 / 4)
+
+
+def test_index_search_cache_dropped_when_embed_completes(monkeypatch):
+    requests = []
+
+    def post(self, operation, payload=None, expect=None, **kwargs):
+        requests.append(operation)
+        if operation == "embedding-index/search":
+            output = QueryResults(items=[QueryResult(value=Hit(id="1", value="hit"), score=0.5)])
+            return Task(client=self, state=TaskState.succeeded, output=output, expect=expect)
+        state = TaskState.succeeded if operation == "task/status" else TaskState.running
+        return Task(client=self, task_id="embed", state=state)
+
+    monkeypatch.setattr(Client, "post", post)
+    index = EmbeddingIndex(client=get_offline_client(search_cache=SearchCache()), id="index")
+    task = index.embed()
+    index.search("query")  # Answered from the old embeddings while the embed runs
+    index.search("query")
+    assert requests.count("embedding-index/search") == 1
+
+    task.wait(retry_delay_s=0)
+    index.search("query")
+    assert requests.count("embedding-index/search") == 2
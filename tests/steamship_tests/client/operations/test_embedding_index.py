@@ -145,6 +145,27 @@ def test_insert_many():
         assert "_block_id" not in item0.value
 
 
+def test_search_many():
+    steamship = get_steamship_client()
+    with random_index(steamship, _TEST_EMBEDDER) as index:
+        index.insert([Tag(text="Pizza", kind="food"), Tag(text="Rocket Ship", kind="vehicle")])
+
+        queries = ["Rocket Ship", "Pizza", "Rocket Ship"]
+        results = index.search_many(queries, k=1, batch_size=1)
+        assert [result.items[0].tag.text for result in results] == queries
+
+
+def test_search_without_waiting():
+    steamship = get_steamship_client()
+    with random_index(steamship, _TEST_EMBEDDER) as index:
+        index.insert([Tag(text="Pizza", kind="food"), Tag(text="Rocket Ship", kind="vehicle")])
+
+        tasks = [index.search(query, k=1, wait=False) for query in ("Pizza", "Rocket Ship")]
+        for task in tasks:
+            task.wait()
+        assert [task.output.items[0].tag.text for task in tasks] == ["Pizza", "Rocket Ship"]
+
+
 def test_duplicate_inserts():
     steamship = get_steamship_client()
     with random_index(steamship, _TEST_EMBEDDER) as index:
@@ -102,3 +102,21 @@ def test_query(client: Steamship):
 
     a.delete()
     b.delete()
+
+
+@pytest.mark.usefixtures("client")
+def test_tag_create_and_delete_many(client: Steamship):
+    a = File.create(client, content="A", mime_type=MimeTypes.MKD)
+
+    tags = [Tag(file_id=a.id, kind="bulk", name=str(i)) for i in range(5)]
+    results = Tag.create_many(client, tags + [Tag(file_id="missing-file", kind="bulk")])
+    assert [result.index for result in results] == list(range(6))
+    assert all(result.ok for result in results[:5])
+    assert not results[5].ok
+    assert [result.output.name for result in results[:5]] == [str(i) for i in range(5)]
+
+    ids = [result.output.id for result in results[:5]]
+    assert all(result.ok for result in Tag.delete_many(client, ids))
+    assert Tag.query(client, tag_filter_query=f'file_id "{a.id}"').tags == []
+
+    a.delete()
@@ -0,0 +1,81 @@
+import random
+
+from steamship import Block, File, Tag
+from steamship.data.tags import TagSpanIndex
+
+
+def _ids(tags):
+    return sorted(tag.value["i"] for tag in tags)
+
+
+def test_span_index_from_block():
+    block = Block(
+        id="b1",
+        text="Jane Doe visited Paris.",
+        tags=[
+            Tag(kind="ner", name="person", start_idx=0, end_idx=8, value={"i": 0}),
+            Tag(kind="ner", name="location", start_idx=17, end_idx=22, value={"i": 1}),
+            Tag(kind="token", name="word", start_idx=0, end_idx=4, value={"i": 2}),
+            Tag(kind="token", name="word", start_idx=5, end_idx=8, value={"i": 3}),
+            Tag(kind="sentence", start_idx=0, end_idx=23, value={"i": 4}),
+            Tag(kind="marker", start_idx=9, end_idx=9, value={"i": 5}),
+            Tag(kind="document", value={"i": 6}),  # Not a span; not indexed
+        ],
+    )
+    index = TagSpanIndex.from_block(block)
+    assert len(index) == 6
+
+    assert _ids(index.overlapping(3, 6)) == [0, 2, 3, 4]
+    assert _ids(index.overlapping(3, 6, kind="token")) == [2, 3]
+    assert _ids(index.overlapping(0, 23, kind="ner", name="location")) == [1]
+    assert _ids(index.overlapping(8, 17)) == [4, 5]
+    assert _ids(index.containing(5, 8)) == [0, 3, 4]
+    assert _ids(index.within(0, 8)) == [0, 2, 3]
+    assert _ids(index.at(4)) == [0, 4]
+    assert _ids(index.at(9)) == [4, 5]
+    assert index.overlapping(3, 6, block_id="other") == []
+
+
+def test_span_index_from_file_groups_by_block():
+    file = File(
+        blocks=[
+            Block(id="b1", tags=[Tag(kind="k", start_idx=0, end_idx=5, value={"i": 0})]),
+            Block(id="b2", tags=[Tag(kind="k", start_idx=0, end_idx=5, value={"i": 1})]),
+        ]
+    )
+    index = TagSpanIndex.from_file(file)
+    assert _ids(index.at(2)) == [0, 1]
+    assert _ids(index.at(2, block_id="b2")) == [1]
+
+
+def test_span_index_matches_linear_scan():
+    rng = random.Random(0)
+    tags = []
+    for i in range(2000):
+        start = rng.randint(0, 1000)
+        tags.append(
+            Tag(
+                kind=rng.choice(["a", "b"]),
+                start_idx=start,
+                end_idx=start + rng.choice([0, 1, 5, 50]),
+                value={"i": i},
+            )
+        )
+    index = TagSpanIndex(tags)
+
+    for _ in range(200):
+        start = rng.randint(0, 1000)
+        end = start + rng.choice([1, 10, 100])
+        kind = rng.choice([None, "a"])
+        candidates = [tag for tag in tags if kind is None or tag.kind == kind]
+
+        expected = [
+            tag
+            for tag in candidates
+            if (tag.start_idx < end and tag.end_idx > start)
+            or (tag.start_idx == tag.end_idx and start <= tag.start_idx < end)
+        ]
+        assert _ids(index.overlapping(start, end, kind=kind)) == _ids(expected)
+
+        expected = [tag for tag in candidates if tag.start_idx <= start and tag.end_idx >= end]
+        assert _ids(index.containing(start, end, kind=kind)) == _ids(expected)
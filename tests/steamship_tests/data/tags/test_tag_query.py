@@ -0,0 +1,162 @@
+import pytest
+
+from steamship import Block, File, SteamshipError, Tag
+from steamship.data.tags import TagQueryIndex, TagTable
+from steamship.data.tags.tag_query import parse_query
+from steamship.plugin.outputs.block_and_tag_plugin_output import BlockAndTagPluginOutput
+
+
+def _files():
+    return [
+        File(
+            id="f1",
+            tags=[Tag(kind="doc", name="title", value={"lang": "en"})],
+            blocks=[
+                Block(
+                    id="b1",
+                    text="Ada Lovelace met Charles Babbage.",
+                    tags=[
+                        Tag(kind="ner", name="person", start_idx=0, end_idx=12),
+                        Tag(kind="ner", name="person", start_idx=17, end_idx=32),
+                        Tag(kind="pos", name="noun", start_idx=0, end_idx=3),
+                        Tag(kind="sentiment", value={"score": 0.9, "meta": {"model": "a"}}),
+                    ],
+                ),
+                Block(id="b2", text="Nothing here.", tags=[]),
+            ],
+        ),
+        File(
+            id="f2",
+            blocks=[
+                Block(
+                    id="b3",
+                    text="London",
+                    tags=[
+                        Tag(kind="ner", name="location", start_idx=0, end_idx=6),
+                        Tag(kind="sentiment", value={"score": 0.2, "positive": False}),
+                    ],
+                )
+            ],
+        ),
+    ]
+
+
+def _names(tags):
+    return [(tag.kind, tag.name) for tag in tags]
+
+
+def test_parse_query():
+    assert parse_query("all") == ("all",)
+    assert parse_query('kind "ner" AND name "person"') == (
+        "and",
+        (("eq", "kind", "ner"), ("eq", "name", "person")),
+    )
+    assert parse_query('value("a.b") >= 1.5') == ("value", "a.b", ">=", 1.5)
+    assert parse_query('value("a") exists') == ("value", "a", "exists", None)
+    assert parse_query('blocktag and overlaps { kind "pos" }') == (
+        "and",
+        (("blocktag",), ("overlaps", ("eq", "kind", "pos"))),
+    )
+
+    for bad in ['kind "a" and name "b" or name "c"', "kind 3", "nonsense", '(kind "a"', "kind"]:
+        with pytest.raises(SteamshipError):
+            parse_query(bad)
+
+
+def test_query_predicates():
+    index = TagQueryIndex.from_files(_files())
+    assert len(index) == 7
+
+    assert _names(index.query_tags('kind "ner"').tags) == [
+        ("ner", "person"),
+        ("ner", "person"),
+        ("ner", "location"),
+    ]
+    assert _names(index.query_tags("filetag").tags) == [("doc", "title")]
+    assert len(index.query_tags("blocktag").tags) == 6
+    assert len(index.query_tags('value("score") > 0.5').tags) == 1
+    assert len(index.query_tags('value("score") exists').tags) == 2
+    assert len(index.query_tags('value("meta.model") = "a"').tags) == 1
+    assert len(index.query_tags('value("positive") = false').tags) == 1
+    assert len(index.query_tags('value("lang") > 1').tags) == 0
+    assert len(index.query_tags('kind "pos" or name "location"').tags) == 2
+    assert len(index.query_tags('block_id "b3" and (kind "ner" or kind "pos")').tags) == 1
+
+
+def test_query_relations():
+    index = TagQueryIndex.from_files(_files())
+
+    overlapping = index.query_tags('kind "ner" and overlaps { kind "pos" }').tags
+    assert [(tag.start_idx, tag.end_idx) for tag in overlapping] == [(0, 12)]
+    # The partner Tag must be a different Tag from the one being matched.
+    assert len(index.query_tags('kind "pos" and samespan { kind "pos" }').tags) == 0
+    assert len(index.query_tags('kind "ner" and sameblock { name "person" }').tags) == 2
+    assert _names(index.query_tags('filetag and samefile { kind "sentiment" }').tags) == [
+        ("doc", "title")
+    ]
+
+
+def test_query_blocks_and_files():
+    index = TagQueryIndex.from_files(_files())
+
+    assert [block.id for block in index.query_blocks('kind "ner"').blocks] == ["b1", "b3"]
+    assert [block.id for block in index.query_blocks("all").blocks] == ["b1", "b2", "b3"]
+    assert [file.id for file in index.query_files('name "location"').files] == ["f2"]
+    assert [file.id for file in index.query_files('kind "doc"').files] == ["f1"]
+    assert [file.id for file in index.query_files("all").files] == ["f1", "f2"]
+
+
+def test_query_tag_table():
+    tags = [
+        Tag(file_id="f", block_id="b", kind="ner", name="person", start_idx=0, end_idx=4),
+        Tag(file_id="f", block_id="b", kind="pos", name="noun", start_idx=2, end_idx=6),
+        Tag(file_id="f", kind="doc", value={"n": 3}),
+    ]
+    index = TagQueryIndex()
+    index.add_tag_table(TagTable.from_tags(tags))
+
+    assert index.query_tags('kind "ner" and overlaps { kind "pos" }').tags == [tags[0]]
+    assert index.query_tags('filetag and value("n") <= 3').tags == [tags[2]]
+
+
+def test_query_tag_table_by_block_index():
+    file = File(
+        blocks=[
+            Block(
+                text="Ada Lovelace",
+                tags=[
+                    Tag(kind="ner", name="person", start_idx=0, end_idx=12),
+                    Tag(kind="pos", name="noun", start_idx=4, end_idx=12),
+                ],
+            ),
+            Block(text="London", tags=[Tag(kind="pos", name="noun", start_idx=0, end_idx=6)]),
+        ],
+        tags=[Tag(kind="doc")],
+    )
+    output = BlockAndTagPluginOutput(
+        file=File(blocks=[Block(text=block.text) for block in file.blocks]),
+        tag_table=TagTable.from_file(file),
+    )
+    index = TagQueryIndex()
+    index.add_tag_table(output.tag_table)
+
+    assert [tag.kind for tag in index.query_tags("blocktag").tags] == ["ner", "pos", "pos"]
+    assert [tag.kind for tag in index.query_tags("filetag").tags] == ["doc"]
+    assert [tag.kind for tag in index.query_tags('overlaps { kind "ner" }').tags] == ["pos"]
+    assert [tag.kind for tag in index.query_tags('sameblock { kind "pos" }').tags] == ["ner"]
+    assert index.query_tags('block_id "0"').tags == []
+
+
+def test_query_blocks_without_ids():
+    file = File(
+        blocks=[
+            Block(text="Ada", tags=[Tag(kind="ner", name="person", start_idx=0, end_idx=3)]),
+            Block(text="Bob", tags=[Tag(kind="pos", name="noun", start_idx=0, end_idx=3)]),
+        ]
+    )
+    index = TagQueryIndex.from_files([file])
+
+    # Tags of two different Blocks that were never created are not in the same block.
+    assert index.query_tags('sameblock { kind "pos" }').tags == []
+    assert index.query_tags('overlaps { kind "pos" }').tags == []
+    assert [tag.kind for tag in index.query_tags("blocktag").tags] == ["ner", "pos"]
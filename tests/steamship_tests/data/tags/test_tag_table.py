@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from steamship import Block, File, SteamshipError, Tag
+from steamship.data.tags import TagKind, TagTable
+from steamship.invocable import InvocableResponse
+from steamship.plugin.outputs.block_and_tag_plugin_output import BlockAndTagPluginOutput
+
+
+def _tags():
+    return [
+        Tag(id="t1", file_id="f", block_id="b1", kind="ner", name="person", start_idx=0, end_idx=4),
+        Tag(kind="ner", name="location", start_idx=5, end_idx=10, value={"score": 0.5}),
+        Tag(kind=TagKind.DOCUMENT, name="paragraph", text="Hello"),
+        Tag(kind="ner", name="person", start_idx=12, end_idx=15, block_id="b2"),
+    ]
+
+
+def test_tag_table_round_trip():
+    tags = _tags()
+    table = TagTable.from_tags(tags)
+    assert len(table) == 4
+    assert table.to_tags() == tags
+    assert table[1].value == {"score": 0.5}
+    assert table.column("start_idx") == [0, 5, None, 12]
+
+
+def test_tag_table_filter_and_group():
+    table = TagTable.from_tags(_tags())
+
+    assert table.rows_where(kind="ner") == [0, 1, 3]
+    assert table.rows_where(kind="ner", name="person") == [0, 3]
+    assert table.rows_where(kind=TagKind.DOCUMENT) == [2]
+    assert table.rows_where(kind="missing") == []
+
+    people = table.filter(kind="ner", name="person")
+    assert [tag.block_id for tag in people] == ["b1", "b2"]
+
+    groups = table.group_by("name")
+    assert sorted(groups) == ["location", "paragraph", "person"]
+    assert len(groups["person"]) == 2
+    assert table.counts("kind") == {"ner": 3, "document": 1}
+
+
+def test_tag_table_from_file_and_plugin_output():
+    file = File(
+        blocks=[Block(text="A", tags=[Tag(kind="a")]), Block(text="B", tags=[Tag(kind="b")])],
+        tags=[Tag(kind="file")],
+    )
+    table = TagTable.from_file(file)
+    assert [table.block_index(row) for row in range(len(table))] == [-1, 0, 1]
+
+    output = BlockAndTagPluginOutput(
+        file=File(blocks=[Block(text="A"), Block(text="B")]), tag_table=table
+    )
+    serialized = json.loads(json.dumps(InvocableResponse(data=output).dict(by_alias=True)))
+    file_json = serialized["data"]["file"]
+    assert [tag["kind"] for tag in file_json["tags"]] == ["file"]
+    assert [tag["kind"] for tag in file_json["blocks"][0]["tags"]] == ["a"]
+    assert [tag["kind"] for tag in file_json["blocks"][1]["tags"]] == ["b"]
+    assert "tagTable" not in serialized["data"]
+
+
+def test_plugin_output_json_round_trip():
+    table = TagTable.from_tags([Tag(kind="file")])
+    table.extend([Tag(kind="a")], block_index=1)
+    output = BlockAndTagPluginOutput(
+        file=File(blocks=[Block(text="A"), Block(text="B")]), tag_table=table
+    )
+
+    parsed = BlockAndTagPluginOutput.parse_raw(output.json(by_alias=True))
+    assert [tag.kind for tag in parsed.file.tags] == ["file"]
+    assert [tag.kind for tag in parsed.file.blocks[1].tags] == ["a"]
+    assert parsed.file.blocks[0].tags == []
+
+    table.extend([Tag(kind="b")], block_index=2)
+    with pytest.raises(SteamshipError):
+        output.json()
@@ -1,7 +1,8 @@
 import pytest
+import requests
 from steamship_tests import TEST_ASSETS_PATH
 
-from steamship import MimeTypes
+from steamship import MimeTypes, SteamshipError
 from steamship.client import Steamship
 from steamship.data.block import Block
 from steamship.data.file import File
@@ -124,6 +125,18 @@ def test_append_block_content_image(client: Steamship):
     raw_content = file.blocks[0].raw()
     assert raw_content == palm_bytes
 
+    progress = []
+    chunks = list(
+        file.blocks[0].raw_stream(
+            chunk_size=1024, on_progress=lambda received, total: progress.append(received)
+        )
+    )
+    assert b"".join(chunks) == palm_bytes
+    assert all(len(chunk) <= 1024 for chunk in chunks)
+    assert progress[-1] == len(palm_bytes)
+
+    assert b"".join(file.blocks[0].raw_stream(offset=10, length=100)) == palm_bytes[10:110]
+
 
 @pytest.mark.usefixtures("client")
 def test_create_with_tags(client: Steamship):
@@ -152,3 +165,43 @@ def test_append_is_present(client: Steamship):
     assert len(my_file.blocks) == 0
     my_file.append_block(text="first")
     assert len(my_file.blocks) == 1
+
+
+class _FakeStreamResponse:
+    ok = True
+    status_code = 200
+    headers = {"Content-Length": "10"}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def iter_content(self, chunk_size):
+        content = b"0123456789"
+        return (content[i : i + chunk_size] for i in range(0, len(content), chunk_size))
+
+
+def test_raw_stream_without_client(monkeypatch):
+    requested = []
+
+    def get(url, headers=None, **kwargs):
+        requested.append((url, headers))
+        return _FakeStreamResponse()
+
+    monkeypatch.setattr(requests, "get", get)
+    block = Block(content_url="https://example.com/content")
+    assert block.client is None
+
+    assert list(block.raw_stream(chunk_size=4)) == [b"0123", b"4567", b"89"]
+    # The server ignored the Range header, so the range is cut out on the client.
+    assert b"".join(block.raw_stream(offset=2, length=3)) == b"234"
+    assert requested[1] == ("https://example.com/content", {"Range": "bytes=2-4"})
+
+
+def test_stream_validates_arguments_eagerly(offline_client):
+    with pytest.raises(SteamshipError):
+        offline_client.stream()  # Raised without iterating
+    with pytest.raises(SteamshipError):
+        offline_client.stream("block/raw", url="https://example.com/content")
@@ -0,0 +1,474 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from requests import Session
+from steamship_tests.utils.client import get_offline_client
+
+from steamship import SteamshipError, Tag
+from steamship.base import SearchCache, Task, TaskState
+from steamship.base.client import Client
+from steamship.data.embeddings import (
+    DEFAULT_INSERT_BATCH_ITEMS,
+    EmbeddedItem,
+    EmbeddingIndex,
+    IndexEmbedTask,
+    IndexInsertResponse,
+    IndexItemId,
+    ListItemsResponse,
+    QueryResult,
+    QueryResults,
+)
+from steamship.data.plugin.index_plugin_instance import (
+    CONTENT_HASH_KEY,
+    EmbeddingIndexPluginInstance,
+    SearchResult,
+    SearchResults,
+    content_hash,
+)
+from steamship.data.search import Hit
+
+
+@pytest.fixture()
+def fake_engine(monkeypatch, offline_client):
+    """Record the requests made through the client and answer item inserts with sequential ids."""
+    requests = []
+    lock = threading.Lock()
+
+    def post(self, operation, payload=None, expect=None, **kwargs):
+        with lock:
+            requests.append((operation, payload))
+        if operation == "embedding-index/item/create":
+            if any(item.value == "fail" for item in payload.items):
+                raise SteamshipError(message="insert failed")
+            return IndexInsertResponse(
+                item_ids=[IndexItemId(id=item.value) for item in payload.items]
+            )
+        if operation == "embedding-index/embed":
+            return Task(client=self, task_id="embed", state=TaskState.running)
+        return None
+
+    monkeypatch.setattr(Client, "post", post)
+    return EmbeddingIndex(client=offline_client, id="index"), requests
+
+
+def test_insert_many_batches(fake_engine):
+    index, requests = fake_engine
+    items = [str(i) for i in range(10)] + [EmbeddedItem(value="10", metadata={"a": 1})]
+
+    response = index.insert_many(items, batch_size=3, concurrency=4)
+
+    assert [item_id.id for item_id in response.item_ids] == [str(i) for i in range(11)]
+    inserts = [payload for op, payload in requests if op == "embedding-index/item/create"]
+    assert sorted(len(payload.items) for payload in inserts) == [2, 3, 3, 3]
+    assert not any(payload.reindex for payload in inserts)
+    assert [op for op, _ in requests].count("embedding-index/embed") == 1
+    last = next(p for p in inserts if p.items[-1].value == "10")
+    assert last.items[-1].metadata == '{"a": 1}'
+
+
+def test_insert_many_single_batch_and_bytes(fake_engine):
+    index, requests = fake_engine
+    index.insert_many(["a", "b"])
+    assert len(requests) == 1 and requests[0][1].reindex
+
+    requests.clear()
+    index.insert_many(["x" * 100] * 4, max_batch_bytes=450, reindex=False)
+    assert [len(payload.items) for _, payload in requests] == [2, 2]
+
+
+def test_insert_many_failure(fake_engine):
+    index, requests = fake_engine
+    with pytest.raises(
+        SteamshipError, match=r"1 of 2 insert batches failed: the items at \[2, 3\)"
+    ):
+        index.insert_many(["a", "b", "fail"], batch_size=2)
+
+    inserts = [p for op, p in requests if op == "embedding-index/item/create"]
+    assert len(inserts) == 2  # Not retried
+    # The batches that were inserted are embedded
+    assert [op for op, _ in requests][-1] == "embedding-index/embed"
+    assert index.pending_items == 0
+
+
+def test_bulk_inserter(fake_engine):
+    index, requests = fake_engine
+    with index.bulk_inserter(max_items=2, flush_interval_s=None) as inserter:
+        for i in range(5):
+            inserter.insert(str(i))
+        assert len(requests) == 2  # Two full batches so far
+    assert [item_id.id for item_id in inserter.item_ids] == ["0", "1", "2", "3", "4"]
+    assert [op for op, _ in requests] == ["embedding-index/item/create"] * 3 + [
+        "embedding-index/embed"
+    ]
+
+
+def test_bulk_inserter_flushes_on_time(fake_engine):
+    index, requests = fake_engine
+    inserter = index.bulk_inserter(flush_interval_s=0.1, reindex=False)
+    inserter.insert("a")
+    deadline = time.time() + 5
+    while not requests and time.time() < deadline:
+        time.sleep(0.05)
+    assert len(requests) == 1
+    inserter.close()
+    assert [item_id.id for item_id in inserter.item_ids] == ["a"]
+
+
+def test_bulk_inserter_flushes_on_close(fake_engine):
+    index, requests = fake_engine
+    inserter = index.bulk_inserter(flush_interval_s=None)
+    inserter.insert("a")
+    inserter.insert(EmbeddedItem(value="b", metadata={"n": 1}))
+    assert requests == []
+
+    inserter.close()
+    assert [op for op, _ in requests] == ["embedding-index/item/create", "embedding-index/embed"]
+    assert requests[0][1].items[1].metadata == '{"n": 1}'
+
+    requests.clear()
+    with index.bulk_inserter(flush_interval_s=None):
+        pass
+    assert requests == []  # Nothing to insert or embed
+
+
+def test_bulk_inserter_propagates_errors(fake_engine):
+    index, requests = fake_engine
+    inserter = index.bulk_inserter(flush_interval_s=0.1)
+    inserter.insert("fail")
+    deadline = time.time() + 5
+    while not requests and time.time() < deadline:
+        time.sleep(0.05)
+    # The failed timed flush is raised by the next call, which waits for the flush to finish
+    with pytest.raises(SteamshipError, match="insert failed"):
+        inserter.insert("a")
+    inserter.insert("a")  # The error is raised once, without buffering the item it interrupted
+    inserter.close()
+    assert [item_id.id for item_id in inserter.item_ids] == ["a"]
+
+    requests.clear()
+    with pytest.raises(SteamshipError):
+        with index.bulk_inserter(max_items=10, flush_interval_s=None) as failing:
+            failing.insert("fail")
+    assert [op for op, _ in requests] == ["embedding-index/item/create"]  # Not embedded
+
+    with pytest.raises(ValueError):
+        with index.bulk_inserter(flush_interval_s=None) as aborted:
+            aborted.insert("b")
+            raise ValueError()
+    assert len(requests) == 1  # An exception in the block discards the buffer
+
+
+def test_search_many(fake_engine, monkeypatch):
+    index, requests = fake_engine
+    fail = {"once": True}
+
+    def post(self, operation, payload=None, expect=None, **kwargs):
+        requests.append((operation, payload))
+        if "broken" in payload.queries and fail["once"]:
+            fail["once"] = False
+            raise SteamshipError(message="search failed")
+        hits = [
+            QueryResult(
+                value=Hit(value=f"{query}-hit", query=query, metadata='{"_file_id": "f"}'), score=1
+            )
+            for query in payload.queries
+            if query != "nothing"
+        ]
+        return Task(client=self, state=TaskState.succeeded, output=QueryResults(items=hits))
+
+    monkeypatch.setattr(Client, "post", post)
+    plugin = EmbeddingIndexPluginInstance(client=index.client, index=index)
+
+    queries = ["a", "b", "a", "nothing", "broken", "c"]
+    results = plugin.search_many(queries, k=1, batch_size=2, concurrency=2)
+
+    assert sorted(len(payload.queries) for _, payload in requests) == [1, 2, 2, 2]  # One retry
+    assert [[item.tag.text for item in result.items] for result in results] == [
+        ["a-hit"],
+        ["b-hit"],
+        ["a-hit"],
+        [],
+        ["broken-hit"],
+        ["c-hit"],
+    ]
+    assert results[0].items[0].tag.file_id == "f"
+    assert results[0] is not results[2]  # Repeated queries get their own copies
+    with pytest.raises(SteamshipError):
+        plugin.search_many(["a", " "])
+
+
+def test_search_many_without_query_echo(fake_engine, monkeypatch):
+    index, requests = fake_engine
+
+    def post(self, operation, payload=None, expect=None, **kwargs):
+        requests.append((operation, payload))
+        hits = [
+            QueryResult(value=Hit(value=f"{query}-{rank}"), score=1)
+            for query in payload.queries
+            for rank in range(payload.k)
+        ]
+        if "short" in payload.queries:
+            hits.pop()
+        return Task(client=self, state=TaskState.succeeded, output=QueryResults(items=hits))
+
+    monkeypatch.setattr(Client, "post", post)
+    plugin = EmbeddingIndexPluginInstance(client=index.client, index=index)
+
+    results = plugin.search_many(["a", "b", "a"], k=2)
+    assert [[item.tag.text for item in result.items] for result in results] == [
+        ["a-0", "a-1"],
+        ["b-0", "b-1"],
+        ["a-0", "a-1"],
+    ]
+    assert [[r.tag.text for r in result.items] for result in plugin.search_many(["a", "b"])] == [
+        ["a-0"],
+        ["b-0"],
+    ]
+    with pytest.raises(SteamshipError, match="cannot be matched"):
+        plugin.search_many(["a", "short"], k=2, retries=0)
+
+
+class _FakeResponse:
+    ok = True
+    status_code = 200
+    headers = {"Content-Type": "application/json"}
+
+    def __init__(self, body):
+        self.body = body
+
+    def json(self):
+        return self.body
+
+
+def test_search_without_waiting(fake_engine, monkeypatch):
+    index, _ = fake_engine
+    monkeypatch.undo()  # Send requests through the real Client.post
+    statuses = []
+
+    def session_post(self, url, json=None, **kwargs):
+        if url.endswith("embedding-index/search"):
+            return _FakeResponse({"status": {"taskId": json["query"], "state": "running"}})
+        statuses.append(json["taskId"])
+        hit = {"value": json["taskId"], "metadata": '{"_file_id": "f", "lang": "en"}'}
+        return _FakeResponse(
+            {
+                "status": {"taskId": json["taskId"], "state": "succeeded"},
+                "data": {"items": [{"value": hit, "score": 0.5}]},
+            }
+        )
+
+    monkeypatch.setattr(Session, "post", session_post)
+    plugin = EmbeddingIndexPluginInstance(client=index.client, index=index)
+
+    task = plugin.search("first", k=1, wait=False)
+    assert task.state == TaskState.running and not statuses
+    task.wait(retry_delay_s=0)
+    assert isinstance(task.output, SearchResults)
+    tag = task.output.items[0].tag
+    assert (tag.text, tag.file_id, tag.value) == ("first", "f", {"lang": "en"})
+
+    async def fan_out():
+        tasks = [plugin.search(query, wait=False) for query in ("a", "b")]
+        await asyncio.gather(*(task.wait_async(retry_delay_s=0) for task in tasks))
+        return tasks
+
+    tasks = asyncio.run(fan_out())
+    assert [task.output.items[0].tag.text for task in tasks] == ["a", "b"]
+    assert sorted(statuses) == ["a", "b", "first"]
+
+
+def test_search_without_waiting_matches_waiting(fake_engine, monkeypatch):
+    index, _ = fake_engine
+    monkeypatch.undo()
+    monkeypatch.setattr(time, "sleep", lambda _: None)
+    items = [
+        {
+            "value": {
+                "id": "i1",
+                "value": "one",
+                "externalType": "k",
+                "metadata": '{"_file_id": "f"}',
+            },
+            "score": 0.9,
+        },
+        {
+            "value": {"id": "i2", "value": "two", "metadata": '{"_block_id": "b", "n": 1}'},
+            "score": 0.5,
+        },
+    ]
+
+    def session_post(self, url, json=None, **kwargs):
+        if url.endswith("embedding-index/search"):
+            return _FakeResponse({"status": {"taskId": "search", "state": "running"}})
+        return _FakeResponse(
+            {"status": {"taskId": "search", "state": "succeeded"}, "data": {"items": items}}
+        )
+
+    monkeypatch.setattr(Session, "post", session_post)
+    plugin = EmbeddingIndexPluginInstance(client=index.client, index=index)
+
+    waited = plugin.search("query", k=2)
+    later = plugin.search("query", k=2, wait=False)
+    later.wait(retry_delay_s=0)
+    assert isinstance(waited.output, SearchResults) and isinstance(later.output, SearchResults)
+    assert later.output.dict() == waited.output.dict()
+    assert waited.output.items[1].tag.value == {"n": 1}
+
+
+def test_insert_dedupe(fake_engine, monkeypatch):
+    index, requests = fake_engine
+    indexed = Tag(text="old  text", kind="block")
+    listed = EmbeddedItem(metadata=json.dumps({CONTENT_HASH_KEY: content_hash(indexed)}))
+    engine_post = Client.post
+
+    def post(self, operation, payload=None, expect=None, **kwargs):
+        if operation == "embedding-index/item/list":
+            requests.append((operation, payload))
+            return ListItemsResponse(items=[listed])
+        return engine_post(self, operation, payload, expect=expect, **kwargs)
+
+    monkeypatch.setattr(Client, "post", post)
+    plugin = EmbeddingIndexPluginInstance(client=index.client, index=index)
+
+    tags = [
+        Tag(text="old text", kind="block"),
+        Tag(text="new", file_id="f1", value={"n": 1}),
+        Tag(text=" new\n", file_id="f2", value={"n": 1}),
+    ]
+    originals = [tag.copy(deep=True) for tag in tags]
+    result = plugin.insert(tags, dedupe=True)
+    assert (result.inserted, result.skipped) == (1, 2)
+    assert result.item_ids == [None, "new", None]
+    assert tags == originals  # The caller's tags are not modified
+    listed_request = next(p for op, p in requests if op == "embedding-index/item/list")
+    assert listed_request.include_embeddings is False
+    inserted = [p for op, p in requests if op == "embedding-index/item/create"]
+    assert [(item.value, item.file_id) for item in inserted[0].items] == [("new", "f1")]
+    metadata = json.loads(inserted[0].items[0].metadata)
+    assert (metadata["_file_id"], metadata["n"], CONTENT_HASH_KEY in metadata) == ("f1", 1, True)
+
+    requests.clear()
+    assert plugin.insert(Tag(text="new", block_id="b", value={"n": 1}), dedupe=True).skipped == 1
+    assert requests == []  # Neither listed again nor inserted; dedupe ignores the File and Block
+
+    with pytest.raises(SteamshipError):
+        plugin.insert(Tag(text="fail"), dedupe=True)
+    assert plugin.insert(Tag(text="other"), dedupe=False).inserted == 1
+    assert (
+        plugin.insert(Tag(text="other"), dedupe=True).inserted == 1
+    )  # Not recorded without dedupe
+
+    hit = Hit(value="new", metadata=inserted[0].items[0].metadata)
+    assert SearchResult.from_query_result(QueryResult(value=hit)).tag.value == {"n": 1}
+
+
+def test_insert_dedupe_failure_releases_only_unwritten_content(fake_engine, monkeypatch):
+    index, requests = fake_engine
+    engine_post = Client.post
+
+    def post(self, operation, payload=None, expect=None, **kwargs):
+        if operation == "embedding-index/item/list":
+            return ListItemsResponse(items=[])
+        return engine_post(self, operation, payload, expect=expect, **kwargs)
+
+    monkeypatch.setattr(Client, "post", post)
+    plugin = EmbeddingIndexPluginInstance(client=index.client, index=index)
+
+    # The first batch is inserted and the second one fails
+    tags = [Tag(text=f"t{i}") for i in range(DEFAULT_INSERT_BATCH_ITEMS)] + [Tag(text="fail")]
+    with pytest.raises(
+        SteamshipError, match=r"1 of 2 insert batches failed: the items at \[500, 501\)"
+    ):
+        plugin.insert(tags, dedupe=True)
+
+    assert plugin.insert(Tag(text="t0"), dedupe=True).skipped == 1
+    with pytest.raises(SteamshipError, match="insert failed"):
+        plugin.insert(Tag(text="fail"), dedupe=True)  # Not skipped: its hash was released
+
+
+def test_incremental_embed(fake_engine):
+    index, requests = fake_engine
+    index.insert_many(["a", "b"], reindex=False)
+    index.insert_many(["c"], reindex=False)
+    assert index.pending_items == 3
+
+    task = index.embed(incremental=True)
+    embeds = [payload for op, payload in requests if op == "embedding-index/embed"]
+    assert embeds[-1].item_ids == ["a", "b", "c"]
+    assert (task.submitted_items, task.embedded_items, task.state) == (3, 3, TaskState.running)
+    task.update(Task(state=TaskState.succeeded))  # As a refresh does
+    assert (task.submitted_items, task.state) == (3, TaskState.succeeded)
+    assert index.pending_items == 0
+
+    requests.clear()
+    task = index.embed(incremental=True)
+    assert requests == [] and task.state == TaskState.succeeded and task.submitted_items == 0
+
+    index.insert_many(["d"])  # Embedded on insert
+    index.insert_many(["e"], reindex=False)
+    task = index.embed(incremental=True)
+    assert [p.item_ids for op, p in requests if op == "embedding-index/embed"] == [["e"]]
+    assert (task.submitted_items, task.embedded_items) == (1, 5)
+    assert index.embed().submitted_items == 0
+
+
+def test_incremental_embed_forgets_embedded_ids(fake_engine):
+    index, requests = fake_engine
+    index.insert_many(["a", "b"], reindex=False)
+    first = index.embed(incremental=True)
+    assert isinstance(first, IndexEmbedTask) and first.client is not None
+    assert first.dict()["submitted_items"] == 2
+
+    index.insert_many(["c"], reindex=False)
+    second = index.embed(incremental=True)
+    assert requests[-1][1].item_ids == ["c"]
+    assert len(index._item_ids) == 3  # Kept until an embed is known to have succeeded
+
+    second.update(Task(state=TaskState.succeeded))
+    assert index._item_ids == [] and index.pending_items == 0
+    first.update(Task(state=TaskState.succeeded))  # Finishing after a later embed changes nothing
+    assert index._item_ids == []
+
+    index.insert_many(["d", "e"], reindex=False)
+    assert index.pending_items == 2
+    task = index.embed(incremental=True)
+    assert requests[-1][1].item_ids == ["d", "e"]
+    assert (task.submitted_items, task.embedded_items) == (2, 5)
+    index.insert_many(["f"])  # Embedded on insert, along with everything before it
+    assert index._item_ids == [] and index.embed(incremental=True).submitted_items == 0
+
+
+def test_search_without_waiting_uses_the_search_cache(fake_engine, monkeypatch):
+    index, _ = fake_engine
+    monkeypatch.undo()
+    searches = []
+
+    def session_post(self, url, json=None, **kwargs):
+        if url.endswith("embedding-index/search"):
+            searches.append(json["query"])
+            return _FakeResponse({"status": {"taskId": "search", "state": "running"}})
+        hit = {"value": "one", "metadata": '{"_file_id": "f"}'}
+        return _FakeResponse(
+            {
+                "status": {"taskId": "search", "state": "succeeded"},
+                "data": {"items": [{"value": hit, "score": 0.5}]},
+            }
+        )
+
+    monkeypatch.setattr(Session, "post", session_post)
+    client = get_offline_client(search_cache=SearchCache())
+    plugin = EmbeddingIndexPluginInstance(
+        client=client, index=EmbeddingIndex(client=client, id="i")
+    )
+
+    first = plugin.search("query", k=1, wait=False)
+    assert first.state == TaskState.running  # Not waited for, though the client caches searches
+    first.wait(retry_delay_s=0)
+    assert first.output.items[0].tag.file_id == "f"
+
+    cached = plugin.search("query", k=1, wait=False)
+    assert cached.state == TaskState.succeeded and searches == ["query"]
+    assert cached.output.dict() == first.output.dict()
@@ -1,5 +1,6 @@
 import io
 import json
+import time
 from datetime import datetime
 
 import pytest
@@ -8,6 +9,8 @@ from steamship_tests import PLUGINS_PATH
 from steamship_tests.utils.deployables import deploy_plugin
 
 from steamship import MimeTypes, SteamshipError
+from steamship.base.client import Client
+from steamship.base.request import SortOrder
 from steamship.client import Steamship
 from steamship.data.block import Block
 from steamship.data.file import File
@@ -212,6 +215,28 @@ def test_file_list(client: Steamship):
     c.delete()
 
 
+def test_file_list_paging(client: Steamship):
+    created = [
+        File.create(client=client, blocks=[Block(text=str(i))], tags=[Tag(kind="FileTag")])
+        for i in range(5)
+    ]
+
+    first_page = File.list(client=client, page_size=2, sort_order=SortOrder.ASC)
+    assert [file.id for file in first_page.files] == [file.id for file in created[:2]]
+    assert first_page.next_page_token is not None
+
+    files = list(File.iter(client, page_size=2, sort_order=SortOrder.ASC))
+    assert [file.id for file in files] == [file.id for file in created]
+    assert files[0].blocks[0].text == "0"
+
+    headers = list(File.iter(client, page_size=2, headers_only=True))
+    assert {file.id for file in headers} == {file.id for file in created}
+    assert all(file.blocks == [] and file.tags == [] for file in headers)
+
+    for file in created:
+        file.delete()
+
+
 def test_file_refresh(client: Steamship):
     blockifier_path = PLUGINS_PATH / "blockifiers" / "blockifier.py"
     with deploy_plugin(client, blockifier_path, "blockifier") as (
@@ -245,6 +270,47 @@ def test_append_indices(client: Steamship):
     assert file.blocks[1].text == "second"
 
 
+@pytest.mark.usefixtures("client")
+def test_append_blocks(client: Steamship):
+    file = File.create(client, blocks=[Block(text="first")])
+
+    results = file.append_blocks(
+        [
+            "second",
+            Block(text="third", tags=[Tag(kind="speaker", name="bot")]),
+            {"content": "fourth", "mime_type": MimeTypes.TXT},
+        ]
+    )
+    assert all(result.ok for result in results)
+    assert [block.index_in_file for block in file.blocks] == [0, 1, 2, 3]
+    assert file.blocks[1].text == "second"
+    assert file.blocks[2].tags[0].name == "bot"
+
+    file.refresh()
+    assert [block.text for block in file.blocks[:3]] == ["first", "second", "third"]
+    assert [block.index_in_file for block in file.blocks] == [0, 1, 2, 3]
+    file.delete()
+
+
+def test_append_blocks_concurrently(monkeypatch):
+    in_flight, peak = [], []
+    next_index = iter(range(1, 100))
+
+    def create(client, file_id=None, text=None, **kwargs):
+        in_flight.append(text)
+        peak.append(len(in_flight))
+        time.sleep(0.01)
+        in_flight.remove(text)
+        return Block(id=text, file_id=file_id, text=text, index=next(next_index))
+
+    monkeypatch.setattr(Block, "create", staticmethod(create))
+    file = File(id="f", blocks=[Block(id="first", index=0)])
+    results = file.append_blocks([str(i) for i in range(8)], concurrency=4)
+
+    assert all(result.ok for result in results) and max(peak) > 1
+    assert [block.index_in_file for block in file.blocks] == list(range(9))
+
+
 @pytest.mark.usefixtures("client")
 def test_file_upload_content_with_tags_and_tag_value(client: Steamship):
     """This test created to test client-side that the multipart file content + tag parsing works correctly"""
@@ -284,3 +350,188 @@ def test_file_create_from_resp(client: Steamship):
         )
 
     assert "data does not match expected" in str(err)
+
+
+@pytest.mark.usefixtures("client")
+def test_file_create_many(client: Steamship, tmp_path):
+    path = tmp_path / "c.txt"
+    path.write_text("C")
+    progress = []
+
+    results = File.create_many(
+        client,
+        [
+            "A",
+            b"B",
+            path,
+            [Block(text="D")],
+            {"content": "E", "handle": "e", "mime_type": MimeTypes.MKD},
+            {"content": "E again", "handle": "e"},
+        ],
+        concurrency=4,
+        on_progress=lambda finished, total: progress.append((finished, total)),
+        skip_existing_handles=True,
+    )
+
+    assert [result.index for result in results] == list(range(6))
+    assert all(result.ok for result in results)
+    assert results[0].output.raw().decode("utf-8") == "A"
+    assert results[1].output.raw().decode("utf-8") == "B"
+    assert results[2].output.raw().decode("utf-8") == "C"
+    assert results[3].output.blocks[0].text == "D"
+    assert results[4].output.handle == "e"
+    assert results[5].output.id == results[4].output.id
+    assert progress[-1] == (6, 6)
+
+    # Handles that already exist are fetched rather than re-created
+    again = File.create_many(client, [{"content": "E", "handle": "e"}], skip_existing_handles=True)
+    assert again[0].output.id == results[4].output.id
+
+    failed = File.create_many(client, [{"content": "A", "blocks": []}], retries=0)
+    assert not failed[0].ok
+    assert isinstance(failed[0].error, SteamshipError)
+
+
+def test_file_create_many_retries_only_transient_errors(monkeypatch, tmp_path):
+    monkeypatch.setattr(time, "sleep", lambda _: None)
+    attempts = []
+
+    def create(client, content=None, handle=None, **kwargs):
+        attempts.append(content)
+        if content == b"flaky" and attempts.count(content) == 1:
+            raise SteamshipError(message="unavailable", status_code=503)
+        if content == b"rejected":
+            raise SteamshipError(message="bad mime type", status_code=400)
+        return File(id=f"id-{len(attempts)}", handle=handle)
+
+    def get(client, handle=None, **kwargs):
+        if handle == "broken":
+            raise SteamshipError(message="unavailable", status_code=503)
+        raise SteamshipError(message="not found", status_code=404)
+
+    monkeypatch.setattr(File, "create", staticmethod(create))
+    monkeypatch.setattr(File, "get", staticmethod(get))
+    progress = []
+    results = File.create_many(
+        None,
+        [
+            {"content": b"flaky", "handle": "a"},
+            {"content": b"rejected"},
+            {"path": tmp_path / "missing.txt"},
+            {"content": b"again", "handle": "a"},
+            {"content": b"x", "handle": "broken"},
+        ],
+        concurrency=1,
+        retries=3,
+        skip_existing_handles=True,
+        on_progress=lambda finished, total: progress.append((finished, total)),
+    )
+
+    assert [result.ok for result in results] == [True, False, False, True, False]
+    assert attempts == [b"flaky", b"flaky", b"rejected"]  # Neither error nor missing path retried
+    assert isinstance(results[2].error, FileNotFoundError)
+    assert results[3].output.id == results[0].output.id
+    assert results[4].error.status_code == 503  # Not treated as an absent handle
+    assert progress == [(2, 5), (3, 5), (4, 5), (5, 5)]
+
+
+@pytest.mark.usefixtures("client")
+def test_file_raw_stream(client: Steamship, tmp_path):
+    content = "0123456789" * 1000
+    file = File.create(client=client, content=content, mime_type=MimeTypes.TXT)
+
+    chunks = list(file.raw_stream(chunk_size=1000))
+    assert all(len(chunk) <= 1000 for chunk in chunks)
+    assert b"".join(chunks).decode("utf-8") == content
+
+    assert b"".join(file.raw_stream(offset=5, length=20)).decode("utf-8") == content[5:25]
+
+    path = file.raw_to_path(tmp_path / "raw.txt")
+    assert path.read_text() == content
+    file.delete()
+
+
+@pytest.mark.usefixtures("client")
+def test_file_get_projection(client: Steamship):
+    file = File.create(
+        client=client,
+        blocks=[Block(text="A", tags=[Tag(kind="BlockTag"), Tag(kind="Other")])],
+        tags=[Tag(kind="FileTag"), Tag(kind="Other")],
+    )
+
+    headers = File.get(client, _id=file.id, include_blocks=False, include_tags=False)
+    assert headers.id == file.id
+    assert (headers.blocks, headers.tags) == ([], [])
+    assert not headers.is_loaded("blocks") and not headers.is_loaded("tags")
+    # Omitted parts are fetched explicitly
+    assert [tag.kind for tag in headers.load_tags()] == ["FileTag", "Other"]
+    assert headers.load_blocks()[0].text == "A"
+
+    no_tags = File.get(client, _id=file.id, include_tags=False)
+    assert no_tags.blocks[0].text == "A"
+    assert no_tags.blocks[0].tags == []
+    assert sorted(tag.kind for tag in no_tags.blocks[0].load_tags()) == ["BlockTag", "Other"]
+
+    some_tags = File.get(client, _id=file.id, tag_kinds=["Other"])
+    assert [tag.kind for tag in some_tags.tags] == ["Other"]
+    assert [tag.kind for tag in some_tags.blocks[0].tags] == ["Other"]
+
+    queried = File.query(client, f'file_id "{file.id}"', include_blocks=False).files
+    assert not queried[0].is_loaded("blocks")
+
+    # Refreshing without blocks leaves the loaded blocks as they are.
+    block = file.blocks[0]
+    file.refresh(include_blocks=False)
+    assert file.blocks[0] is block
+    assert file.blocks[0].text == "A"
+    file.delete()
+
+
+def test_file_projection_keeps_fields(monkeypatch, offline_client):
+    requests_made = []
+
+    def post(self, operation, payload=None, expect=None, **kwargs):
+        requests_made.append((operation, payload.include_blocks, payload.include_tags))
+        return File(
+            client=self,
+            id="f",
+            blocks=[Block(id="b", text="A", tags=[Tag(kind="BlockTag")])],
+            tags=[Tag(kind="FileTag")],
+        )
+
+    monkeypatch.setattr(Client, "post", post)
+    headers = File.get(offline_client, _id="f", include_blocks=False, include_tags=False)
+    assert json.loads(headers.json())["blocks"] == [] and headers.dict()["tags"] == []
+    assert hasattr(headers, "blocks") and len(requests_made) == 1  # No lazy fetch
+    assert File(id="f").tags == [] and File(id="f").is_loaded("tags")
+
+    blocks = headers.load_blocks()
+    assert [block.text for block in blocks] == ["A"] and headers.is_loaded("blocks")
+    assert requests_made[-1] == ("file/get", None, False)  # The file's tags are still omitted
+    assert blocks[0].tags == [] and not blocks[0].is_loaded("tags")
+    assert [tag.kind for tag in headers.load_tags()] == ["FileTag"]
+    headers.load_tags()
+    assert len(requests_made) == 3
+
+
+@pytest.mark.usefixtures("client")
+def test_file_refresh_delta_and_watch(client: Steamship):
+    file = File.create(client, blocks=[Block(text="A")], tags=[Tag(kind="FileTag")])
+    file.refresh()
+    block = file.blocks[0]
+    assert not file.refresh_delta()
+
+    Tag.create(client, file_id=file.id, block_id=block.id, kind="Late", start_idx=0, end_idx=1)
+    delta = file.refresh_delta(tag_kinds=["Late"])
+    assert [tag.kind for tag in delta.added_tags] == ["Late"]
+    assert delta.removed_tags == []  # The FileTag is outside the requested kinds
+    assert file.blocks[0] is block
+    assert sorted(tag.kind for tag in file.tags) == ["FileTag"]
+
+    file.append_block(text="B")
+    deltas = file.watch(poll_interval_s=0.1, timeout_s=5)
+    # The client-side File already holds the appended block, so only a new tag shows up as a change.
+    Tag.create(client, file_id=file.id, kind="Watched")
+    delta = next(deltas)
+    assert [tag.kind for tag in delta.added_tags] == ["Watched"]
+    file.delete()
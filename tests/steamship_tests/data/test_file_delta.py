@@ -0,0 +1,59 @@
+from steamship import Block, File, Tag
+from steamship.data.file import _project_files
+
+
+def _file(*blocks: Block, tags=None) -> File:
+    return File(id="f", blocks=list(blocks), tags=tags or [])
+
+
+def test_file_merge_in_place():
+    file = _file(
+        Block(id="b1", text="one", tags=[Tag(id="t2", kind="a", start_idx=0, end_idx=3)]),
+        Block(id="b2", text="two"),
+        tags=[Tag(id="t1", kind="a", name="x"), Tag(id="t3", kind="a")],
+    )
+    block, kept = file.blocks[0], file.tags[0]
+
+    delta = file.merge(
+        _file(
+            Block(
+                id="b1",
+                text="one",
+                tags=[
+                    Tag(id="t2", kind="a", start_idx=0, end_idx=2),
+                    Tag(id="t4", kind="b"),
+                ],
+            ),
+            Block(id="b3", text="three"),
+            tags=[Tag(id="t1", kind="a", name="x")],
+        )
+    )
+
+    assert [b.id for b in delta.added_blocks] == ["b3"]
+    assert [b.id for b in delta.removed_blocks] == ["b2"]
+    assert delta.changed_blocks == []
+    assert [t.id for t in delta.added_tags] == ["t4"]
+    assert [t.id for t in delta.changed_tags] == ["t2"]
+    assert [t.id for t in delta.removed_tags] == ["t3"]
+
+    # Unchanged and changed objects keep their identity
+    assert file.blocks[0] is block
+    assert file.tags[0] is kept
+    assert block.tags[0].end_idx == 2
+    assert [b.id for b in file.blocks] == ["b1", "b3"]
+
+    assert not file.merge(file.copy(deep=True))
+
+
+def test_file_merge_respects_projection():
+    file = _file(
+        Block(id="b1", text="one", tags=[Tag(id="t1", kind="a")]), tags=[Tag(id="t2", kind="b")]
+    )
+    block = file.blocks[0]
+
+    headers = File(id="f")
+    _project_files([headers], include_blocks=False)
+    delta = file.merge(headers, tag_kinds=["a"])
+    assert not delta
+    assert file.blocks[0] is block
+    assert [t.id for t in file.tags] == ["t2"]
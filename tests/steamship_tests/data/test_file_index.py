@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+
+from steamship import Block, File
+from steamship.base import Task, TaskState
+from steamship.data.embeddings import EmbeddedItem, ListItemsResponse
+from steamship.data.plugin.index_plugin_instance import InsertResult
+
+
+class _FakeIndexPluginInstance:
+    def __init__(self, indexed_block_ids=(), fail_on=None):
+        self.inserted = []
+        self.embeds = 0
+        self.fail_on = fail_on
+        # An item of another file, which must not count as indexed for this one
+        self.items = [EmbeddedItem(file_id="other", block_id="b2")] + [
+            EmbeddedItem(file_id="f", metadata=f'{{"_block_id": "{bid}"}}')
+            for bid in indexed_block_ids
+        ]
+        self.index = SimpleNamespace(list_items=self.list_items, embed=self.embed)
+
+    def list_items(self, file_id=None, include_embeddings=None):
+        assert include_embeddings is False
+        return ListItemsResponse(items=[item for item in self.items if item.file_id == file_id])
+
+    def embed(self):
+        self.embeds += 1
+        return Task(state=TaskState.succeeded)
+
+    def insert(self, tags, dedupe=False, reindex=True):
+        assert not reindex  # Embedded once, after every chunk
+        if self.fail_on in [tag.block_id for tag in tags]:
+            raise ValueError("insert failed")
+        self.inserted.append([tag.block_id for tag in tags])
+        return InsertResult(inserted=len(tags))
+
+
+def _file(n: int) -> File:
+    return File(id="f", blocks=[Block(id=f"b{i}", text="x" * 10) for i in range(n)])
+
+
+def test_file_index_chunks():
+    index = _FakeIndexPluginInstance()
+    result = _file(7).index(index, max_chunk_blocks=3, max_chunk_bytes=1000, concurrency=2)
+
+    assert result.ok
+    assert result.indexed_blocks == 7
+    assert [chunk.block_count for chunk in result.chunks] == [3, 3, 1]
+    assert [chunk.first_block for chunk in result.chunks] == [0, 3, 6]
+    assert sorted(b for chunk in index.inserted for b in chunk) == [f"b{i}" for i in range(7)]
+    assert index.embeds == 1 and result.embed_task.state == TaskState.succeeded
+
+    # The byte bound applies as well
+    result = _file(5).index(_FakeIndexPluginInstance(), max_chunk_bytes=25)
+    assert [chunk.text_bytes for chunk in result.chunks] == [20, 20, 10]
+
+
+def test_file_index_skip_and_failures():
+    index = _FakeIndexPluginInstance(indexed_block_ids=["b0", "b1"], fail_on="b4")
+    result = _file(6).index(index, max_chunk_blocks=2, skip_indexed=True)
+
+    assert result.skipped_blocks == 2
+    assert not result.ok
+    assert [chunk.error for chunk in result.chunks] == [None, "insert failed"]
+    assert result.indexed_blocks == 2
+    assert index.inserted == [["b2", "b3"]]
+    assert index.embeds == 1  # The chunk that was inserted is embedded
+
+    index = _FakeIndexPluginInstance(indexed_block_ids=["b0", "b1"])
+    result = _file(2).index(index, skip_indexed=True)
+    assert (result.skipped_blocks, result.embed_task, index.embeds) == (2, None, 0)
+
+
+class _DedupingIndexPluginInstance(_FakeIndexPluginInstance):
+    def insert(self, tags, dedupe=False, reindex=True):
+        super().insert(tags, dedupe=dedupe, reindex=reindex)
+        skipped = sum(tag.block_id in ("b1", "b2") for tag in tags) if dedupe else 0
+        return InsertResult(inserted=len(tags) - skipped, skipped=skipped)
+
+
+def test_file_index_dedupe():
+    index = _DedupingIndexPluginInstance(indexed_block_ids=["b0"])
+    result = _file(4).index(index, max_chunk_blocks=2, skip_indexed=True, dedupe=True)
+
+    assert result.ok
+    assert (result.indexed_blocks, result.skipped_blocks) == (1, 3)
+    assert [chunk.skipped_blocks for chunk in result.chunks] == [2, 0]
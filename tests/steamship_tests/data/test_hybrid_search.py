@@ -0,0 +1,128 @@
+import json
+
+import pytest
+
+from steamship import SteamshipError, Tag
+from steamship.base import Task, TaskState
+from steamship.base.client import Client
+from steamship.data.embeddings import (
+    EmbeddedItem,
+    EmbeddingIndex,
+    IndexInsertResponse,
+    IndexItemId,
+    ListItemsResponse,
+    QueryResult,
+    QueryResults,
+)
+from steamship.data.hybrid_search import BM25Index, FusionMethod, HybridSearch, tokenize
+from steamship.data.plugin.index_plugin_instance import EmbeddingIndexPluginInstance
+from steamship.data.search import Hit
+
+_TEXTS = [
+    "Crimson widget with a steel frame",
+    "Red gadget, model AB-1234",
+    "Blue widget",
+    "Green widget for the garden",
+]
+
+# The ranking the fake vector search returns for every query: close in meaning, but missing the SKU.
+_VECTOR_RANKING = [("Crimson widget with a steel frame", 0.9), ("Blue widget", 0.8)]
+
+
+@pytest.fixture()
+def plugin(monkeypatch, offline_client):
+    requests = []
+
+    def post(self, operation, payload=None, expect=None, **kwargs):
+        requests.append((operation, payload))
+        if operation == "embedding-index/item/create":
+            return IndexInsertResponse(
+                item_ids=[IndexItemId(id=item.value) for item in payload.items]
+            )
+        if operation == "embedding-index/item/list":
+            assert payload.include_embeddings is False  # Only the values are indexed
+            return ListItemsResponse(
+                items=[
+                    EmbeddedItem(id=text, value=text, metadata=json.dumps({"_file_id": "f"}))
+                    for text in _TEXTS
+                ]
+            )
+        if operation == "embedding-index/search":
+            hits = [
+                QueryResult(
+                    value=Hit(id=text, value=text, metadata='{"_file_id": "f"}'), score=score
+                )
+                for text, score in _VECTOR_RANKING[: payload.k]
+            ]
+            return Task(client=self, state=TaskState.succeeded, output=QueryResults(items=hits))
+        return None
+
+    monkeypatch.setattr(Client, "post", post)
+    index = EmbeddingIndex(client=offline_client, id="index")
+    return EmbeddingIndexPluginInstance(client=offline_client, index=index), requests
+
+
+def test_bm25_ranks_exact_terms():
+    assert tokenize("Model AB-1234, ÉTÉ") == ["model", "ab", "1234", "été"]
+    index = BM25Index()
+    for i, text in enumerate(_TEXTS):
+        index.add(str(i), text)
+    index.add("0", "ignored: keys already indexed are kept")
+    assert len(index) == 4 and "3" in index
+
+    assert [key for key, _ in index.search("ab-1234")] == ["1"]
+    assert [key for key, _ in index.search("widget", k=3)] == ["2", "3", "0"]  # Shortest first
+    # "widget" is in most texts, so it only adds to texts matching "garden" or "red"
+    ranked = index.search("widget garden red", k=3)
+    assert [key for key, _ in ranked] == ["3", "1"]
+    assert ranked[0][1] > index.search("garden")[0][1]
+    assert index.search("nothing matches") == []
+
+
+@pytest.mark.parametrize("fusion", [FusionMethod.RRF, FusionMethod.WEIGHTED])
+def test_hybrid_finds_keyword_matches(plugin, fusion):
+    plugin, requests = plugin
+    hybrid = HybridSearch(plugin, fusion=fusion).load()
+
+    results = hybrid.search("AB-1234", k=2).items
+    assert requests[-1][1].k == 8  # Over-fetched
+    assert {result.tag.text for result in results} == {
+        "Red gadget, model AB-1234",
+        "Crimson widget with a steel frame",
+    }
+    assert all(result.tag.file_id == "f" and result.tag.value == {} for result in results)
+    assert results[0].score >= results[1].score
+
+    vector_only = HybridSearch(plugin, fusion=fusion, vector_weight=1.0).load()
+    assert [r.tag.text for r in vector_only.search("AB-1234", k=2).items] == [
+        text for text, _ in _VECTOR_RANKING
+    ]
+    with pytest.raises(SteamshipError):
+        hybrid.search(" ")
+    with pytest.raises(SteamshipError):
+        HybridSearch(plugin, vector_weight=2)
+
+
+def test_hybrid_insert_indexes_keywords(plugin):
+    plugin, _ = plugin
+    hybrid = HybridSearch(plugin, vector_weight=0.3)
+    result = hybrid.insert(
+        [
+            Tag(text="Part XZ-99", kind="sku", file_id="f2", value={"color": "red"}),
+            Tag(text="Plain"),
+        ],
+        dedupe=True,
+    )
+    assert result.item_ids == ["Part XZ-99", "Plain"]
+
+    skipped = hybrid.insert(Tag(text="Part XZ-99", kind="sku", value={"color": "red"}), dedupe=True)
+    assert (skipped.inserted, skipped.item_ids) == (0, [None])
+
+    tag = hybrid.search("xz-99", k=1).items[0].tag
+    assert (tag.id, tag.text, tag.kind, tag.file_id, tag.value) == (
+        "Part XZ-99",
+        "Part XZ-99",
+        "sku",
+        "f2",
+        {"color": "red"},
+    )
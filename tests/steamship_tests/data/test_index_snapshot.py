@@ -0,0 +1,109 @@
+import math
+
+import pytest
+
+from steamship import SteamshipError
+from steamship.base.client import Client
+from steamship.data.embeddings import EmbeddedItem, EmbeddingIndex, ListItemsResponse
+from steamship.data.index_snapshot import MANIFEST_FILE, load_snapshot, write_snapshot
+from steamship.data.vector_index import LocalVectorIndex, VectorMetric
+from steamship.utils.vector_encoding import VectorEncoding, encode_vectors
+
+_VECTORS = {"north": [0.0, 1.0], "east": [1.0, 0.0], "northeast": [3.0, 3.0], "south": [0.0, -2.0]}
+
+
+def _items():
+    return [
+        EmbeddedItem(
+            id=name,
+            value=name,
+            file_id="f",
+            external_type="direction",
+            metadata={"name": name, "unicode": "✓"},
+            embedding=vector,
+        )
+        for name, vector in _VECTORS.items()
+    ]
+
+
+def _embed(queries):
+    return [_VECTORS[query] for query in queries]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+@pytest.mark.parametrize("mmap", [True, False])
+def test_round_trip(tmp_path, use_numpy, mmap):
+    write_snapshot(tmp_path / "snapshot", _items(), index_id="index")
+    local = load_snapshot(tmp_path / "snapshot", mmap=mmap, embed=_embed, use_numpy=use_numpy)
+    assert len(local) == 4 and local.dimension == 2
+
+    expected = LocalVectorIndex(embed=_embed, use_numpy=use_numpy)
+    expected.add(_items())
+    for query in _VECTORS:
+        results = local.search(query, k=2, include_metadata=True).items
+        assert [(r.id, r.score) for r in results] == pytest.approx(
+            [(r.id, r.score) for r in expected.search(query, k=2).items]
+        )
+    hit = local.search("north", include_metadata=True).items[0].value
+    assert (hit.value, hit.external_type, hit.metadata) == (
+        "north",
+        "direction",
+        {"name": "north", "unicode": "✓"},
+    )
+
+    local.add([EmbeddedItem(id="west", value="west", embedding=[-1.0, 0.0])])
+    assert local.search_vectors([[-1.0, 0.1]]).items[0].id == "west"
+    assert len(local) == 5 and local.search_vectors([[3.0, 3.0]]).items[0].id == "northeast"
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_dot_metric_keeps_raw_vectors(tmp_path, use_numpy):
+    write_snapshot(tmp_path, _items(), metric=VectorMetric.DOT)
+    local = load_snapshot(tmp_path, use_numpy=use_numpy)
+    assert local.metric == VectorMetric.DOT
+    results = local.search_vectors([[0.0, 1.0]], k=1).items
+    assert (results[0].id, results[0].score) == ("northeast", 3.0)
+
+    write_snapshot(tmp_path, _items())  # Replaces the snapshot
+    results = load_snapshot(tmp_path, use_numpy=use_numpy).search_vectors([[0.0, 1.0]]).items
+    assert (results[0].id, results[0].score) == ("north", 1.0)
+
+
+def test_vectors_file_is_npy(tmp_path):
+    np = pytest.importorskip("numpy")
+    write_snapshot(tmp_path, _items())
+    vectors = np.load(tmp_path / "vectors.npy")
+    assert vectors.dtype == np.float32 and vectors.shape == (4, 2)
+    assert vectors[2].tolist() == pytest.approx([math.sqrt(0.5), math.sqrt(0.5)])
+
+
+def test_empty_and_incomplete(tmp_path):
+    write_snapshot(tmp_path / "empty", [])
+    empty = load_snapshot(tmp_path / "empty")
+    assert len(empty) == 0 and empty.search_vectors([[1.0, 0.0]]).items == []
+
+    (tmp_path / "empty" / MANIFEST_FILE).unlink()
+    with pytest.raises(SteamshipError):
+        load_snapshot(tmp_path / "empty")
+    with pytest.raises(SteamshipError):
+        write_snapshot(tmp_path / "invalid", [EmbeddedItem(value="no embedding")])
+
+
+def test_export_snapshot(monkeypatch, tmp_path, offline_client):
+    requests = []
+
+    def post(self, operation, payload=None, expect=None, **kwargs):
+        requests.append((operation, payload))
+        items = [item.copy(update={"embedding": None}) for item in _items()]
+        return ListItemsResponse(
+            items=items,
+            encoded_embeddings=encode_vectors(list(_VECTORS.values()), VectorEncoding.FLOAT32),
+        )
+
+    monkeypatch.setattr(Client, "post", post)
+    path = EmbeddingIndex(client=offline_client, id="index").export_snapshot(tmp_path, file_id="f")
+
+    assert requests[0][0] == "embedding-index/item/list"
+    assert (requests[0][1].file_id, requests[0][1].embedding_encoding) == ("f", "float32")
+    local = load_snapshot(path, embed=_embed)
+    assert [item.id for item in local.search("east", k=1).items] == ["east"]
@@ -1,7 +1,9 @@
+import pytest
 from steamship_tests.utils.fixtures import get_steamship_client
 from steamship_tests.utils.random import random_index, random_name
 
-from steamship import Tag
+from steamship import SteamshipError, Tag
+from steamship.base.client import Client
 from steamship.base.tasks import TaskComment
 from steamship.data.embeddings import EmbeddedItem
 
@@ -169,3 +171,65 @@ def test_task_comment_feedback_reporting():
 
         g2 = TaskComment.list(client=client, external_group=group_name_2)
         assert len(g2.comments) == 0
+
+
+def test_task_comment_bulk_create_and_paging():
+    client = get_steamship_client()
+    with random_index(client, plugin_instance=_TEST_EMBEDDER) as index:
+        index.insert(Tag(text="Pizza", name="pizza", kind="food"))
+        res = index.search("Pizza", k=1)
+        group_name = random_name()
+
+        results = TaskComment.create_many(
+            client,
+            [
+                {
+                    "external_id": f"Foo{i}",
+                    "external_type": "Bar",
+                    "external_group": group_name,
+                    "metadata": [i],
+                }
+                for i in range(5)
+            ],
+            task_id=res.task_id,
+            concurrency=3,
+        )
+        assert len(results) == 5
+        assert all(result.ok for result in results)
+        assert [result.output.external_id for result in results] == [f"Foo{i}" for i in range(5)]
+        assert [result.output.metadata for result in results] == [[i] for i in range(5)]
+
+        first_page = TaskComment.list(client, external_group=group_name, page_size=2)
+        assert len(first_page.comments) == 2
+        assert first_page.next_page_token is not None
+
+        comments = list(TaskComment.iter(client, external_group=group_name, page_size=2))
+        assert sorted(comment.external_id for comment in comments) == [f"Foo{i}" for i in range(5)]
+
+        for comment in comments:
+            comment.delete()
+        assert list(TaskComment.iter(client, external_group=group_name, page_size=2)) == []
+
+
+def test_task_comment_create_many_serializes_metadata(monkeypatch, offline_client):
+    requests = []
+
+    def post(self, operation, payload=None, expect=None, **kwargs):
+        requests.append(payload)
+        # Answer as the Engine does: with the metadata still serialized.
+        return TaskComment(client=self, **payload.dict(exclude_none=True))
+
+    monkeypatch.setattr(Client, "post", post)
+    results = TaskComment.create_many(
+        offline_client,
+        [{"external_id": "a", "metadata": [1]}, {"task_id": "other", "metadata": {"b": 2}}, {}],
+        task_id="task",
+        concurrency=1,
+    )
+
+    assert all(result.ok for result in results)
+    assert [request.task_id for request in requests] == ["task", "other", "task"]
+    assert [request.metadata for request in requests] == ["[1]", '{"b": 2}', None]
+    assert [result.output.metadata for result in results] == [[1], {"b": 2}, None]
+    with pytest.raises(SteamshipError):
+        TaskComment.create_many(offline_client, [{"text": "not a comment field"}])
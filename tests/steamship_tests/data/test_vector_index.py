@@ -0,0 +1,127 @@
+import math
+import random
+
+import pytest
+
+from steamship import SteamshipError
+from steamship.base.client import Client
+from steamship.data.embeddings import EmbeddedItem, EmbeddingIndex, ListItemsResponse
+from steamship.data.vector_index import LocalVectorIndex, VectorMetric
+
+_VECTORS = {"north": [0.0, 1.0], "east": [1.0, 0.0], "northeast": [3.0, 3.0], "south": [0.0, -2.0]}
+
+
+def _items():
+    return [
+        EmbeddedItem(
+            id=name,
+            value=name,
+            external_type="direction",
+            metadata={"name": name},
+            embedding=vector,
+        )
+        for name, vector in _VECTORS.items()
+    ]
+
+
+def _embed(queries):
+    return [_VECTORS[query] for query in queries]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_search_cosine_and_dot(use_numpy):
+    index = LocalVectorIndex(embed=_embed, use_numpy=use_numpy)
+    index.add(_items())
+    assert len(index) == 4 and index.dimension == 2
+
+    results = index.search("north", k=2, include_metadata=True)
+    assert [item.id for item in results.items] == ["north", "northeast"]
+    assert math.isclose(results.items[0].score, 1.0, rel_tol=1e-6)
+    assert math.isclose(results.items[1].score, math.sqrt(0.5), rel_tol=1e-6)
+    assert results.items[0].value.metadata == {"name": "north"}
+    assert results.items[0].value.query == "north"
+
+    dot = LocalVectorIndex(metric=VectorMetric.DOT, use_numpy=use_numpy)
+    dot.add(_items())
+    results = dot.search_vectors([[0.0, 1.0], [1.0, 0.0]], k=1)
+    assert [item.id for item in results.items] == ["northeast", "northeast"]
+    assert results.items[0].score == 3.0
+    assert results.items[0].value.metadata is None
+
+
+def test_search_tags_projects_hits():
+    index = LocalVectorIndex(embed=_embed)
+    index.add(
+        [
+            EmbeddedItem(
+                id="1",
+                value="hello",
+                external_id="greeting",
+                external_type="text",
+                metadata={"_file_id": "f", "_block_id": "b", "_tag_id": "t", "lang": "en"},
+                embedding=[1.0, 0.0],
+            )
+        ]
+    )
+    tag = index.search_tags("east").items[0].tag
+    assert (tag.file_id, tag.block_id, tag.text, tag.kind, tag.name) == (
+        "f",
+        "b",
+        "hello",
+        "text",
+        "greeting",
+    )
+    assert tag.value == {"lang": "en"}
+
+
+def test_invalid_input():
+    index = LocalVectorIndex()
+    assert index.search_vectors([[1.0, 0.0]]).items == []
+    with pytest.raises(SteamshipError):
+        index.add([EmbeddedItem(value="no embedding")])
+    index.add(_items())
+    with pytest.raises(SteamshipError):
+        index.search_vectors([[1.0, 0.0, 0.0]])
+    with pytest.raises(SteamshipError):
+        index.search("north")
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_partitions_match_exact_search(use_numpy):
+    rng = random.Random(1)
+    centers = [[rng.gauss(0, 1) for _ in range(8)] for _ in range(4)]
+    items = [
+        EmbeddedItem(
+            id=str(i), value=str(i), embedding=[c + rng.gauss(0, 0.05) for c in centers[i % 4]]
+        )
+        for i in range(200)
+    ]
+    exact = LocalVectorIndex(use_numpy=use_numpy)
+    exact.add(items)
+    partitioned = LocalVectorIndex(use_numpy=use_numpy)
+    partitioned.add(items[:150])
+    partitioned.build_partitions(n_lists=4, n_probe=2)
+    partitioned.add(items[150:])
+
+    queries = [centers[0], centers[3]]
+    expected = [item.id for item in exact.search_vectors(queries, k=5).items]
+    assert [item.id for item in partitioned.search_vectors(queries, k=5).items] == expected
+
+    partitioned.clear_partitions()
+    assert [item.id for item in partitioned.search_vectors(queries, k=5).items] == expected
+
+
+def test_from_index(monkeypatch, offline_client):
+    requests = []
+
+    def post(self, operation, payload=None, expect=None, **kwargs):
+        requests.append((operation, payload))
+        return ListItemsResponse(items=_items())
+
+    monkeypatch.setattr(Client, "post", post)
+    local = LocalVectorIndex.from_index(
+        EmbeddingIndex(client=offline_client, id="index"), embed=_embed
+    )
+
+    assert requests[0][0] == "embedding-index/item/list" and requests[0][1].id == "index"
+    assert [item.id for item in local.search("east", k=1).items] == ["east"]
@@ -17,6 +17,19 @@ def get_steamship_client(fail_if_workspace_exists=False, **kwargs) -> Steamship:
     )
 
 
+def get_offline_client(**kwargs) -> Steamship:
+    """Returns a client that never contacts the engine while being constructed.
+
+    Tests using it patch `Client.post` (or the HTTP session) to stand in for the engine. Keyword
+    arguments, such as the caches, are passed on to `Steamship`.
+    """
+    return Steamship(
+        config=Configuration(api_key="key", workspace_id="id", workspace_handle="handle"),
+        trust_workspace_config=True,
+        **kwargs,
+    )
+
+
 @contextmanager
 def steamship_use(
     package_handle: str,
@@ -1,7 +1,7 @@
 from typing import Callable, Optional, Type
 
 import pytest
-from steamship_tests.utils.client import get_steamship_client
+from steamship_tests.utils.client import get_offline_client, get_steamship_client
 from steamship_tests.utils.random import random_name
 
 from steamship import Steamship, Workspace
@@ -32,6 +32,16 @@ def client() -> Steamship:
     workspace.delete()
 
 
+@pytest.fixture()
+def offline_client() -> Steamship:
+    """Returns a client for tests that stand in for the engine rather than calling it.
+
+    No workspace is created, so the test must patch `Client.post` (or the HTTP session) before the
+    client makes a request.
+    """
+    return get_offline_client()
+
+
 @pytest.fixture()
 def invocable_handler(request) -> Callable[[str, str, Optional[dict]], dict]:
     """
@@ -5,10 +5,11 @@ from unittest.mock import patch
 
 import pytest
 from pydantic import ValidationError
+from requests import Session
 from steamship_tests.utils.client import TESTING_PROFILE
 from steamship_tests.utils.fixtures import get_steamship_client
 
-from steamship import Steamship
+from steamship import Steamship, SteamshipError
 from steamship.base.client import Client
 from steamship.base.configuration import DEFAULT_API_BASE, DEFAULT_APP_BASE, DEFAULT_WEB_BASE
 from steamship.data.user import User
@@ -132,3 +133,26 @@ def test_invocable_call_rewriting(app_base: str, user: str, fixed_base: str):
 
     output_url = client._url(is_package_call=True, package_owner=user, operation=operation)
     assert output_url == f"{fixed_base}{operation}"
+
+
+class _FakeResponse:
+    headers = {"Content-Type": "application/json"}
+
+    def __init__(self, status_code: int, body: dict):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.body = body
+
+    def json(self):
+        return self.body
+
+
+@pytest.mark.parametrize(
+    "body",
+    [{"status": {"state": "failed", "statusMessage": "gone"}}, {"message": "gone"}],
+)
+def test_errors_carry_http_status(monkeypatch, body, offline_client):
+    monkeypatch.setattr(Session, "post", lambda *args, **kwargs: _FakeResponse(404, body))
+    with pytest.raises(SteamshipError) as error:
+        offline_client.post("file/get", {})
+    assert error.value.status_code == 404
@@ -0,0 +1,64 @@
+import pytest
+import requests
+
+from steamship import SteamshipError
+from steamship.base.response import ListResponse
+from steamship.utils.concurrency import chunked, is_transient_error, run_concurrently
+from steamship.utils.paging import iterate_pages
+
+
+def test_chunked():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunked([], 2)) == []
+    with pytest.raises(ValueError):
+        list(chunked([1], 0))
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_run_concurrently_preserves_order_and_captures_errors(concurrency: int):
+    def fn(i: int) -> int:
+        if i == 3:
+            raise SteamshipError(message="three")
+        return i * 2
+
+    results = run_concurrently(fn, list(range(6)), concurrency=concurrency)
+    assert [result.index for result in results] == list(range(6))
+    assert [result.output for result in results if result.ok] == [0, 2, 4, 8, 10]
+    assert not results[3].ok
+    assert results[3].error.message == "three"
+
+
+def test_retry_if_limits_retries():
+    calls = []
+
+    def fn(error):
+        calls.append(error)
+        raise error
+
+    errors = [SteamshipError(status_code=400), SteamshipError(status_code=503)]
+    results = run_concurrently(
+        fn, errors, concurrency=1, retries=2, retry_delay_s=0, retry_if=is_transient_error
+    )
+    assert not any(result.ok for result in results)
+    assert calls == [errors[0]] + [errors[1]] * 3
+
+    assert is_transient_error(requests.ConnectionError())
+    assert is_transient_error(SteamshipError(status_code=429))
+    assert not is_transient_error(SteamshipError())
+    assert not is_transient_error(ValueError())
+
+
+class _Page(ListResponse):
+    items: list
+
+
+def test_iterate_pages():
+    pages = {None: _Page(items=[1, 2], next_page_token="a"), "a": _Page(items=[3])}
+    fetched = []
+
+    def fetch(page_token):
+        fetched.append(page_token)
+        return pages[page_token]
+
+    assert list(iterate_pages(fetch, lambda page: page.items)) == [1, 2, 3]
+    assert fetched == [None, "a"]
@@ -0,0 +1,81 @@
+import os
+import time
+
+import pytest
+from steamship_tests.utils.client import get_offline_client
+
+from steamship import Block
+from steamship.base.client import Client
+from steamship.utils.content_cache import ContentCache
+
+
+def test_content_cache_round_trip(tmp_path):
+    cache = ContentCache(tmp_path)
+    assert cache.read("a") is None
+
+    path = cache.put("a", iter([b"hello ", b"world"]))
+    assert cache.read("a") == b"hello world"
+    assert bytes(cache.view("a")) == b"hello world"
+
+    # Identical content is stored once
+    assert cache.put("b", iter([b"hello world"])) == path
+    assert cache.size() == len(b"hello world")
+
+    cache.invalidate("a")
+    assert cache.read("a") is None
+    assert cache.read("b") == b"hello world"
+
+
+def test_content_cache_evicts_least_recently_used(tmp_path):
+    cache = ContentCache(tmp_path, max_bytes=10)
+    old = time.time() - 100
+    cache.put("a", iter([b"aaaa"]))
+    os.utime(cache.content_path("a"), (old, old))
+    cache.put("b", iter([b"bbbb"]))
+    os.utime(cache.content_path("b"), (old + 1, old + 1))
+    cache.read("a")  # Marks "a" as recently used
+
+    cache.put("c", iter([b"cccc"]))
+    assert cache.read("b") is None
+    assert len(list(cache._keys.iterdir())) == 2  # The key of the evicted content is removed
+    assert cache.read("a") == b"aaaa"
+    assert cache.read("c") == b"cccc"
+    assert cache.size() <= 10
+
+
+def test_content_cache_read_after_eviction_by_another_process(tmp_path):
+    cache = ContentCache(tmp_path)
+    cache.put("a", iter([b"old"])).unlink()
+
+    assert cache.read_or_fetch("a", lambda: iter([b"new"])) == b"new"
+    assert cache.read("a") == b"new"
+
+
+def test_content_cache_failed_fetch_leaves_nothing(tmp_path):
+    cache = ContentCache(tmp_path)
+
+    def failing():
+        yield b"partial"
+        raise IOError("connection dropped")
+
+    with pytest.raises(IOError):
+        cache.get_or_fetch("a", failing)
+    assert cache.read("a") is None
+    assert cache.size() == 0
+
+
+def test_block_raw_uses_content_cache(tmp_path, monkeypatch):
+    calls = []
+
+    def stream(self, operation=None, payload=None, **kwargs):
+        calls.append(payload)
+        return iter([b"image", b"bytes"])
+
+    monkeypatch.setattr(Client, "stream", stream)
+    client = get_offline_client(content_cache=ContentCache(tmp_path))
+    block = Block(client=client, id="b1")
+
+    assert block.raw() == b"imagebytes"
+    assert block.raw() == b"imagebytes"
+    assert bytes(block.raw_view()) == b"imagebytes"
+    assert calls == [{"id": "b1"}]
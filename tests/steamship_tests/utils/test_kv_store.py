@@ -4,7 +4,9 @@ import pytest
 from steamship_tests.utils.client import get_steamship_client
 from steamship_tests.utils.random import random_name
 
-from steamship import Steamship, Workspace
+from steamship import File, Steamship, SteamshipError, Tag, Workspace
+from steamship.base.client import Client
+from steamship.data.file import FileQueryResponse
 from steamship.utils.kv_store import KeyValueStore
 
 
@@ -158,3 +160,24 @@ def test_kv_multi_space_works():
     # Clean up
     Workspace(client=client1, id=client1.config.workspace_id).delete()
     Workspace(client=client2, id=client2.config.workspace_id).delete()
+
+
+def test_key_value_store_delete_reports_failures(monkeypatch, offline_client):
+    file = File(
+        id="f",
+        tags=[Tag(id=f"t{i}", kind="kv-store-KeyValueStore", name="key") for i in range(3)],
+    )
+    monkeypatch.setattr(File, "query", staticmethod(lambda *args: FileQueryResponse(files=[file])))
+    deleted = []
+
+    def post(self, operation, payload=None, expect=None, **kwargs):
+        if payload.id == "t1":
+            raise SteamshipError(message="unavailable", status_code=503)
+        deleted.append(payload.id)
+        return Tag(id=payload.id)
+
+    monkeypatch.setattr(Client, "post", post)
+    with pytest.raises(SteamshipError) as error:
+        KeyValueStore(offline_client).delete("key")
+    assert "1 of the 3" in error.value.message
+    assert sorted(deleted) == ["t0", "t2"]  # The other deletes still ran
@@ -0,0 +1,94 @@
+import io
+
+import pytest
+
+from steamship import SteamshipError
+from steamship.data.tags import TagKind
+from steamship.utils.text_chunker import ChunkStrategy, chunk_text, index_tags
+
+TEXT = "Hello there. How are you? I am fine!\n\nSecond para here. Yes.\n\n\nThird."
+
+
+def _spans(block):
+    return [block.text[tag.start_idx : tag.end_idx] for tag in block.tags]
+
+
+def test_chunk_paragraphs_and_sentences():
+    blocks = list(chunk_text(TEXT, ChunkStrategy.PARAGRAPH, max_chars=40))
+    assert [block.text for block in blocks] == [
+        "Hello there. How are you? I am fine!",
+        "Second para here. Yes.\n\nThird.",
+    ]
+    assert _spans(blocks[1]) == ["Second para here. Yes.", "Third."]
+    assert all(tag.kind == TagKind.TOKENIZATION for tag in blocks[1].tags)
+    assert blocks[1].tags[1].value["source_offset"] == TEXT.index("Third.")
+
+    blocks = list(chunk_text(TEXT, ChunkStrategy.SENTENCE, max_chars=30))
+    assert [block.text for block in blocks] == [
+        "Hello there. How are you?",
+        "I am fine! Second para here.",
+        "Yes. Third.",
+    ]
+    assert _spans(blocks[0]) == ["Hello there.", "How are you?"]
+
+
+def test_chunk_regex_window_and_tokens():
+    blocks = list(chunk_text("a;b;c", ChunkStrategy.REGEX, pattern=";", max_chars=3))
+    assert [block.text for block in blocks] == ["a b", "c"]
+
+    text = "one two three four five six"
+    blocks = list(chunk_text(text, ChunkStrategy.WINDOW, max_chars=10, overlap=4))
+    for block in blocks:
+        offset = block.tags[0].value["source_offset"]
+        assert text[offset : offset + len(block.text)] == block.text
+        assert len(block.text) <= 10
+    assert blocks[-1].text.endswith("six")
+
+    blocks = list(chunk_text(text, ChunkStrategy.TOKENS, max_tokens=4, overlap=1))
+    assert [block.text for block in blocks] == ["one two three four", "four five six"]
+
+    with pytest.raises(SteamshipError):
+        list(chunk_text(text, ChunkStrategy.TOKENS, max_tokens=4, overlap=4))
+    with pytest.raises(SteamshipError):
+        list(chunk_text(text, ChunkStrategy.REGEX))
+
+
+@pytest.mark.parametrize("strategy", list(ChunkStrategy))
+def test_chunk_streaming_matches_whole_text(strategy):
+    text = " ".join(["Sentence number %d ends here." % i for i in range(200)]) + "\n\nTail."
+    kwargs = {"pattern": r"\."} if strategy == ChunkStrategy.REGEX else {}
+    whole = [block.text for block in chunk_text(text, strategy, max_chars=120, **kwargs)]
+    streamed = [
+        block.text
+        for block in chunk_text(io.StringIO(text, newline=""), strategy, max_chars=120, **kwargs)
+    ]
+    pieces = [text[i : i + 7] for i in range(0, len(text), 7)]
+    assert streamed == whole
+    assert [block.text for block in chunk_text(pieces, strategy, max_chars=120, **kwargs)] == whole
+
+
+def test_long_unit_is_windowed():
+    blocks = list(chunk_text("x" * 25, ChunkStrategy.PARAGRAPH, max_chars=10))
+    assert [len(block.text) for block in blocks] == [10, 10, 5]
+
+
+@pytest.mark.parametrize("strategy", [ChunkStrategy.PARAGRAPH, ChunkStrategy.REGEX])
+def test_text_without_separators_is_cut(strategy):
+    text = "word " * 2000 + "\n\nEnd."
+    kwargs = {"pattern": r"\n\n"} if strategy == ChunkStrategy.REGEX else {}
+    whole = list(chunk_text(text, strategy, max_chars=100, **kwargs))
+    streamed = list(chunk_text(iter(text), strategy, max_chars=100, **kwargs))
+
+    assert [block.text for block in streamed] == [block.text for block in whole]
+    assert all(len(block.text) <= 100 for block in whole) and whole[-1].text == "End."
+    for block in whole:
+        offset = block.tags[0].value["source_offset"]
+        assert text[offset : offset + len(block.text)] == block.text
+
+
+def test_index_tags():
+    tags = index_tags(chunk_text(TEXT), file_id="f")
+    assert [tag.text for tag in tags] == [
+        "Hello there. How are you? I am fine!\n\nSecond para here. Yes.\n\nThird."
+    ]
+    assert tags[0].file_id == "f"
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from steamship import SteamshipError
+from steamship.data.embeddings import EmbeddedItem, ListItemsResponse
+from steamship.data.vector_index import LocalVectorIndex
+from steamship.plugin.outputs.embedded_items_plugin_output import EmbeddedItemsPluginOutput
+from steamship.utils.vector_encoding import (
+    EncodedVectors,
+    VectorEncoding,
+    decode_vectors,
+    encode_vectors,
+)
+
+_VECTORS = [[0.5, -1.25, 3.0], [0.0, 0.0, 0.0], [100.0, 0.001, -7.5]]
+
+
+def _as_lists(vectors):
+    return [[float(x) for x in vector] for vector in vectors]
+
+
+@pytest.mark.parametrize(
+    "encoding, tolerance",
+    [(VectorEncoding.FLOAT32, 1e-6), (VectorEncoding.FLOAT16, 1e-2), (VectorEncoding.INT8, 0.5)],
+)
+def test_round_trip(encoding, tolerance):
+    encoded = encode_vectors(_VECTORS, encoding)
+    assert (encoded.count, encoded.dimension) == (3, 3)
+    assert (encoded.scales is not None) == (encoding == VectorEncoding.INT8)
+
+    decoded = _as_lists(EncodedVectors.parse_raw(encoded.json()).decode())
+    for expected, actual in zip(_VECTORS, decoded):
+        assert actual == pytest.approx(expected, rel=tolerance, abs=tolerance)
+
+
+def test_compact_size():
+    vectors = [[i / 7 for i in range(1536)]]
+    encoded = encode_vectors(vectors, VectorEncoding.FLOAT32)
+    assert len(encoded.data) < len(json.dumps(vectors)) / 3
+    assert len(encode_vectors(vectors, VectorEncoding.INT8).data) < len(encoded.data) / 3
+    with pytest.raises(SteamshipError):
+        encode_vectors(vectors, VectorEncoding.JSON)
+
+
+def test_plugin_output_either_form():
+    compact = EmbeddedItemsPluginOutput.from_vectors(_VECTORS, VectorEncoding.FLOAT32)
+    assert compact.embeddings is None
+    parsed = EmbeddedItemsPluginOutput.parse_obj(json.loads(compact.json(by_alias=True)))
+    assert _as_lists(parsed.vectors()) == _as_lists(decode_vectors(compact.encoded_embeddings))
+
+    plain = EmbeddedItemsPluginOutput.from_vectors(_VECTORS)
+    assert plain.encoded_embeddings is None
+    assert _as_lists(plain.vectors())[2] == pytest.approx(_VECTORS[2])
+
+
+def test_list_items_vectors_feed_local_index():
+    items = [EmbeddedItem(id=str(i), value=str(i)) for i in range(3)]
+    response = ListItemsResponse(
+        items=items, encoded_embeddings=encode_vectors(_VECTORS, VectorEncoding.FLOAT32)
+    )
+    index = LocalVectorIndex()
+    index.add(response.items, vectors=response.vectors())
+    assert [item.id for item in index.search_vectors([[100.0, 0.0, -7.0]]).items] == ["2"]
+
+    assert ListItemsResponse(items=items).vectors() is None
+    with pytest.raises(SteamshipError):
+        index.add(items, vectors=_VECTORS[:2])